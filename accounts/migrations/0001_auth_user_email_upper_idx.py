@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db.models import Index
+from django.db.models.functions import Upper
+
+
+# allauth resolves logins and signups with email__iexact, which PostgreSQL
+# runs as UPPER(email) = UPPER(%s). auth.User has no index for that.
+EMAIL_INDEX = Index(Upper("email"), name="auth_user_email_upper_idx")
+
+
+def add_email_index(apps, schema_editor):
+    User = apps.get_model("auth", "User")
+    schema_editor.add_index(User, EMAIL_INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    User = apps.get_model("auth", "User")
+    schema_editor.remove_index(User, EMAIL_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
@@ -3,7 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 
-from billing.models import Subscription
+from core.limits import get_account_state
 
 
 @login_required
@@ -12,7 +12,7 @@ def profile(request):
     Logged-in user's profile page.
     Keep account settings (username/email/password) and billing in one place.
     """
-    subscription = Subscription.objects.filter(user=request.user).first()
+    subscription = get_account_state(request.user).subscription
     return render(request, "account/profile.html", {"subscription": subscription})
 
 
@@ -11,13 +11,15 @@ class SubscriptionAdmin(admin.ModelAdmin):
     list_display = (
         "user",
         "status",
+        "plan_tier",
+        "paid_until",
         "has_had_trial",
         "created_at",
         "trial_end",
         "stripe_customer_id",
         "stripe_subscription_id",
     )
-    list_filter = ("status", "has_had_trial")
+    list_filter = ("status", "plan_tier", "has_had_trial")
     search_fields = (
         "user__username",
         "user__email",
@@ -32,6 +34,8 @@ class SubscriptionAdmin(admin.ModelAdmin):
         "stripe_subscription_id",
         "has_had_trial",
         "status",
+        "plan_tier",
+        "paid_until",
         "trial_end",
         "created_at",
         "updated_at",
@@ -39,6 +43,7 @@ class SubscriptionAdmin(admin.ModelAdmin):
 
     fieldsets = (
         (None, {"fields": ("user", "status", "has_had_trial")}),
+        ("Entitlement", {"fields": ("plan_tier", "paid_until")}),
         ("Dates", {"fields": ("trial_end",)}),
         ("Stripe", {"fields": ("stripe_customer_id", "stripe_subscription_id")}),
         ("System", {"fields": ("created_at", "updated_at")}),
@@ -58,6 +63,8 @@ class SubscriptionInline(admin.StackedInline):
         "stripe_customer_id",
         "stripe_subscription_id",
         "status",
+        "plan_tier",
+        "paid_until",
         "has_had_trial",
         "trial_end",
         "created_at",
@@ -66,6 +73,7 @@ class SubscriptionInline(admin.StackedInline):
 
     fieldsets = (
         (None, {"fields": ("status", "has_had_trial")}),
+        ("Entitlement", {"fields": ("plan_tier", "paid_until")}),
         ("Dates", {"fields": ("trial_end",)}),
         ("Stripe", {"fields": ("stripe_customer_id", "stripe_subscription_id")}),
         ("System", {"fields": ("created_at", "updated_at")}),
@@ -8,3 +8,13 @@ class BillingConfig(AppConfig):
 
     # Application label
     name = 'billing'
+
+    def ready(self):
+        # Stripe calls share the outbound pool, deadlines and breaker
+        import stripe
+        from django.conf import settings
+
+        from core.outbound import install_stripe_client
+
+        stripe.api_base = settings.STRIPE_API_BASE
+        install_stripe_client()
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from billing.models import Subscription
+from core.versioning import bump_content_versions
+
+
+class Command(BaseCommand):
+    """
+    Move subscriptions whose paid_until has passed back to the free tier.
+
+    Access checks already compare paid_until with the current time, so this
+    only tidies plan_tier (for admin / reporting) and refreshes cached plan
+    banners. Run it periodically, e.g. hourly from the scheduler.
+    """
+
+    help = "Set plan_tier to free on subscriptions whose paid access has ended."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Subscriptions updated per statement (default: 500).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report expired subscriptions without changing them.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        user_ids = list(
+            Subscription.objects.expired(now).order_by("user_id").values_list("user_id", flat=True)
+        )
+
+        if not options["dry_run"]:
+            batch_size = options["batch_size"]
+            for start in range(0, len(user_ids), batch_size):
+                batch = user_ids[start:start + batch_size]
+                # Re-check expiry in the UPDATE so a renewal that just landed is kept
+                Subscription.objects.expired(now).filter(user_id__in=batch).update(
+                    plan_tier="free",
+                    paid_until=None,
+                    updated_at=now,
+                )
+                bump_content_versions(batch)
+
+        verb = "would expire" if options["dry_run"] else "expired"
+        self.stdout.write(self.style.SUCCESS(f"{verb.capitalize()} {len(user_ids)} subscriptions."))
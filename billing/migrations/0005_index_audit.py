@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0004_subscription_cancel_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['stripe_subscription_id'], name='billing_sub_stripe_sub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['stripe_customer_id'], name='billing_sub_stripe_cust_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:51
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of billing.models.compute_entitlement as of this migration,
+# so later rule changes don't rewrite what the backfill produced
+
+OPEN_ENDED_STATUSES = {"trialing", "active"}
+PAID_OPEN_ENDED = datetime(9999, 12, 31, tzinfo=dt_timezone.utc)
+
+
+def compute_entitlement(status, trial_end, current_period_end):
+    now = timezone.now()
+    status = (status or "").lower()
+
+    if trial_end and trial_end > now:
+        return "trial", PAID_OPEN_ENDED if status in OPEN_ENDED_STATUSES else trial_end
+    if status == "trialing":
+        return "trial", PAID_OPEN_ENDED
+    if status == "active":
+        return "plus", PAID_OPEN_ENDED
+    if status == "canceled" and current_period_end and current_period_end > now:
+        return "ending", current_period_end
+    return "free", None
+
+
+def backfill_entitlements(apps, schema_editor):
+    """Derive plan_tier / paid_until for existing subscriptions."""
+    Subscription = apps.get_model("billing", "Subscription")
+
+    rows = list(Subscription.objects.all())
+    for sub in rows:
+        sub.plan_tier, sub.paid_until = compute_entitlement(
+            sub.status, sub.trial_end, sub.current_period_end
+        )
+    Subscription.objects.bulk_update(rows, ["plan_tier", "paid_until"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0005_index_audit'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='paid_until',
+            field=models.DateTimeField(blank=True, help_text='Paid access ends at this time (UTC); empty means no paid access.', null=True),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='plan_tier',
+            field=models.CharField(choices=[('free', 'Free'), ('trial', 'Trial'), ('plus', 'Regulate+'), ('ending', 'Ending')], default='free', help_text='Plan tier derived from status and dates.', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['paid_until'], name='billing_sub_paid_until_idx'),
+        ),
+        migrations.RunPython(backfill_entitlements, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,49 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+
+# Statuses Stripe keeps renewing until told otherwise
+OPEN_ENDED_STATUSES = {"trialing", "active"}
+
+# paid_until for open-ended plans (far enough that "paid_until > now" always holds)
+PAID_OPEN_ENDED = datetime(9999, 12, 31, tzinfo=dt_timezone.utc)
+
+
+def compute_entitlement(status, trial_end, current_period_end, now=None):
+    """
+    Return (plan_tier, paid_until) for a subscription's Stripe fields.
+
+    The single source of paid-access rules:
+    - trial_end in the future: trial (open-ended if Stripe still says trialing/active)
+    - trialing / active: trial / plus, open-ended until a webhook says otherwise
+    - canceled with a future period end: ending (paid until that date)
+    - anything else: free
+    """
+    now = now or timezone.now()
+    status = (status or "").lower()
+
+    if trial_end and trial_end > now:
+        return "trial", PAID_OPEN_ENDED if status in OPEN_ENDED_STATUSES else trial_end
+    if status == "trialing":
+        return "trial", PAID_OPEN_ENDED
+    if status == "active":
+        return "plus", PAID_OPEN_ENDED
+    if status == "canceled" and current_period_end and current_period_end > now:
+        return "ending", current_period_end
+    return "free", None
+
+
+class SubscriptionQuerySet(models.QuerySet):
+    def paid(self, now=None):
+        """Subscriptions with paid access right now (one indexed comparison)."""
+        return self.filter(paid_until__gt=now or timezone.now())
+
+    def expired(self, now=None):
+        """Rows still marked as paid whose paid_until has passed (for the sweeper)."""
+        return self.exclude(plan_tier="free").filter(paid_until__lte=now or timezone.now())
 
 
 class Subscription(models.Model):
@@ -18,6 +62,13 @@ class Subscription(models.Model):
         ("unpaid", "Unpaid"),
     ]
 
+    PLAN_TIER_CHOICES = [
+        ("free", "Free"),
+        ("trial", "Trial"),
+        ("plus", "Regulate+"),
+        ("ending", "Ending"),
+    ]
+
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -75,8 +126,58 @@ class Subscription(models.Model):
         help_text="If set, the subscription is scheduled to cancel at this time (UTC).",
     )
 
+    # Derived entitlement, recomputed on every save (see compute_entitlement)
+    plan_tier = models.CharField(
+        max_length=16,
+        choices=PLAN_TIER_CHOICES,
+        default="free",
+        help_text="Plan tier derived from status and dates.",
+    )
+    paid_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Paid access ends at this time (UTC); empty means no paid access.",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SubscriptionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Entitlement checks and "all paid users" queries
+            models.Index(fields=["paid_until"], name="billing_sub_paid_until_idx"),
+            # Webhooks resolve the local row from Stripe IDs
+            models.Index(
+                fields=["stripe_subscription_id"],
+                name="billing_sub_stripe_sub_idx",
+            ),
+            models.Index(
+                fields=["stripe_customer_id"],
+                name="billing_sub_stripe_cust_idx",
+            ),
+        ]
+
+    def refresh_entitlement(self, now=None):
+        """Recompute plan_tier / paid_until from the Stripe fields."""
+        self.plan_tier, self.paid_until = compute_entitlement(
+            self.status, self.trial_end, self.current_period_end, now
+        )
+
+    def save(self, *args, **kwargs):
+        self.refresh_entitlement()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "plan_tier", "paid_until"}
+        super().save(*args, **kwargs)
+
+    def has_paid_access(self, now=None):
+        return bool(self.paid_until and self.paid_until > (now or timezone.now()))
+
+    def current_tier(self, now=None):
+        """plan_tier, or "free" once paid_until has passed (even before the sweeper runs)."""
+        return self.plan_tier if self.has_paid_access(now) else "free"
+
     def __str__(self):
         return f"Subscription for {self.user.username} ({self.status})"
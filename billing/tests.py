@@ -1,8 +1,14 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from .models import Subscription
+from .models import PAID_OPEN_ENDED, Subscription
 
 
 class RegulatePlusViewTests(TestCase):
@@ -35,3 +41,77 @@ class RegulatePlusViewTests(TestCase):
         self.assertEqual(response.context["subscription_status"], "trialing")
         self.assertTrue(response.context["is_active_plan"])
         self.assertTrue(response.context["has_had_trial"])
+
+    def test_regulate_plus_awaits_stripe_sync_for_missing_trial_end(self):
+        """The async page-load sync stores the trial end Stripe returns."""
+        Subscription.objects.create(
+            user=self.user,
+            status="trialing",
+            stripe_subscription_id="sub_123",
+        )
+        trial_end = timezone.now() + timedelta(days=3)
+        stripe_sub = {
+            "id": "sub_123",
+            "customer": "cus_123",
+            "status": "trialing",
+            "trial_end": int(trial_end.timestamp()),
+        }
+
+        self.client.login(username="ceri", password="testpass123")
+        with mock.patch("stripe.Subscription.retrieve", return_value=stripe_sub) as retrieve:
+            response = self.client.get(reverse("regulate_plus"))
+
+        retrieve.assert_called_once()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["trial_days_left"], 3)
+        self.assertTrue(Subscription.objects.get(user=self.user).has_had_trial)
+
+
+class SubscriptionEntitlementTests(TestCase):
+    """plan_tier / paid_until are derived on save and expired by the sweeper."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(username=f"user{n}", password="testpass123") for n in range(3)
+        ]
+
+    def test_entitlement_is_computed_on_save(self):
+        now = timezone.now()
+        active = Subscription.objects.create(user=self.users[0], status="active")
+        ending = Subscription.objects.create(
+            user=self.users[1], status="canceled", current_period_end=now + timedelta(days=2)
+        )
+        lapsed = Subscription.objects.create(
+            user=self.users[2], status="past_due", current_period_end=now + timedelta(days=2)
+        )
+
+        self.assertEqual((active.plan_tier, active.paid_until), ("plus", PAID_OPEN_ENDED))
+        self.assertEqual(ending.plan_tier, "ending")
+        self.assertEqual(lapsed.plan_tier, "free")
+        self.assertEqual(
+            set(Subscription.objects.paid().values_list("user_id", flat=True)),
+            {self.users[0].pk, self.users[1].pk},
+        )
+
+    def test_sweeper_expires_ended_plans(self):
+        sub = Subscription.objects.create(
+            user=self.users[0],
+            status="canceled",
+            current_period_end=timezone.now() + timedelta(days=1),
+        )
+        Subscription.objects.create(user=self.users[1], status="active")
+
+        later = timezone.now() + timedelta(days=2)
+        self.assertFalse(sub.has_paid_access(now=later))
+        self.assertEqual(sub.current_tier(now=later), "free")
+
+        # Pretend the period ended
+        Subscription.objects.filter(pk=sub.pk).update(paid_until=timezone.now() - timedelta(minutes=1))
+        out = StringIO()
+        call_command("expire_entitlements", stdout=out)
+
+        self.assertIn("Expired 1 subscriptions", out.getvalue())
+        sub.refresh_from_db()
+        self.assertEqual((sub.plan_tier, sub.paid_until), ("free", None))
+        self.assertEqual(Subscription.objects.paid().count(), 1)
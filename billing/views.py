@@ -3,6 +3,7 @@ import logging
 import calendar
 
 import stripe
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -11,6 +12,8 @@ from django.urls import reverse
 from django.views.decorators.http import require_GET
 from django.utils import timezone
 
+from core import outbound
+from core.limits import get_account_state
 from .models import Subscription
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -146,6 +149,9 @@ def _upsert_subscription(user, stripe_sub, stripe_customer_id=None):
         obj.has_had_trial = True
 
     obj.save()
+
+    # Plan banner etc. for the rest of this request should see the new plan
+    get_account_state(user).refresh()
     return obj
 
 
@@ -157,10 +163,22 @@ def _checkout_delayed_message(request):
     )
 
 
+@sync_to_async
+def _load_subscription(user):
+    return get_account_state(user).subscription
+
+
 @login_required
-def regulate_plus(request):
-    """Regulate+ hub page (trial / upgrade / manage billing)."""
-    sub = Subscription.objects.filter(user=request.user).first()
+async def regulate_plus(request):
+    """
+    Regulate+ hub page (trial / upgrade / manage billing).
+
+    Async: the page-load Stripe sync is awaited (outbound.acall), so under
+    ASGI a slow Stripe doesn't hold a worker; database work and rendering
+    run in sync_to_async hops.
+    """
+    user = await request.auser()
+    sub = await _load_subscription(user)
     status = getattr(sub, "status", None)
 
     # Best-effort sync on page load if dates missing
@@ -170,16 +188,16 @@ def regulate_plus(request):
 
         if needs_trial_sync or needs_billing_sync:
             try:
-                stripe_sub = stripe.Subscription.retrieve(
+                stripe_sub = await outbound.acall(
+                    stripe.Subscription.retrieve,
                     sub.stripe_subscription_id,
                     expand=["items.data.price", "latest_invoice"]
                 )
-                _upsert_subscription(
-                    request.user,
+                sub = await sync_to_async(_upsert_subscription)(
+                    user,
                     stripe_sub,
                     stripe_customer_id=getattr(sub, "stripe_customer_id", None),
                 )
-                sub = Subscription.objects.filter(user=request.user).first()
                 status = getattr(sub, "status", None)
             except Exception:
                 logger.exception("Regulate+ sync on page load failed")
@@ -199,12 +217,12 @@ def regulate_plus(request):
         "current_period_end": current_period_end,
         "billing_days_left": _days_left(current_period_end),
     }
-    return render(request, "billing/regulate_plus.html", context)
+    return await sync_to_async(render)(request, "billing/regulate_plus.html", context)
 
 
 @login_required
 def start_trial(request):
-    sub = Subscription.objects.filter(user=request.user).first()
+    sub = get_account_state(request.user).subscription
 
     if sub and sub.status in ["trialing", "active"]:
         messages.info(request, "You already have an active plan.")
@@ -244,7 +262,7 @@ def start_trial(request):
 
 @login_required
 def start_subscription(request):
-    sub = Subscription.objects.filter(user=request.user).first()
+    sub = get_account_state(request.user).subscription
 
     if sub and sub.status in ["trialing", "active"]:
         messages.info(request, "You already have an active plan.")
@@ -279,7 +297,7 @@ def start_subscription(request):
 
 @login_required
 def billing_details(request):
-    sub = Subscription.objects.filter(user=request.user).first()
+    sub = get_account_state(request.user).subscription
     stripe_customer_id = getattr(sub, "stripe_customer_id", None)
 
     if not stripe_customer_id:
@@ -300,10 +318,11 @@ def billing_details(request):
 
 @login_required
 @require_GET
-def checkout_success(request):
+async def checkout_success(request):
     """
     Stripe redirects here after Checkout.
     Webhooks are the source of truth, but we also attempt a best-effort sync for UX.
+    Async, like regulate_plus, so the two Stripe retrieves don't hold a worker.
     """
     session_id = request.GET.get("session_id")
 
@@ -312,13 +331,16 @@ def checkout_success(request):
         return redirect("regulate_plus")
 
     try:
-        session = stripe.checkout.Session.retrieve(session_id)
+        session = await outbound.acall(stripe.checkout.Session.retrieve, session_id)
         sub_id = session.get("subscription")
         cust_id = session.get("customer")
 
         if sub_id:
-            stripe_sub = stripe.Subscription.retrieve(sub_id, expand=["items.data.price", "latest_invoice"])
-            _upsert_subscription(request.user, stripe_sub, stripe_customer_id=cust_id)
+            stripe_sub = await outbound.acall(
+                stripe.Subscription.retrieve, sub_id, expand=["items.data.price", "latest_invoice"]
+            )
+            user = await request.auser()
+            await sync_to_async(_upsert_subscription)(user, stripe_sub, stripe_customer_id=cust_id)
             messages.success(request, "Thanks — your plan is now active.")
         else:
             _checkout_delayed_message(request)
@@ -0,0 +1,95 @@
+"""
+Live site announcements for the dashboard, cached per worker.
+
+get_live_announcements() keeps the live list (is_active, inside its
+starts_at/ends_at window, newest first) in this process until either
+
+- the "announcements" version moves (any SiteAnnouncement save/delete
+  bumps it, see core/signals.py), or
+- the next schedule boundary passes: the soonest starts_at or ends_at
+  still ahead of when the list was built,
+
+so steady-state dashboard requests make no announcement queries. The
+version is read from the database at most every CACHE_VERSION_TTL seconds
+(see core/versioning.py), so an admin change reaches other dynos within
+that time. get_live_state() also gives the dashboard's conditional GET
+its announcement tag and timestamp.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import SiteAnnouncement
+from .versioning import cache_version
+
+
+@dataclass(frozen=True)
+class LiveAnnouncements:
+    """The announcements live at build time, and until when that holds."""
+
+    version: str
+    built_at: datetime
+    valid_until: Optional[datetime]  # None: no scheduled change ahead
+    items: tuple
+
+    @property
+    def tag(self):
+        """Changes whenever the live list does (the same in every worker)."""
+        return "-".join(f"{a.pk}.{a.updated_at:%Y%m%d%H%M%S%f}" for a in self.items) or "none"
+
+    def is_current(self, version, now):
+        return self.version == version and (self.valid_until is None or now < self.valid_until)
+
+
+def live_announcements_query(now):
+    """Active announcements inside their window at `now` (SiteAnnouncement.is_live in SQL)."""
+    return (
+        SiteAnnouncement.objects.filter(is_active=True)
+        .filter(Q(starts_at__isnull=True) | Q(starts_at__lte=now))
+        .filter(Q(ends_at__isnull=True) | Q(ends_at__gte=now))
+        .order_by("-updated_at")
+    )
+
+
+def next_boundary(now):
+    """The soonest time after `now` that an active announcement starts or ends."""
+    bounds = SiteAnnouncement.objects.filter(is_active=True).aggregate(
+        next_start=Min("starts_at", filter=Q(starts_at__gt=now)),
+        next_end=Min("ends_at", filter=Q(ends_at__gte=now)),
+    )
+    upcoming = [value for value in bounds.values() if value is not None]
+    return min(upcoming) if upcoming else None
+
+
+_live = None
+
+
+def get_live_state():
+    """
+    Return this worker's LiveAnnouncements, rebuilt if stale.
+
+    Costs nothing when current (bar a version read once per
+    CACHE_VERSION_TTL); two queries when rebuilt.
+    """
+    global _live
+    version = cache_version("announcements")
+    now = timezone.now()
+    live = _live
+    if live is None or not live.is_current(version, now):
+        # Replaced wholesale, never mutated, so threads can share it freely
+        live = _live = LiveAnnouncements(
+            version=version,
+            built_at=now,
+            valid_until=next_boundary(now),
+            items=tuple(live_announcements_query(now)),
+        )
+    return live
+
+
+def get_live_announcements():
+    """Return the live announcements, newest first (see get_live_state)."""
+    return get_live_state().items
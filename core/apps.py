@@ -8,3 +8,7 @@ class CoreConfig(AppConfig):
 
     # Application label
     name = "core"
+
+    def ready(self):
+        """Connect signal handlers (search index upkeep)."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,47 @@
+"""
+Compact rows for entry list views.
+
+My Entries cards only need a handful of short columns, so lists are read
+with values_list() into slotted EntryCard objects instead of full Entry
+instances: notes (the large column) are never fetched, only the bounded
+Entry.notes_preview.
+"""
+
+from .models import Entry
+
+
+_MOOD_LABELS = dict(Entry.MOOD_CHOICES)
+
+
+class EntryCard:
+    """One entry as shown on a list card (attribute names match Entry)."""
+
+    FIELDS = (
+        "id",
+        "created_at",
+        "mood",
+        "hue",
+        "emotion_words",
+        "notes_preview",
+        "revision_count",
+    )
+
+    __slots__ = FIELDS + ("search_snippet",)
+
+    def __init__(self, id, created_at, mood, hue, emotion_words, notes_preview, revision_count):
+        self.id = id
+        self.created_at = created_at
+        self.mood = mood
+        self.hue = hue
+        self.emotion_words = emotion_words
+        self.notes_preview = notes_preview
+        self.revision_count = revision_count
+        self.search_snippet = ""
+
+    def get_mood_display(self):
+        return _MOOD_LABELS.get(self.mood, self.mood)
+
+
+def entry_cards(queryset):
+    """Evaluate an Entry queryset (slices included) as a list of EntryCards."""
+    return [EntryCard(*row) for row in queryset.values_list(*EntryCard.FIELDS)]
@@ -0,0 +1,135 @@
+"""
+Validators for conditional GETs on the per-user pages.
+
+My Entries, entry detail and the dashboard are rendered only from the
+user's own content, their plan, their login and the date (plus the live
+announcements on the dashboard), so their ETag/Last-Modified come from:
+
+- the content watermark, UserContentState (version, changed_at), bumped on
+  every entry, revision and subscription write (core/versioning.py);
+- the plan as of now: Subscription.current_tier() and paid_until, as paid
+  access lapses at paid_until with no write at all (the badge and the
+  free-plan lock change then, before expire_entitlements runs);
+- last_login: a new login rotates the session and CSRF token the pages
+  embed;
+- the local date, as pages show day-relative values (insights, plan days).
+
+Views wrap these with django's condition(), so a repeat visit costs one
+small query (the watermark joined with the plan) and answers 304 before any list/history/insights queries run.
+Pages with flash messages waiting are always rendered (no validators),
+otherwise a 304 would leave the messages queued.
+"""
+
+from datetime import datetime, time
+
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from billing.models import Subscription
+
+from .announcements import get_live_state
+
+
+User = get_user_model()
+
+
+def _user_validators(request):
+    """
+    ([tag parts], last modified) for the request's user, or None when the
+    page must be rendered. Memoised on the request, because condition()
+    asks for the ETag and Last-Modified separately.
+    """
+    if not hasattr(request, "_user_validators"):
+        request._user_validators = _compute_user_validators(request)
+    return request._user_validators
+
+
+def _user_state(user):
+    """
+    (version, changed_at, plan tier, paid_until) in one query: the content
+    watermark and the subscription's stored entitlement, either may be missing.
+    """
+    row = (
+        User.objects.filter(pk=user.pk)
+        .values_list(
+            "content_state__version",
+            "content_state__changed_at",
+            "subscription__plan_tier",
+            "subscription__paid_until",
+        )
+        .first()
+    )
+    return row or (None, None, None, None)
+
+
+def _compute_user_validators(request):
+    if len(messages.get_messages(request)):
+        return None
+
+    user = request.user
+    version, changed_at, plan_tier, paid_until = _user_state(user)
+    now = timezone.now()
+    today = timezone.localdate()
+    midnight = timezone.make_aware(datetime.combine(today, time.min))
+    last_login = user.last_login
+
+    # Same rule as Subscription.current_tier(), from the joined columns
+    tier = Subscription(plan_tier=plan_tier or "free", paid_until=paid_until).current_tier(now)
+    # Access that lapsed is a change at paid_until, even though nothing was written
+    lapsed_at = paid_until if paid_until and paid_until <= now else None
+
+    parts = [
+        str(version or 0),
+        f"{changed_at:%Y%m%d%H%M%S%f}" if changed_at else "0",
+        f"{last_login:%Y%m%d%H%M%S%f}" if last_login else "0",
+        tier,
+        f"{paid_until:%Y%m%d%H%M%S%f}" if paid_until else "0",
+        f"{today:%Y%m%d}",
+    ]
+    stamps = (changed_at, last_login, midnight, lapsed_at)
+    return parts, max(stamp for stamp in stamps if stamp)
+
+
+def _tag(prefix, request, *extra):
+    validators = _user_validators(request)
+    if validators is None:
+        return None
+    return "-".join([prefix, *validators[0], *map(str, extra)])
+
+
+def _modified(request, *stamps):
+    validators = _user_validators(request)
+    if validators is None:
+        return None
+    return max([validators[1], *stamps])
+
+
+# ---------- per view ----------
+
+def my_entries_etag(request):
+    # In-page "Load older entries" gets JSON from the same URL
+    kind = "xhr" if request.headers.get("x-requested-with") == "XMLHttpRequest" else "page"
+    return _tag("entries", request, kind)
+
+
+def my_entries_last_modified(request):
+    return _modified(request)
+
+
+def entry_etag(request, entry_id):
+    return _tag("entry", request, entry_id)
+
+
+def entry_last_modified(request, entry_id):
+    return _modified(request)
+
+
+def dashboard_etag(request):
+    live = get_live_state()
+    return _tag("dashboard", request, live.version, live.tag)
+
+
+def dashboard_last_modified(request):
+    # built_at: when this worker last saw the live list change (never earlier)
+    return _modified(request, get_live_state().built_at)
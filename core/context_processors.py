@@ -1,52 +1,54 @@
-from django.utils import timezone
-from billing.models import Subscription
+from django.utils.functional import SimpleLazyObject
+
+from .limits import get_account_state
+from .versioning import cache_version, content_version
 
 
 def plan_status(request):
     """
     Adds current account plan info to all templates.
     Used for the small banner under the navbar.
+
+    Lazy, so a cached banner fragment never triggers the subscription query.
     """
 
     # Only show plan info to authenticated users
     if not request.user.is_authenticated:
         return {}
 
-    # Each user has at most one subscription (OneToOne)
-    sub = Subscription.objects.filter(user=request.user).first()
-
-    now = timezone.now()
+    return {
+        "plan_status": SimpleLazyObject(
+            lambda: _plan_status(get_account_state(request.user).subscription)
+        )
+    }
 
-    # Default state
-    label = "Free plan"
-    badge = "free"
 
-    if sub:
-        status = getattr(sub, "status", "")
+# Banner text per Subscription.plan_tier
+PLAN_LABELS = {
+    "free": "Free plan",
+    "trial": "Regulate+ free trial",
+    "plus": "Regulate+ subscription",
+    "ending": "Regulate+ (ending soon)",
+}
 
-        # Trial still active
-        if sub.trial_end and sub.trial_end > now:
-            label = "Regulate+ free trial"
-            badge = "trial"
 
-        # Stripe trial status
-        elif status == "trialing":
-            label = "Regulate+ free trial"
-            badge = "trial"
+def _plan_status(sub):
+    # Subscription comes from the request's AccountState (loaded once);
+    # its tier is precomputed on save (billing.models.compute_entitlement)
+    badge = sub.current_tier() if sub else "free"
 
-        # Paid subscription
-        elif status == "active":
-            label = "Regulate+ subscription"
-            badge = "plus"
+    return {
+        "label": PLAN_LABELS[badge],
+        "badge": badge,
+    }
 
-        # Subscription scheduled to end
-        elif sub.current_period_end and sub.current_period_end > now:
-            label = "Regulate+ (ending soon)"
-            badge = "ending"
 
+def cache_versions(request):
+    """
+    Version tokens for {% cache %} fragment keys (see core/versioning.py).
+    Both are lazy: they only cost a lookup on pages that cache fragments.
+    """
     return {
-        "plan_status": {
-            "label": label,
-            "badge": badge,
-        }
+        "content_version": SimpleLazyObject(lambda: content_version(request.user)),
+        "emotion_catalog_version": SimpleLazyObject(lambda: cache_version("emotion-catalog")),
     }
@@ -0,0 +1,62 @@
+"""
+Emotion tags as integer bitmasks.
+
+Each entry also stores its tags as bits keyed by EmotionWord id, spread
+over three 64-bit columns (Entry.emotion_mask_0..2): id 1 is bit 0 of
+emotion_mask_0, id 65 is bit 0 of emotion_mask_1, and so on. That covers
+ids 1-192, comfortably more than the shipped catalog; tags on words past
+that are only in the through table, and the queryset filters fall back
+to a subquery for them.
+
+Columns are signed BIGINTs, so bit 63 is stored as the sign bit.
+"""
+
+from django.db.models import F, Q
+from django.db.models.lookups import Exact
+
+
+MASK_FIELDS = ("emotion_mask_0", "emotion_mask_1", "emotion_mask_2")
+MASK_BITS = 64
+MASK_CAPACITY = MASK_BITS * len(MASK_FIELDS)
+
+
+def _signed(value):
+    """Fold an unsigned 64-bit value into BIGINT range."""
+    return value - (1 << MASK_BITS) if value >= 1 << (MASK_BITS - 1) else value
+
+
+def is_maskable(word_id):
+    return 1 <= word_id <= MASK_CAPACITY
+
+
+def word_masks(word_ids):
+    """Return the three column values for a set of word ids."""
+    masks = [0] * len(MASK_FIELDS)
+    for word_id in word_ids:
+        if is_maskable(word_id):
+            column, bit = divmod(word_id - 1, MASK_BITS)
+            masks[column] |= 1 << bit
+    return tuple(_signed(m) for m in masks)
+
+
+def apply_masks(entry, word_ids):
+    """Set an entry's mask fields (before it is saved)."""
+    for field, value in zip(MASK_FIELDS, word_masks(word_ids)):
+        setattr(entry, field, value)
+
+
+def mask_filter(word_ids, require_all=False):
+    """
+    Q matching entries whose masks hold any (or all) of word_ids, tested
+    with bitwise AND on the entry row. Ids outside the mask range are
+    ignored here (see EntryQuerySet.with_emotions).
+    """
+    q = Q() if require_all else Q(pk__in=[])
+    for field, mask in zip(MASK_FIELDS, word_masks(word_ids)):
+        if not mask:
+            continue
+        if require_all:
+            q &= Q(Exact(F(field).bitand(mask), mask))
+        else:
+            q |= ~Q(Exact(F(field).bitand(mask), 0))
+    return q
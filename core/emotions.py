@@ -0,0 +1,232 @@
+"""
+Emotion word catalog and tagging.
+
+- get_emotion_catalog(): the word list for the entry forms, built once per
+  worker and rebuilt when the "emotion-catalog" version moves (any
+  EmotionWord save/delete bumps it, see core/signals.py); other dynos see
+  the bump within CACHE_VERSION_TTL seconds (core/versioning.py)
+- warm_emotion_catalog(): startup hook; seeds an empty table from the
+  emotion_words.json fixture and builds the catalog
+- word_key(): the one normalisation emotion words are matched on, so
+  "calm" from a form or an import finds the existing "Calm"
+- resolve_emotion_words(): selected words -> EmotionWord ids in one query,
+  creating any missing words with add_emotion_words()
+- add_emotion_words(): one conflict-ignoring bulk insert for new words
+  (shared with the importer, core/imports.py)
+- set_entry_tags(): write an entry's tag changes as one bulk delete and
+  one bulk insert on the through table (instead of M2M .set()); callers
+  set the entry's tag bitmasks with apply_masks() before saving it
+
+Bulk inserts skip model signals, so creating words bumps the
+"emotion-catalog" version here.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.apps import apps
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+
+from .emotion_masks import MASK_BITS, MASK_FIELDS, apply_masks, is_maskable, word_masks
+from .models import EmotionWord, Entry
+from .versioning import bump_cache_version, cache_version
+
+
+EntryTag = Entry.emotion_word_tags.through
+
+FIXTURE_NAME = "emotion_words.json"
+
+
+# ---------- catalog ----------
+
+@dataclass(frozen=True)
+class EmotionCatalog:
+    """An immutable snapshot of the emotion words, in display order."""
+
+    version: str
+    words: tuple  # words ordered as EmotionWord.Meta.ordering
+    ids: MappingProxyType  # word -> id
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self):
+        return len(self.words)
+
+
+_catalog = None
+
+
+def _build_catalog(version):
+    rows = tuple(EmotionWord.objects.values_list("word", "id"))
+    return EmotionCatalog(
+        version=version,
+        words=tuple(word for word, _ in rows),
+        ids=MappingProxyType(dict(rows)),
+    )
+
+
+def get_emotion_catalog():
+    """
+    Return this worker's catalog, rebuilding it if another worker (or the
+    admin) changed the words since it was built.
+
+    Costs nothing when current (bar a version read once per
+    CACHE_VERSION_TTL); one query when stale.
+    """
+    global _catalog
+    version = cache_version("emotion-catalog")
+    catalog = _catalog
+    if catalog is None or catalog.version != version:
+        # Replaced wholesale, never mutated, so threads can share it freely
+        catalog = _catalog = _build_catalog(version)
+    return catalog
+
+
+def _fixture_words():
+    path = os.path.join(apps.get_app_config("core").path, "fixtures", FIXTURE_NAME)
+    with open(path, encoding="utf-8") as fh:
+        return [
+            EmotionWord(pk=obj["pk"], word=obj["fields"]["word"])
+            for obj in json.load(fh)
+            if obj.get("model") == "core.emotionword"
+        ]
+
+
+def warm_emotion_catalog():
+    """
+    Seed an empty EmotionWord table from the fixture, then build the catalog
+    so the first form request in this worker doesn't pay for it.
+    """
+    if not EmotionWord.objects.exists():
+        EmotionWord.objects.bulk_create(_fixture_words(), ignore_conflicts=True)
+        bump_cache_version("emotion-catalog")
+    return get_emotion_catalog()
+
+
+# ---------- tagging ----------
+
+def word_key(word):
+    """The form two spellings of an emotion word are compared in."""
+    return word.strip().lower()
+
+
+def _matching_words(words):
+    """
+    EmotionWord (word, id) rows matching words under word_key().
+
+    The exact-spelling test keeps non-ASCII words matching on databases
+    whose LOWER() only folds ASCII (SQLite).
+    """
+    return EmotionWord.objects.annotate(key=Lower("word")).filter(
+        Q(key__in={word_key(w) for w in words}) | Q(word__in=words)
+    ).values_list("word", "id")
+
+
+def add_emotion_words(words):
+    """
+    Create the given new words with one conflict-ignoring bulk insert and
+    return {word_key: (word, id)} for them.
+
+    Spellings differing only in case are created once (first one wins).
+    """
+    spellings = {}
+    for word in words:
+        spellings.setdefault(word_key(word), word.strip())
+    if not spellings:
+        return {}
+
+    EmotionWord.objects.bulk_create(
+        [EmotionWord(word=w) for w in spellings.values()], ignore_conflicts=True
+    )
+    bump_cache_version("emotion-catalog")
+
+    # ignore_conflicts leaves pks unset; read back (also picks up words
+    # another request created at the same time)
+    return {
+        word_key(word): (word, word_id)
+        for word, word_id in _matching_words(spellings.values())
+        if word_key(word) in spellings
+    }
+
+
+def resolve_emotion_words(words):
+    """
+    Return {word: id} for the given words, creating missing ones.
+
+    Words are matched case-insensitively (word_key), so "calm" resolves to
+    an existing "Calm". One query when every word exists; three more when
+    some have to be created.
+    """
+    words = {w for w in words if w and w.strip()}
+    if not words:
+        return {}
+
+    found = {word_key(word): word_id for word, word_id in _matching_words(words)}
+
+    missing = {w for w in words if word_key(w) not in found}
+    if missing:
+        found.update(
+            (key, word_id) for key, (_, word_id) in add_emotion_words(missing).items()
+        )
+
+    return {w: found[word_key(w)] for w in words}
+
+
+def set_entry_tags(entry, word_ids, created=False):
+    """
+    Make an entry's tags exactly word_ids.
+
+    created=True skips reading the current tags (a new entry has none).
+    """
+    wanted = set(word_ids)
+    if created:
+        current = set()
+    else:
+        current = set(
+            EntryTag.objects.filter(entry_id=entry.pk).values_list("emotionword_id", flat=True)
+        )
+
+    removed = current - wanted
+    if removed:
+        EntryTag.objects.filter(entry_id=entry.pk, emotionword_id__in=removed).delete()
+
+    added = wanted - current
+    if added:
+        EntryTag.objects.bulk_create(
+            [EntryTag(entry_id=entry.pk, emotionword_id=i) for i in added],
+            ignore_conflicts=True,
+        )
+
+
+def refresh_emotion_masks(entry_ids):
+    """
+    Recompute the tag bitmasks of the given entries from the through table.
+
+    For tag changes made through the M2M manager (admin, shell); the entry
+    views set the masks on save instead.
+    """
+    tags = {}
+    for entry_id, word_id in EntryTag.objects.filter(entry_id__in=entry_ids).values_list(
+        "entry_id", "emotionword_id"
+    ):
+        tags.setdefault(entry_id, []).append(word_id)
+
+    entries = [Entry(pk=entry_id) for entry_id in entry_ids]
+    for entry in entries:
+        apply_masks(entry, tags.get(entry.pk, ()))
+    Entry.objects.bulk_update(entries, MASK_FIELDS)
+
+
+def drop_word_from_masks(word_id):
+    """Clear a deleted word's bit from every entry (its through rows cascade away)."""
+    if not is_maskable(word_id):
+        return
+    column = (word_id - 1) // MASK_BITS
+    field = MASK_FIELDS[column]
+    Entry.objects.with_emotions([word_id]).update(
+        **{field: F(field).bitand(~word_masks([word_id])[column])}
+    )
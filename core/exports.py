@@ -0,0 +1,183 @@
+"""
+Streaming export of a user's entries, emotion tags and revision history.
+
+Rows are produced by generators over chunked queries, so memory stays flat
+however many entries a user has, and the first bytes (the CSV header) are
+sent before any query runs. Under ASGI the view wraps them in aiter_chunks()
+so they keep streaming.
+"""
+
+import csv
+import json
+from itertools import batched
+
+from asgiref.sync import sync_to_async
+
+from .models import Entry, EntryRevision
+from .revisions import REVISION_ORDER, VERSIONED_FIELDS, rebuild_states
+
+
+# Entries fetched per round trip (tags + revisions are loaded per chunk)
+EXPORT_CHUNK_SIZE = 500
+
+CSV_COLUMNS = [
+    "record_type",
+    "entry_id",
+    "revision_id",
+    "created_at",
+    "mood",
+    "hue",
+    "emotion_words",
+    "emotion_tags",
+    "notes",
+]
+
+ENTRY_FIELDS = ("id", "created_at", "mood", "hue", "emotion_words", "notes")
+REVISION_FIELDS = (
+    "id",
+    "entry_id",
+    "created_at",
+    "mood",
+    "hue",
+    "emotion_words",
+    "notes",
+    "is_keyframe",
+    "delta",
+)
+
+
+class _Echo:
+    """File-like object whose write() just returns the line (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def _entry_chunks(user):
+    """
+    Yield lists of (entry, tags, revisions) in chronological order.
+
+    Each chunk costs three queries: entries (streamed from a server-side
+    cursor where supported), their tag words and their revisions.
+    """
+    entries = (
+        Entry.objects.filter(user=user)
+        .order_by("created_at", "id")
+        .values(*ENTRY_FIELDS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    Tag = Entry.emotion_word_tags.through
+
+    for chunk in batched(entries, EXPORT_CHUNK_SIZE):
+        ids = [e["id"] for e in chunk]
+
+        tags = {}
+        for entry_id, word in (
+            Tag.objects.filter(entry_id__in=ids)
+            .order_by("emotionword__word")
+            .values_list("entry_id", "emotionword__word")
+        ):
+            tags.setdefault(entry_id, []).append(word)
+
+        revisions = {}
+        for rev in (
+            EntryRevision.objects.filter(entry_id__in=ids)
+            .order_by("entry_id", *REVISION_ORDER)
+            .values(*REVISION_FIELDS)
+        ):
+            revisions.setdefault(rev["entry_id"], []).append(rev)
+
+        yield [(e, tags.get(e["id"], []), _rebuilt(e, revisions.get(e["id"], []))) for e in chunk]
+
+
+def _rebuilt(entry, revisions):
+    """Fill in delta-stored revisions from the versions that follow them."""
+    states = rebuild_states(
+        {name: entry[name] for name in VERSIONED_FIELDS},
+        ((rev["is_keyframe"], rev["delta"], rev) for rev in revisions),
+    )
+    return [{**rev, **state} for rev, state in zip(revisions, states)]
+
+
+def iter_csv(user):
+    """Yield CSV lines: one "entry" row, then that entry's "revision" rows."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+
+    for chunk in _entry_chunks(user):
+        lines = []
+        for entry, tags, revisions in chunk:
+            lines.append(
+                writer.writerow(
+                    [
+                        "entry",
+                        entry["id"],
+                        "",
+                        entry["created_at"].isoformat(),
+                        entry["mood"],
+                        entry["hue"],
+                        entry["emotion_words"],
+                        ", ".join(tags),
+                        entry["notes"],
+                    ]
+                )
+            )
+            for rev in revisions:
+                lines.append(
+                    writer.writerow(
+                        [
+                            "revision",
+                            entry["id"],
+                            rev["id"],
+                            rev["created_at"].isoformat(),
+                            rev["mood"] if rev["mood"] is not None else "",
+                            rev["hue"],
+                            rev["emotion_words"],
+                            "",
+                            rev["notes"],
+                        ]
+                    )
+                )
+        yield "".join(lines)
+
+
+def iter_ndjson(user):
+    """Yield one JSON object per line: each entry with its tags and revisions."""
+    for chunk in _entry_chunks(user):
+        lines = []
+        for entry, tags, revisions in chunk:
+            record = {
+                "id": entry["id"],
+                "created_at": entry["created_at"].isoformat(),
+                "mood": entry["mood"],
+                "hue": entry["hue"],
+                "emotion_words": entry["emotion_words"],
+                "emotion_tags": tags,
+                "notes": entry["notes"],
+                "revisions": [
+                    {
+                        "id": rev["id"],
+                        "created_at": rev["created_at"].isoformat(),
+                        "mood": rev["mood"],
+                        "hue": rev["hue"],
+                        "emotion_words": rev["emotion_words"],
+                        "notes": rev["notes"],
+                    }
+                    for rev in revisions
+                ],
+            }
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        yield "".join(lines)
+
+
+async def aiter_chunks(iterator):
+    """
+    Async wrapper for iter_csv / iter_ndjson under ASGI, fetching one chunk
+    at a time. Every step runs on the request's sync thread, so the chunked
+    queries keep their connection.
+    """
+    sentinel = object()
+    step = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await step(iterator, sentinel)) is not sentinel:
+        yield chunk
@@ -35,3 +35,22 @@ class EntryForm(forms.ModelForm):
             return ""
 
         return str(max(0, min(100, hue)))
+
+
+class EntryImportForm(forms.Form):
+    """Upload form for importing entry history (CSV or NDJSON)."""
+
+    FORMAT_CHOICES = [("csv", "CSV"), ("ndjson", "NDJSON (one JSON object per line)")]
+
+    # Keep uploads to a size one request can reasonably process
+    MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+    file = forms.FileField()
+    format = forms.ChoiceField(choices=FORMAT_CHOICES, initial="csv")
+
+    def clean_file(self):
+        """Reject oversized uploads before any parsing starts."""
+        upload = self.cleaned_data["file"]
+        if upload.size > self.MAX_UPLOAD_BYTES:
+            raise forms.ValidationError("That file is too large (20 MB maximum).")
+        return upload
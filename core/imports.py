@@ -0,0 +1,324 @@
+"""
+Bulk import of entry history from CSV or NDJSON.
+
+Files are read and validated row by row (never fully loaded), then written
+in batches: bulk_create for entries and revisions, one query to resolve
+emotion words, and batched inserts into the emotion_word_tags through table.
+
+Accepted formats match core/exports.py, so an export can be re-imported:
+- CSV with at least created_at / mood or hue / emotion_words / notes columns.
+  Rows with record_type "revision" attach to the preceding entry row.
+- NDJSON: one object per line, optionally with a nested "revisions" list.
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from itertools import batched
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .emotion_masks import apply_masks
+from .emotions import add_emotion_words, word_key
+from .limits import entry_allowance, get_account_state
+from .models import EmotionWord, Entry, EntryRevision, make_notes_preview
+from .rollups import refresh_days
+from .search import get_search_backend
+from .versioning import bump_content_version
+
+
+# Entries written per bulk insert
+IMPORT_BATCH_SIZE = 500
+
+# Stop collecting after this many invalid rows
+MAX_IMPORT_ERRORS = 20
+
+MAX_NOTES_LENGTH = 20000
+MAX_EMOTION_WORDS_LENGTH = Entry._meta.get_field("emotion_words").max_length
+MAX_WORD_LENGTH = EmotionWord._meta.get_field("word").max_length
+
+
+class ImportRowError(ValueError):
+    """A row that failed validation."""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import run."""
+
+    created: int = 0
+    revisions: int = 0
+    skipped_over_limit: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+@dataclass
+class _Row:
+    line: int
+    created_at: object
+    mood: int
+    hue: str
+    words: list
+    notes: str
+    revisions: list = field(default_factory=list)
+
+
+# ---------- parsing ----------
+
+def _mood_from_hue(hue_value):
+    """Same banding as the entry form: 0-100 hue -> mood 1-5."""
+    return max(1, min(5, (hue_value // 20) + 1))
+
+
+def _parse_created_at(value):
+    if value in (None, ""):
+        return timezone.now()
+
+    value = str(value).strip()
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ImportRowError(f"created_at '{value}' is not a date or datetime.")
+        parsed = datetime.combine(day, time.min)
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _parse_words(value):
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        raise ImportRowError("emotion_words must be a comma-separated string or a list.")
+    words = [str(w).strip() for w in value if str(w).strip()]
+    for word in words:
+        if len(word) > MAX_WORD_LENGTH:
+            raise ImportRowError(f"emotion word '{word[:20]}…' is longer than {MAX_WORD_LENGTH} characters.")
+    return words
+
+
+def _parse_fields(raw):
+    """Validate one record (entry or revision) into its field values."""
+    hue = str(raw.get("hue") if raw.get("hue") is not None else "").strip()
+    mood = raw.get("mood")
+
+    hue_value = None
+    if hue:
+        try:
+            hue_value = max(0, min(100, int(hue)))
+        except ValueError:
+            raise ImportRowError(f"hue '{hue}' is not a number between 0 and 100.")
+
+    if mood in (None, ""):
+        if hue_value is None:
+            raise ImportRowError("each row needs a mood (1-5) or a hue (0-100).")
+        mood = _mood_from_hue(hue_value)
+    else:
+        try:
+            mood = int(mood)
+        except (TypeError, ValueError):
+            raise ImportRowError(f"mood '{mood}' is not a number between 1 and 5.")
+        if not 1 <= mood <= 5:
+            raise ImportRowError(f"mood '{mood}' is not a number between 1 and 5.")
+
+    notes = raw.get("notes") or ""
+    if not isinstance(notes, str):
+        raise ImportRowError("notes must be text.")
+    if len(notes) > MAX_NOTES_LENGTH:
+        raise ImportRowError(f"notes are longer than {MAX_NOTES_LENGTH} characters.")
+
+    return {
+        "created_at": _parse_created_at(raw.get("created_at")),
+        "mood": mood,
+        "hue": str(hue_value) if hue_value is not None else "",
+        # Regulate exports carry both; other trackers usually only one
+        "words": _parse_words(raw.get("emotion_words") or raw.get("emotion_tags")),
+        "notes": notes,
+    }
+
+
+def _iter_csv(fileobj):
+    """Yield (line, raw_entry, [raw_revisions]) from a CSV file."""
+    reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    current = None
+
+    for raw in reader:
+        if (raw.get("record_type") or "entry").strip() == "revision":
+            if current is None:
+                raise ImportRowError(f"line {reader.line_num}: revision row before any entry row.")
+            current[2].append(raw)
+            continue
+
+        if current is not None:
+            yield current
+        current = (reader.line_num, raw, [])
+
+    if current is not None:
+        yield current
+
+
+def _iter_ndjson(fileobj):
+    """Yield (line, raw_entry, [raw_revisions]) from an NDJSON file."""
+    for line, text in enumerate(io.TextIOWrapper(fileobj, encoding="utf-8-sig"), start=1):
+        if not text.strip():
+            continue
+        try:
+            raw = json.loads(text)
+        except json.JSONDecodeError:
+            raise ImportRowError(f"line {line}: not valid JSON.")
+        if not isinstance(raw, dict):
+            raise ImportRowError(f"line {line}: expected a JSON object.")
+        revisions = raw.get("revisions") or []
+        if not isinstance(revisions, list):
+            raise ImportRowError(f"line {line}: revisions must be a list.")
+        yield line, raw, revisions
+
+
+def _iter_rows(fileobj, fmt, result):
+    """Yield validated _Rows, recording (line, message) errors on result."""
+    records = _iter_ndjson(fileobj) if fmt == "ndjson" else _iter_csv(fileobj)
+
+    try:
+        for line, raw, raw_revisions in records:
+            try:
+                row = _Row(line=line, **_parse_fields(raw))
+                row.revisions = [_parse_fields(r) for r in raw_revisions]
+            except ImportRowError as exc:
+                result.errors.append((line, str(exc)))
+                if len(result.errors) >= MAX_IMPORT_ERRORS:
+                    return
+                continue
+            yield row
+    except (ImportRowError, UnicodeDecodeError, csv.Error) as exc:
+        result.errors.append((None, str(exc)))
+
+
+# ---------- writing ----------
+
+def _resolve_words(words, catalog):
+    """
+    Map words onto catalog ids (matched on word_key, as the entry forms
+    do), creating any missing words in one bulk insert.
+    """
+    missing = {w for w in words if word_key(w) not in catalog}
+    if missing:
+        catalog.update(add_emotion_words(missing))
+
+
+def _catalog_words(words, catalog):
+    """A row's words as catalog (word, id) pairs, in order, without repeats."""
+    found = {}
+    for word in words:
+        if word_key(word) in catalog:
+            found.setdefault(word_key(word), catalog[word_key(word)])
+    return list(found.values())
+
+
+def _write_batch(user, rows, catalog, result):
+    _resolve_words({w for row in rows for w in row.words}, catalog)
+
+    entries = []
+    for row in rows:
+        words = _catalog_words(row.words, catalog)
+        entries.append(
+            Entry(
+                user=user,
+                created_at=row.created_at,
+                mood=row.mood,
+                hue=row.hue,
+                emotion_words=", ".join(word for word, _ in words)[:MAX_EMOTION_WORDS_LENGTH],
+                notes=row.notes,
+                notes_preview=make_notes_preview(row.notes),
+                revision_count=len(row.revisions),
+            )
+        )
+        apply_masks(entries[-1], {word_id for _, word_id in words})
+    Entry.objects.bulk_create(entries)
+
+    Tag = Entry.emotion_word_tags.through
+    Tag.objects.bulk_create(
+        [
+            Tag(entry_id=entry.pk, emotionword_id=word_id)
+            for entry, row in zip(entries, rows)
+            for _, word_id in _catalog_words(row.words, catalog)
+        ],
+        batch_size=IMPORT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+    revisions = [
+        EntryRevision(
+            entry=entry,
+            created_at=rev["created_at"],
+            mood=rev["mood"],
+            hue=rev["hue"],
+            emotion_words=", ".join(rev["words"])[:MAX_EMOTION_WORDS_LENGTH],
+            notes=rev["notes"],
+        )
+        for entry, row in zip(entries, rows)
+        for rev in row.revisions
+    ]
+    EntryRevision.objects.bulk_create(revisions, batch_size=IMPORT_BATCH_SIZE)
+
+    # bulk_create skips save signals, so index explicitly
+    get_search_backend().index_entries(entries)
+
+    result.created += len(entries)
+    result.revisions += len(revisions)
+
+
+def import_entries(user, fileobj, fmt="csv"):
+    """
+    Import entries for a user from a binary file object.
+
+    All-or-nothing: if any row is invalid nothing is saved and the errors
+    are returned. Free-plan users only get rows up to FREE_ENTRY_LIMIT;
+    the rest are counted in skipped_over_limit.
+    """
+    result = ImportResult()
+
+    with transaction.atomic():
+        # Locks the user's entry counter until the import commits
+        remaining = entry_allowance(user)
+
+        # One query for the whole catalog: word_key -> (word, id)
+        catalog = {
+            word_key(word): (word, word_id)
+            for word, word_id in EmotionWord.objects.values_list("word", "id")
+        }
+
+        # Local days touched, for the DailyMood refresh at the end
+        days = set()
+
+        for batch in batched(_iter_rows(fileobj, fmt, result), IMPORT_BATCH_SIZE):
+            rows = list(batch)
+            if remaining is not None:
+                result.skipped_over_limit += max(0, len(rows) - remaining)
+                rows = rows[:remaining]
+                remaining -= len(rows)
+            if rows and not result.errors:
+                _write_batch(user, rows, catalog, result)
+                days.update(timezone.localdate(row.created_at) for row in rows)
+
+        if result.errors:
+            transaction.set_rollback(True)
+            result.created = result.revisions = 0
+        elif result.created:
+            refresh_days(user.pk, days)
+            # bulk_create sends no signals: move the entry counter here
+            bump_content_version(user.pk, entry_delta=result.created)
+            get_account_state(user).refresh()
+
+    return result
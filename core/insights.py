@@ -0,0 +1,336 @@
+"""
+Mood insights computed over compact per-user NumPy arrays.
+
+A user's history is loaded into a MoodHistory (a handful of typed arrays,
+~16 bytes per entry) rather than model instances, and can be written as
+memory-mappable .npy snapshots (settings.INSIGHTS_SNAPSHOT_DIR) so a cold
+worker maps the arrays from disk instead of querying every entry.
+
+compute_insights() then derives rolling averages, volatility, weekday and
+hour patterns, streaks and emotion co-occurrence with vectorised operations.
+user_insights() caches that small result (words resolved) per user, content
+version and day, so repeat dashboard loads skip the arrays altogether; the
+arrays themselves are never put in the cache, which would pickle a copy of
+every mapped array on each hit.
+"""
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, fields
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .emotion_masks import MASK_CAPACITY, MASK_FIELDS
+from .models import EmotionWord, Entry
+from .versioning import content_version
+
+
+# Seconds computed insights are kept in the per-worker cache
+INSIGHTS_CACHE_TIMEOUT = 60 * 60
+
+# Entries needed before patterns are worth showing
+MIN_ENTRIES_FOR_INSIGHTS = 3
+
+WEEKDAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Six-hour blocks, starting at midnight
+TIME_OF_DAY_LABELS = ["Night", "Morning", "Afternoon", "Evening"]
+
+# Marker for entries with no (numeric) hue
+NO_HUE = -1
+
+
+@dataclass(frozen=True)
+class MoodHistory:
+    """
+    A user's entries as parallel arrays, oldest first.
+
+    Tags are stored as (entry index, emotion word id) pairs so entries can
+    have any number of them.
+    """
+
+    day: np.ndarray  # int32 local date ordinal
+    hour: np.ndarray  # int8 local hour of day
+    mood: np.ndarray  # int8 1-5
+    hue: np.ndarray  # int16 0-100, NO_HUE if missing
+    tag_entry: np.ndarray  # int32 index into the arrays above
+    tag_word: np.ndarray  # int32 EmotionWord id
+
+    def __len__(self):
+        return len(self.mood)
+
+
+# ---------- loading ----------
+
+def _parse_hue(hue):
+    hue = (hue or "").strip()
+    return int(hue) if hue.isdigit() and len(hue) <= 3 else NO_HUE
+
+
+def _mask_pairs(masks):
+    """
+    Decode (n, 3) int64 tag bitmasks into (entry index, word id) pairs.
+
+    Bits are unpacked little-endian, so bit k of column c is word id
+    c * 64 + k + 1 (see core/emotion_masks.py).
+    """
+    as_bytes = np.ascontiguousarray(masks, dtype="<i8").view(np.uint8)
+    bits = np.unpackbits(
+        as_bytes.reshape(len(masks), masks.shape[1] * 8),
+        axis=1,
+        bitorder="little",
+    )
+    entry_index, bit = np.nonzero(bits)
+    return entry_index, bit + 1
+
+
+def load_history(user):
+    """
+    Build a MoodHistory from the database.
+
+    Tags come from the entries' bitmask columns, so there is no join; only
+    words beyond the mask range need a second (normally empty) query.
+    """
+    rows = (
+        Entry.objects.filter(user=user)
+        .order_by("created_at", "id")
+        .values_list("id", "created_at", "mood", "hue", *MASK_FIELDS)
+    )
+
+    ids, day, hour, mood, hue, masks = [], [], [], [], [], []
+    for entry_id, created_at, entry_mood, entry_hue, *entry_masks in rows.iterator(chunk_size=2000):
+        local = timezone.localtime(created_at)
+        ids.append(entry_id)
+        day.append(local.toordinal())
+        hour.append(local.hour)
+        mood.append(entry_mood)
+        hue.append(_parse_hue(entry_hue))
+        masks.append(entry_masks)
+
+    ids = np.asarray(ids, dtype=np.int64)
+    tag_entry, tag_word = _mask_pairs(
+        np.asarray(masks, dtype=np.int64).reshape(-1, len(MASK_FIELDS))
+    )
+
+    Tag = Entry.emotion_word_tags.through
+    overflow = np.asarray(
+        list(
+            Tag.objects.filter(entry__user=user, emotionword_id__gt=MASK_CAPACITY)
+            .values_list("entry_id", "emotionword_id")
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    if len(overflow):
+        # Skip tags of entries created between the two queries
+        overflow = overflow[np.isin(overflow[:, 0], ids)]
+        # Map entry ids onto array positions (ids are not in created_at order after imports)
+        order = np.argsort(ids)
+        positions = order[np.searchsorted(ids, overflow[:, 0], sorter=order)]
+        tag_entry = np.concatenate((tag_entry, positions))
+        tag_word = np.concatenate((tag_word, overflow[:, 1]))
+
+    return MoodHistory(
+        day=np.asarray(day, dtype=np.int32),
+        hour=np.asarray(hour, dtype=np.int8),
+        mood=np.asarray(mood, dtype=np.int8),
+        hue=np.asarray(hue, dtype=np.int16),
+        tag_entry=tag_entry.astype(np.int32),
+        tag_word=tag_word.astype(np.int32),
+    )
+
+
+# ---------- snapshots ----------
+
+def _snapshot_root():
+    return getattr(settings, "INSIGHTS_SNAPSHOT_DIR", "")
+
+
+def _snapshot_dir(user_id, version):
+    return os.path.join(_snapshot_root(), str(user_id), version)
+
+
+def read_snapshot(user_id, version):
+    """Memory-map a saved MoodHistory, or return None if there isn't one."""
+    path = _snapshot_dir(user_id, version)
+    try:
+        return MoodHistory(
+            **{
+                f.name: np.load(os.path.join(path, f"{f.name}.npy"), mmap_mode="r")
+                for f in fields(MoodHistory)
+            }
+        )
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(user_id, version, history):
+    """
+    Save a MoodHistory as .npy files and drop the user's older versions.
+
+    Written to a temporary directory then renamed, so readers never see a
+    partial snapshot.
+    """
+    user_dir = os.path.join(_snapshot_root(), str(user_id))
+    os.makedirs(user_dir, exist_ok=True)
+
+    tmp = tempfile.mkdtemp(dir=user_dir, prefix=".tmp-")
+    for f in fields(MoodHistory):
+        np.save(os.path.join(tmp, f"{f.name}.npy"), getattr(history, f.name))
+
+    try:
+        os.rename(tmp, _snapshot_dir(user_id, version))
+    except OSError:
+        # Another worker wrote this version first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    for name in os.listdir(user_dir):
+        if name != version and not name.startswith(".tmp-"):
+            shutil.rmtree(os.path.join(user_dir, name), ignore_errors=True)
+
+
+def get_history(user, version=None):
+    """Return the user's MoodHistory, from a disk snapshot or the database."""
+    version = version or content_version(user)
+
+    history = read_snapshot(user.pk, version) if _snapshot_root() else None
+    if history is None:
+        history = load_history(user)
+        if _snapshot_root():
+            try:
+                write_snapshot(user.pk, version, history)
+            except OSError:
+                pass
+    return history
+
+
+# ---------- analysis ----------
+
+def _grouped_means(keys, values, size):
+    """Mean of values per integer key in [0, size); None where a key has no values."""
+    counts = np.bincount(keys, minlength=size)
+    totals = np.bincount(keys, weights=values, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / counts
+    return [None if n == 0 else round(float(m), 2) for m, n in zip(means, counts)]
+
+
+def _window_mean(days, daily_means, start, end):
+    """Mean of the daily means for days in [start, end), or None."""
+    mask = (days >= start) & (days < end)
+    return round(float(daily_means[mask].mean()), 2) if mask.any() else None
+
+
+def _streaks(days, today):
+    """(current, longest) runs of consecutive days with at least one entry."""
+    if not len(days):
+        return 0, 0
+
+    # Break points where the gap to the previous logged day is more than one
+    breaks = np.flatnonzero(np.diff(days) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    lengths = np.diff(np.concatenate((starts, [len(days)])))
+
+    # A run still counts as current if the last entry was today or yesterday
+    current = int(lengths[-1]) if days[-1] >= today - 1 else 0
+    return current, int(lengths.max())
+
+
+def _co_occurrence(history, limit):
+    """Top emotion word pairs tagged on the same entries: [(id_a, id_b, count)]."""
+    if not len(history.tag_word):
+        return []
+
+    word_ids, word_index = np.unique(history.tag_word, return_inverse=True)
+    # float32 so the product goes through BLAS (integer matmul does not)
+    tagged = np.zeros((len(history), len(word_ids)), dtype=np.float32)
+    tagged[history.tag_entry, word_index] = 1
+
+    pairs = np.rint(tagged.T @ tagged).astype(np.int64)
+    upper = np.triu(pairs, k=1)
+    flat = np.argsort(upper, axis=None)[::-1][:limit]
+    rows, cols = np.unravel_index(flat, upper.shape)
+
+    return [
+        (int(word_ids[a]), int(word_ids[b]), int(upper[a, b]))
+        for a, b in zip(rows, cols)
+        if upper[a, b] > 0
+    ]
+
+
+def compute_insights(history, today=None, pairs=5):
+    """
+    Summarise a MoodHistory into plain values for templates / JSON.
+
+    Returns None when there are too few entries to say anything useful.
+    """
+    if len(history) < MIN_ENTRIES_FOR_INSIGHTS:
+        return None
+
+    today = (today or timezone.localdate()).toordinal()
+    mood = history.mood.astype(np.float64)
+
+    # One mean per logged day; later windows work on days, not entries
+    days, day_index = np.unique(history.day, return_inverse=True)
+    daily_means = np.bincount(day_index, weights=mood) / np.bincount(day_index)
+
+    recent = daily_means[days > today - 30]
+    current_streak, longest_streak = _streaks(days, today)
+
+    has_hue = history.hue != NO_HUE
+
+    return {
+        "entries": len(history),
+        "days_logged": len(days),
+        "average_7": _window_mean(days, daily_means, today - 6, today + 1),
+        "average_prev_7": _window_mean(days, daily_means, today - 13, today - 6),
+        "average_30": _window_mean(days, daily_means, today - 29, today + 1),
+        # Spread of daily moods over the last 30 days (0 = very steady)
+        "volatility_30": round(float(recent.std()), 2) if len(recent) > 1 else None,
+        "mean_hue": round(float(history.hue[has_hue].mean()), 1) if has_hue.any() else None,
+        # date.toordinal() is 1 for Monday 1 January of year 1
+        "weekday_means": list(
+            zip(WEEKDAY_LABELS, _grouped_means((history.day - 1) % 7, mood, 7))
+        ),
+        "hour_means": _grouped_means(history.hour.astype(np.intp), mood, 24),
+        "time_of_day_means": list(
+            zip(TIME_OF_DAY_LABELS, _grouped_means(history.hour.astype(np.intp) // 6, mood, 4))
+        ),
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+        "emotion_pairs": _co_occurrence(history, pairs),
+    }
+
+
+_MISSING = object()
+
+
+def user_insights(user):
+    """
+    Dashboard insights for a user, with emotion pair ids resolved to words.
+
+    Cached until the user's content changes or the day rolls over (the
+    windows and streaks are relative to today).
+    """
+    version = content_version(user)
+    today = timezone.localdate()
+    key = f"insights:{user.pk}:{version}:{today:%Y%m%d}"
+
+    insights = cache.get(key, _MISSING)
+    if insights is not _MISSING:
+        return insights
+
+    insights = compute_insights(get_history(user, version), today=today)
+    if insights and insights["emotion_pairs"]:
+        word_ids = {i for a, b, _ in insights["emotion_pairs"] for i in (a, b)}
+        words = dict(EmotionWord.objects.filter(pk__in=word_ids).values_list("pk", "word"))
+        insights["emotion_pairs"] = [
+            (*sorted((words.get(a, ""), words.get(b, ""))), count)
+            for a, b, count in insights["emotion_pairs"]
+        ]
+
+    cache.set(key, insights, INSIGHTS_CACHE_TIMEOUT)
+    return insights
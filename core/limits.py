@@ -1,62 +1,116 @@
-from django.utils import timezone
+from django.db.models import F
+from django.utils.functional import cached_property
 
 from billing.models import Subscription
-from .models import Entry
+from .models import UserContentState
+from .versioning import ensure_content_state
 
 
 # Free plan entry cap
 FREE_ENTRY_LIMIT = 10
 
-# Subscription statuses treated as paid access
-PAID_STATUSES = {"trialing", "active"}
+
+class AccountState:
+    """
+    A user's plan and entry count, each loaded at most once.
+
+    AccountStateMiddleware attaches one per request, so the views, limit
+    checks and the plan banner context processor share the same two
+    queries. Call refresh() after changing entries or the subscription
+    mid-request.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def subscription(self):
+        if not self.user or not self.user.is_authenticated:
+            return None
+        return Subscription.objects.filter(user=self.user).first()
+
+    @cached_property
+    def entry_count(self):
+        # Single-row read of the stored counter (no COUNT(*) over entries)
+        if not self.user or not self.user.is_authenticated:
+            return 0
+        return ensure_content_state(self.user.pk).entry_count
+
+    @property
+    def has_paid_access(self):
+        return has_paid_access(self.subscription)
+
+    @property
+    def is_free_locked(self):
+        if self.has_paid_access:
+            return False
+        return self.entry_count >= FREE_ENTRY_LIMIT
+
+    @property
+    def entries_left(self):
+        return max(0, FREE_ENTRY_LIMIT - self.entry_count)
+
+    def refresh(self):
+        """Forget loaded values so the next access re-queries."""
+        self.__dict__.pop("subscription", None)
+        self.__dict__.pop("entry_count", None)
+
+
+def get_account_state(user):
+    """
+    Return the request's AccountState for this user, or a fresh one.
+
+    Only users loaded by AccountStateMiddleware carry a shared state; a
+    plain user object gets a new (uncached) state on every call.
+    """
+    return getattr(user, "_account_state", None) or AccountState(user)
 
 
 def get_subscription(user):
     """Return the user's Subscription, or None."""
-    if not user or not user.is_authenticated:
-        return None
-    return Subscription.objects.filter(user=user).first()
+    return get_account_state(user).subscription
 
 
 def has_paid_access(subscription):
     """
     Return True if the user should be treated as Regulate+.
-    Includes:
-    - active subscriptions
-    - trialing subscriptions
-    - trial_end still in the future
-    - canceled subscriptions still within paid period (grace period)
+
+    Reads the precomputed Subscription.paid_until (see
+    billing.models.compute_entitlement for the rules: active or trialing,
+    a future trial_end, or a canceled plan still inside its paid period).
     """
     if not subscription:
         return False
+    return subscription.has_paid_access()
 
-    now = timezone.now()
-    status = (subscription.status or "").lower()
-
-    # Active or trialing subscriptions
-    if status in PAID_STATUSES:
-        return True
 
-    # Treat any future trial_end as active trial access
-    if subscription.trial_end and subscription.trial_end > now:
-        return True
+def entry_allowance(user):
+    """
+    Return how many more entries the user may create (None = unlimited).
+
+    Takes the write lock on the user's counter row first, with a no-op
+    UPDATE: a row lock on PostgreSQL, and the database write lock on
+    SQLite (where select_for_update() does nothing and a transaction that
+    has only read can't queue for the lock). Concurrent creates therefore
+    wait for each other instead of both passing the check. Call first
+    thing inside transaction.atomic() and create the entries before it
+    commits; the Entry signals (or bulk paths) move the counter.
+    """
+    counter = UserContentState.objects.filter(user_id=user.pk)
+    if not counter.update(entry_count=F("entry_count")):
+        ensure_content_state(user.pk)
+        counter.update(entry_count=F("entry_count"))
 
-    # Grace period: canceled but access period not yet ended
-    if (
-        status == "canceled"
-        and subscription.current_period_end
-        and subscription.current_period_end > now
-    ):
-        return True
+    if get_account_state(user).has_paid_access:
+        return None
 
-    return False
+    count = counter.values_list("entry_count", flat=True).get()
+    return max(0, FREE_ENTRY_LIMIT - count)
 
 
 def user_entry_count(user):
     """Return total entry count for a user."""
-    if not user or not user.is_authenticated:
-        return 0
-    return Entry.objects.filter(user=user).count()
+    return get_account_state(user).entry_count
 
 
 def is_free_locked(user):
@@ -64,9 +118,4 @@ def is_free_locked(user):
     Return True if a free user has reached the entry limit.
     Locked users can view entries but cannot create or modify them.
     """
-    subscription = get_subscription(user)
-
-    if has_paid_access(subscription):
-        return False
-
-    return user_entry_count(user) >= FREE_ENTRY_LIMIT
+    return get_account_state(user).is_free_locked
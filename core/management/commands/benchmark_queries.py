@@ -0,0 +1,203 @@
+import random
+import statistics
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from billing.models import Subscription
+from core.cards import EntryCard
+from core.models import Entry, EntryRevision, UserContentState, make_notes_preview
+from core.rollups import rebuild
+from core.search import get_search_backend
+from core.versioning import ensure_content_state
+
+
+User = get_user_model()
+
+WORDS = ["calm", "tired", "anxious", "hopeful", "walked", "work", "sleep", "friends", "rain", "coffee"]
+
+
+class _Rollback(Exception):
+    """Raised to discard the seeded dataset at the end of a run."""
+
+
+class Command(BaseCommand):
+    """
+    Seed a large dataset and print EXPLAIN plans + timings for hot view queries.
+
+    Everything runs inside one transaction that is rolled back at the end
+    (unless --keep), so it is safe to point at a scratch copy of production.
+    Seeding uses bulk_create, which sends no signals; with --keep the
+    derived state (entry counters, mood rollups) is rebuilt before commit.
+    Use it to confirm the index audit migrations are picked up on both
+    SQLite and PostgreSQL.
+    """
+
+    help = "Seed benchmark data and print EXPLAIN plans and timings for view queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="Users to seed (default: 20).")
+        parser.add_argument(
+            "--entries", type=int, default=2000, help="Entries per user (default: 2000)."
+        )
+        parser.add_argument(
+            "--revisions",
+            type=int,
+            default=3,
+            help="Revisions for every 10th entry (default: 3).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed runs per query (default: 5)."
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Commit the seeded data (with counters and rollups rebuilt) instead of rolling back.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                users = self._seed(options)
+                self._analyze()
+                self._report(users[len(users) // 2], options["repeat"])
+                if not options["keep"]:
+                    raise _Rollback
+                self._finish(users)
+        except _Rollback:
+            self.stdout.write("Seeded data rolled back.")
+
+    # ---------- seeding ----------
+
+    def _seed(self, options):
+        started = time.perf_counter()
+        now = timezone.now()
+        run_id = random.randrange(10**6)
+
+        users = User.objects.bulk_create(
+            [
+                User(username=f"bench_{run_id}_{n}", email=f"bench_{run_id}_{n}@example.com")
+                for n in range(options["users"])
+            ]
+        )
+        # PostgreSQL returns pks from bulk_create; SQLite 3.35+ does too
+        subscriptions = [
+            Subscription(
+                user=user,
+                status="active",
+                stripe_customer_id=f"cus_bench_{run_id}_{user.pk}",
+                stripe_subscription_id=f"sub_bench_{run_id}_{user.pk}",
+            )
+            for user in users
+        ]
+        # bulk_create skips Subscription.save(), which derives the entitlement
+        for subscription in subscriptions:
+            subscription.refresh_entitlement()
+        Subscription.objects.bulk_create(subscriptions)
+
+        for user in users:
+            entries = Entry.objects.bulk_create(
+                [
+                    Entry(
+                        user=user,
+                        created_at=now - timedelta(minutes=37 * n),
+                        mood=random.randint(1, 5),
+                        hue=str(random.randint(0, 100)),
+                        emotion_words=", ".join(random.sample(WORDS, 2)),
+                        notes=(notes := " ".join(random.choices(WORDS, k=40))),
+                        notes_preview=make_notes_preview(notes),
+                        # Every 10th entry gets the revisions seeded below
+                        revision_count=0 if n % 10 else options["revisions"],
+                    )
+                    for n in range(options["entries"])
+                ],
+                batch_size=1000,
+            )
+
+            get_search_backend().index_entries(entries)
+
+            revisions = [
+                EntryRevision(entry=entry, mood=entry.mood, hue=entry.hue, notes=entry.notes)
+                for entry in entries[::10]
+                for _ in range(options["revisions"])
+            ]
+            EntryRevision.objects.bulk_create(revisions, batch_size=1000)
+
+        self.stdout.write(
+            f"Seeded {len(users)} users x {options['entries']} entries "
+            f"in {time.perf_counter() - started:.1f}s ({connection.vendor})."
+        )
+        return users
+
+    def _finish(self, users):
+        """Write the derived state the skipped signals would have kept (--keep)."""
+        user_ids = [user.pk for user in users]
+        for user_id in user_ids:
+            # A new state row starts from a COUNT(*) of the user's entries
+            ensure_content_state(user_id)
+        rebuild(user_ids)
+        self.stdout.write(f"Kept {len(user_ids)} users with counters and rollups rebuilt.")
+
+    def _analyze(self):
+        """Refresh planner statistics so EXPLAIN reflects the seeded volume."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    # ---------- measurement ----------
+
+    def _report(self, user, repeat):
+        entries = Entry.objects.filter(user=user).order_by("-created_at", "-id")
+        window = list(entries.values_list("created_at", "id")[50:51])
+        # Card projection as my_entries reads it (core/cards.py)
+        cards = entries.values_list(*EntryCard.FIELDS)
+        edited_entry = Entry.objects.filter(user=user, revisions__isnull=False).first()
+        subscription = Subscription.objects.get(user=user)
+        day_start = timezone.make_aware(datetime.combine(timezone.localdate(), dt_time.min))
+
+        queries = [
+            ("my_entries: first window", cards[:51]),
+            (
+                "my_entries: next window (keyset)",
+                cards.filter(created_at__lt=window[0][0])[:51] if window else cards[:51],
+            ),
+            (
+                "my_entries: date filter",
+                cards.filter(created_at__gte=day_start, created_at__lt=day_start + timedelta(days=1)),
+            ),
+            ("search: keyword match set", get_search_backend().filter(cards, "anxious")[:51]),
+            ("limits: entry counter", UserContentState.objects.filter(user=user).values("entry_count")),
+            (
+                "view_entry: revisions",
+                EntryRevision.objects.filter(entry=edited_entry).order_by("-created_at"),
+            ),
+            (
+                "webhook: subscription by stripe_subscription_id",
+                Subscription.objects.filter(
+                    stripe_subscription_id=subscription.stripe_subscription_id
+                ),
+            ),
+            (
+                "webhook: subscription by stripe_customer_id",
+                Subscription.objects.filter(stripe_customer_id=subscription.stripe_customer_id),
+            ),
+            # Uses auth_user_email_upper_idx on PostgreSQL; SQLite runs iexact as LIKE (scan)
+            ("allauth: user by email", User.objects.filter(email__iexact=user.email.upper())),
+        ]
+
+        for label, queryset in queries:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain())
+            self.stdout.write(
+                f"median {statistics.median(timings):.2f} ms, "
+                f"max {max(timings):.2f} ms over {repeat} runs\n"
+            )
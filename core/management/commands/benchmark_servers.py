@@ -0,0 +1,211 @@
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from billing.models import Subscription
+
+
+User = get_user_model()
+
+SERVERS = {
+    "wsgi": ["gunicorn", "regulate_project.wsgi:application", "--bind", "127.0.0.1:{port}",
+             "--workers", "{workers}", "--log-level", "warning"],
+    # As deployed (Procfile): gunicorn managing uvicorn workers
+    "asgi": ["gunicorn", "regulate_project.asgi:application", "--bind", "127.0.0.1:{port}",
+             "--workers", "{workers}", "-k", "uvicorn_worker.UvicornWorker",
+             "--log-level", "warning"],
+}
+
+SCENARIOS = {
+    # One Stripe retrieve per request (trial end missing, so the page syncs)
+    "regulate-plus": "/billing/regulate-plus/",
+    # Two Stripe retrieves, then a redirect
+    "checkout-success": "/billing/checkout-success/?session_id=cs_bench",
+}
+
+
+class _StubStripe(BaseHTTPRequestHandler):
+    """Answers the Stripe retrieves the benchmarked views make, after a delay."""
+
+    delay = 0.2
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            type(self).hits += 1
+        time.sleep(self.delay)
+
+        path = self.path.split("?")[0]
+        if re.match(r"^/v1/checkout/sessions/", path):
+            body = {"id": "cs_bench", "object": "checkout.session",
+                    "subscription": "sub_bench", "customer": "cus_bench"}
+        else:
+            body = {"id": "sub_bench", "object": "subscription", "customer": "cus_bench",
+                    "status": "trialing", "trial_end": None, "current_period_end": None}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Compare throughput of the WSGI (sync gunicorn) and ASGI (gunicorn with
+    uvicorn workers, as in the Procfile) deployments on views that wait on
+    Stripe.
+
+    A local stub stands in for Stripe (with --upstream-delay of latency per
+    call); each server runs as a subprocess against the configured database
+    with the same worker count, and is hit by --concurrency clients as a
+    logged-in benchmark user (created for the run, then deleted). The stub's
+    hit count shows whether every request really reached the upstream, as
+    calls shed by the outbound concurrency cap return early.
+    """
+
+    help = "Benchmark WSGI vs ASGI serving on Stripe-bound views, against a local Stripe stub."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario", choices=sorted(SCENARIOS), default="regulate-plus",
+            help="View to load (default: regulate-plus).",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Requests per server (default: 200).")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients (default: 16).")
+        parser.add_argument("--workers", type=int, default=2, help="Server worker processes (default: 2).")
+        parser.add_argument(
+            "--upstream-delay", type=float, default=0.2,
+            help="Seconds the stub takes per Stripe call (default: 0.2).",
+        )
+        parser.add_argument(
+            "--servers", nargs="+", choices=sorted(SERVERS), default=["wsgi", "asgi"],
+            help="Servers to run (default: both).",
+        )
+
+    def handle(self, *args, **options):
+        _StubStripe.delay = options["upstream_delay"]
+        stub = ThreadingHTTPServer(("127.0.0.1", 0), _StubStripe)
+        stub.daemon_threads = True
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+        user = User.objects.create_user(username=f"bench_server_{random.randrange(10**6)}")
+        Subscription.objects.create(user=user, status="trialing", stripe_subscription_id="sub_bench")
+        client = Client()
+        client.force_login(user)
+        cookies = {settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value}
+
+        env = dict(
+            os.environ,
+            STRIPE_API_BASE=f"http://127.0.0.1:{stub.server_port}",
+            STRIPE_SECRET_KEY="sk_test_benchmark",
+            SUPPORTIVE_PHRASE_BACKGROUND_REFILL="False",
+        )
+
+        self.stdout.write(
+            f"{options['scenario']}: {options['requests']} requests, {options['concurrency']} clients, "
+            f"{options['workers']} workers, upstream {options['upstream_delay'] * 1000:.0f} ms"
+        )
+        try:
+            for name in options["servers"]:
+                self._run_server(name, env, cookies, options)
+        finally:
+            stub.shutdown()
+            user.delete()
+
+    # ---------- servers ----------
+
+    def _run_server(self, name, env, cookies, options):
+        port = _free_port()
+        args = [arg.format(port=port, workers=options["workers"]) for arg in SERVERS[name]]
+        try:
+            process = subprocess.Popen([sys.executable, "-m", *args], env=env)
+        except OSError as exc:
+            self.stderr.write(f"{name}: could not start {args[0]} ({exc})")
+            return
+
+        base = f"http://127.0.0.1:{port}"
+        try:
+            if not _wait_ready(base, process):
+                self.stderr.write(f"{name}: {args[0]} did not start (is it installed?)")
+                return
+            _StubStripe.hits = 0
+            self._report(name, self._load(base + SCENARIOS[options["scenario"]], cookies, options))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    # ---------- load ----------
+
+    def _load(self, url, cookies, options):
+        local = threading.local()
+        # Behind Heroku's proxy in production settings; say the request was https
+        headers = {"X-Forwarded-Proto": "https"}
+
+        def one(_):
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            started = time.perf_counter()
+            try:
+                response = local.session.get(
+                    url, cookies=cookies, headers=headers, allow_redirects=False, timeout=60
+                )
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            results = list(pool.map(one, range(options["requests"])))
+        return time.perf_counter() - started, results
+
+    def _report(self, name, run):
+        elapsed, results = run
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, ok in results if not ok)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"  {name}: {len(results) / elapsed:7.1f} req/s   "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms   "
+            f"errors {errors}   upstream calls {_StubStripe.hits}"
+        )
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            requests.get(base + "/", headers={"X-Forwarded-Proto": "https"}, timeout=1)
+            return True
+        except requests.RequestException:
+            time.sleep(0.2)
+    return False
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import import_entries
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Import a CSV/NDJSON history file for one user.
+
+    Same pipeline as the web upload (validation, free-plan limit,
+    all-or-nothing), for files too large to upload comfortably.
+    """
+
+    help = "Import entries for a user from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="Username to import entries for.")
+        parser.add_argument("path", help="Path to the CSV or NDJSON file.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="File format (default: from the file extension, else csv).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['username']}'.")
+
+        fmt = options["format"]
+        if not fmt:
+            fmt = "ndjson" if options["path"].endswith((".ndjson", ".jsonl")) else "csv"
+
+        try:
+            with open(options["path"], "rb") as fileobj:
+                result = import_entries(user, fileobj, fmt)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if not result.ok:
+            for line, message in result.errors:
+                self.stderr.write(f"line {line}: {message}" if line else message)
+            raise CommandError("Import failed; nothing was saved.")
+
+        self.stdout.write(
+            f"Imported {result.created} entries and {result.revisions} revisions "
+            f"for {user.username}."
+        )
+        if result.skipped_over_limit:
+            self.stdout.write(f"Skipped {result.skipped_over_limit} entries over the free limit.")
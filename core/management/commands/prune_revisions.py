@@ -0,0 +1,89 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Entry, EntryRevision
+from core.revisions import prune_entry_revisions
+from core.versioning import bump_content_versions
+
+
+class Command(BaseCommand):
+    """
+    Apply the revision retention policy.
+
+    Only entries with revisions older than REVISION_KEEP_ALL_DAYS are
+    visited, in entry id order. Each entry is pruned in its own short
+    transaction, so the command can be stopped at any point and resumed
+    with --after (the last entry id it printed); re-running is harmless.
+    """
+
+    help = "Prune old entry revisions (keep all, then daily, then monthly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Entries looked up per batch (default: 200).",
+        )
+        parser.add_argument(
+            "--after",
+            type=int,
+            default=0,
+            help="Resume after this entry id.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches, to ease load (default: 0).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many revisions would go without deleting any.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(days=settings.REVISION_KEEP_ALL_DAYS)
+        dry_run = options["dry_run"]
+        last_id = options["after"]
+        pruned = 0
+        entries_changed = 0
+
+        while True:
+            entry_ids = list(
+                EntryRevision.objects.filter(created_at__lt=cutoff, entry_id__gt=last_id)
+                .order_by("entry_id")
+                .values_list("entry_id", flat=True)
+                .distinct()[: options["batch_size"]]
+            )
+            if not entry_ids:
+                break
+
+            changed = []
+            for entry_id in entry_ids:
+                dropped = prune_entry_revisions(entry_id, now=now, dry_run=dry_run)
+                if dropped:
+                    pruned += dropped
+                    changed.append(entry_id)
+
+            if changed and not dry_run:
+                # Cached entry pages show the history
+                bump_content_versions(
+                    Entry.objects.filter(pk__in=changed).values_list("user_id", flat=True)
+                )
+
+            entries_changed += len(changed)
+            last_id = entry_ids[-1]
+            self.stdout.write(f"... through entry {last_id}: {pruned} revisions so far")
+
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        verb = "Would prune" if dry_run else "Pruned"
+        self.stdout.write(f"{verb} {pruned} revisions from {entries_changed} entries.")
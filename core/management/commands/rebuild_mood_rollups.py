@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core.rollups import rebuild
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Recompute the DailyMood rollup table from Entry.
+
+    The write paths keep rollups current incrementally; run this after
+    writes that bypass them (shell, raw SQL) or a time zone change.
+    """
+
+    help = "Rebuild DailyMood rollups from entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only rebuild for this username (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Users rebuilt per transaction (default: 200).",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("pk")
+        if options["usernames"]:
+            users = users.filter(username__in=options["usernames"])
+
+        user_ids = list(users.values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+        written = 0
+
+        # Small per-user batches keep each transaction (and lock) short
+        for start in range(0, len(user_ids), batch_size):
+            written += rebuild(user_ids[start:start + batch_size])
+
+        self.stdout.write(f"Rebuilt {written} daily rollups for {len(user_ids)} users.")
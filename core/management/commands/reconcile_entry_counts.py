@@ -0,0 +1,29 @@
+from django.db.models import Count, OuterRef
+
+from core.management.reconcile import ReconcileCountCommand
+from core.models import Entry, UserContentState
+
+
+class Command(ReconcileCountCommand):
+    """
+    Repair drift in UserContentState.entry_count.
+
+    The counter moves with Entry save/delete signals and the import path;
+    raw SQL, bulk scripts or a race while a user's state row is first
+    created can leave it out of step with the real number of entries.
+    """
+
+    help = "Recalculate per-user entry counters from Entry rows."
+
+    model = UserContentState
+    field = "entry_count"
+    noun = "users"
+
+    def actual_counts(self):
+        return (
+            Entry.objects.filter(user=OuterRef("user"))
+            .order_by()
+            .values("user")
+            .annotate(n=Count("id"))
+            .values("n")
+        )
@@ -0,0 +1,28 @@
+from django.db.models import Count, OuterRef
+
+from core.management.reconcile import ReconcileCountCommand
+from core.models import Entry, EntryRevision
+
+
+class Command(ReconcileCountCommand):
+    """
+    Repair drift in Entry.revision_count.
+
+    The counter is kept up to date by edit_entry, but writes that bypass the
+    view (shell, bulk scripts) can leave it out of step with EntryRevision.
+    """
+
+    help = "Recalculate Entry.revision_count from EntryRevision rows."
+
+    model = Entry
+    field = "revision_count"
+    noun = "entries"
+
+    def actual_counts(self):
+        return (
+            EntryRevision.objects.filter(entry=OuterRef("pk"))
+            .order_by()
+            .values("entry")
+            .annotate(n=Count("id"))
+            .values("n")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.phrases import POOL_SIZE, pool_size, refill
+
+
+class Command(BaseCommand):
+    """
+    Top up the shared supportive phrase pool.
+
+    Web workers refill it from a background thread by default; schedule
+    this instead when SUPPORTIVE_PHRASE_BACKGROUND_REFILL is off.
+    """
+
+    help = "Refill the dashboard's supportive phrase pool."
+
+    def handle(self, *args, **options):
+        added = refill()
+        self.stdout.write(f"Added {added} phrases ({pool_size()}/{POOL_SIZE} in pool).")
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+
+
+class ReconcileCountCommand(BaseCommand):
+    """
+    Base for commands that repair a denormalised counter column.
+
+    Subclasses set `model`, `field` (the stored counter), `noun` (what one
+    row is, for the report) and implement actual_counts(): a one-value
+    subquery giving the real count for the OuterRef'd row.
+    """
+
+    model = None
+    field = None
+    noun = "rows"
+
+    def actual_counts(self):
+        raise NotImplementedError
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help=f"{self.noun.capitalize()} to check per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted counters without changing them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        actual = Coalesce(Subquery(self.actual_counts()), 0)
+
+        checked = 0
+        fixed = 0
+        last_id = 0
+
+        # Walk rows in id order so each batch is a short, bounded query
+        while True:
+            batch = list(
+                self.model.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .annotate(actual=actual)
+                .values_list("pk", self.field, "actual")[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_id = batch[-1][0]
+            checked += len(batch)
+
+            for pk, stored, count in batch:
+                if stored == count:
+                    continue
+                fixed += 1
+                if not dry_run:
+                    # Re-count inside the UPDATE so concurrent writes aren't lost
+                    self.model.objects.filter(pk=pk).update(**{self.field: actual})
+
+        verb = "would fix" if dry_run else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} {self.noun}; {verb} {fixed}.")
+        )
@@ -0,0 +1,87 @@
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.middleware import get_user
+from django.utils.functional import SimpleLazyObject
+
+from .limits import AccountState, get_account_state
+from .outbound import deadline
+
+
+class AccountStateMiddleware:
+    """
+    Give each request one shared AccountState (see core/limits.py).
+
+    The state is attached to the request's user object (so limit helpers
+    that receive request.user find it) and exposed as request.account_state.
+    Both stay lazy: requests that never look at the user run no queries.
+    Must come after AuthenticationMiddleware.
+
+    Works sync and async. request.auser() is routed through the same
+    lookup, so async views (and async login_required) get the very user
+    object the sync code sees, loaded once; they should still read the
+    state in a sync_to_async call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _attach(self, request):
+        request.user = SimpleLazyObject(lambda: _user_with_state(request))
+        request.auser = partial(_auser_with_state, request)
+        request.account_state = SimpleLazyObject(lambda: get_account_state(request.user))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self._attach(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self._attach(request)
+        return await self.get_response(request)
+
+
+def _user_with_state(request):
+    # Same cached lookup AuthenticationMiddleware uses
+    user = get_user(request)
+    if not hasattr(user, "_account_state"):
+        user._account_state = AccountState(user)
+    return user
+
+
+async def _auser_with_state(request):
+    return await sync_to_async(_user_with_state)(request)
+
+
+class OutboundDeadlineMiddleware:
+    """
+    Give each request a budget for outbound calls (core/outbound.py), so
+    Stripe or phrase API timeouts shrink as the request runs long.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with deadline(settings.OUTBOUND_REQUEST_BUDGET):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # The budget is a context variable, so it follows the request into
+        # sync_to_async threads
+        with deadline(settings.OUTBOUND_REQUEST_BUDGET):
+            return await self.get_response(request)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_revision_counts(apps, schema_editor):
+    """Populate revision_count from existing EntryRevision rows."""
+    Entry = apps.get_model("core", "Entry")
+    EntryRevision = apps.get_model("core", "EntryRevision")
+
+    counts = (
+        EntryRevision.objects.filter(entry=OuterRef("pk"))
+        .order_by()
+        .values("entry")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    Entry.objects.update(revision_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_entry_emotion_word_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='revision_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of saved revisions for this entry.'),
+        ),
+        migrations.RunPython(backfill_revision_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations, transaction
+from django.db.utils import DatabaseError
+
+
+# PostgreSQL: stored tsvector (emotion words weighted above notes) + GIN index
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_entry ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(emotion_words, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(notes, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX core_entry_search_vector_gin ON core_entry USING gin (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS core_entry_search_vector_gin",
+    "ALTER TABLE core_entry DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: FTS5 shadow table keyed by entry id (rowid), filled from signals
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS core_entry_fts
+    USING fts5(notes, emotion_words, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    """
+    INSERT INTO core_entry_fts (rowid, notes, emotion_words)
+    SELECT id, notes, emotion_words FROM core_entry
+    """,
+]
+SQLITE_REVERSE = ["DROP TABLE IF EXISTS core_entry_fts"]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == "sqlite":
+        # SQLite builds without FTS5 fall back to icontains search (core/search.py)
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                _run(schema_editor, SQLITE_FORWARD)
+        except DatabaseError:
+            pass
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        _run(schema_editor, POSTGRES_REVERSE)
+    elif vendor == "sqlite":
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_entry_revision_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
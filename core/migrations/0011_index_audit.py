@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_entry_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='core_entry_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entryrevision',
+            index=models.Index(fields=['entry', '-created_at'], name='core_rev_entry_created_idx'),
+        ),
+    ]
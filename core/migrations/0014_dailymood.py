@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, IntegerField, Max, Min, Sum, When
+from django.db.models.functions import Cast, Coalesce, TruncDate
+
+
+def backfill_daily_moods(apps, schema_editor):
+    """Build rollups for existing entries (same grouping as core.rollups)."""
+    Entry = apps.get_model("core", "Entry")
+    DailyMood = apps.get_model("core", "DailyMood")
+
+    hue = Case(
+        When(hue__regex=r"^[0-9]{1,3}$", then=Cast("hue", IntegerField())),
+        default=None,
+        output_field=IntegerField(),
+    )
+    rows = (
+        Entry.objects.annotate(day=TruncDate("created_at"))
+        .order_by()
+        .values("user_id", "day")
+        .annotate(
+            entry_count=Count("id"),
+            mood_total=Sum("mood"),
+            mood_min=Min("mood"),
+            mood_max=Max("mood"),
+            hue_total=Coalesce(Sum(hue), 0),
+            hue_count=Count(hue),
+            last_entry_at=Max("created_at"),
+        )
+    )
+    DailyMood.objects.bulk_create((DailyMood(**values) for values in rows), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_created_at_default_now'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMood',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('mood_total', models.PositiveIntegerField(default=0)),
+                ('mood_min', models.PositiveSmallIntegerField()),
+                ('mood_max', models.PositiveSmallIntegerField()),
+                ('hue_total', models.PositiveIntegerField(default=0)),
+                ('hue_count', models.PositiveIntegerField(default=0)),
+                ('last_entry_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_moods', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily mood',
+                'verbose_name_plural': 'Daily moods',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='core_dailymood_user_day_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_moods, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_entry_counts(apps, schema_editor):
+    """Count entries for users that already have a state row (others are counted lazily)."""
+    Entry = apps.get_model("core", "Entry")
+    UserContentState = apps.get_model("core", "UserContentState")
+
+    counts = (
+        Entry.objects.filter(user=OuterRef("user"))
+        .order_by()
+        .values("user")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    UserContentState.objects.update(entry_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_dailymood'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercontentstate',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_entry_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:59
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+# Frozen copy of the core/emotion_masks.py layout as of this migration
+
+MASK_FIELDS = ("emotion_mask_0", "emotion_mask_1", "emotion_mask_2")
+MASK_BITS = 64
+
+
+def word_masks(word_ids):
+    """The three signed BIGINT column values for a set of word ids."""
+    masks = [0] * len(MASK_FIELDS)
+    for word_id in word_ids:
+        if 1 <= word_id <= MASK_BITS * len(MASK_FIELDS):
+            column, bit = divmod(word_id - 1, MASK_BITS)
+            masks[column] |= 1 << bit
+    return tuple(m - (1 << MASK_BITS) if m >= 1 << (MASK_BITS - 1) else m for m in masks)
+
+
+def backfill_emotion_masks(apps, schema_editor):
+    """Set the new mask columns from each entry's existing tags."""
+    Entry = apps.get_model("core", "Entry")
+    Tag = Entry.emotion_word_tags.through
+
+    tags = (
+        Tag.objects.order_by("entry_id")
+        .values_list("entry_id", "emotionword_id")
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for entry_id, rows in groupby(tags, key=lambda row: row[0]):
+        entry = Entry(pk=entry_id)
+        for field, value in zip(MASK_FIELDS, word_masks(word_id for _, word_id in rows)):
+            setattr(entry, field, value)
+        batch.append(entry)
+        if len(batch) >= 500:
+            Entry.objects.bulk_update(batch, MASK_FIELDS)
+            batch = []
+    Entry.objects.bulk_update(batch, MASK_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_usercontentstate_entry_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='emotion_mask_0',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='emotion_mask_1',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='emotion_mask_2',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_emotion_masks, migrations.RunPython.noop),
+    ]
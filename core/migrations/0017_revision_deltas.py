@@ -0,0 +1,137 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:02
+
+from difflib import SequenceMatcher
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+# Frozen copy of the core/revisions.py delta format as of this migration,
+# so later changes there can't alter what it writes or reads back
+
+KEYFRAME_INTERVAL = 10
+VERSIONED_FIELDS = ("mood", "hue", "emotion_words", "notes")
+REVISION_ORDER = ("-created_at", "-id")
+
+
+def is_keyframe_position(position):
+    return position % KEYFRAME_INTERVAL == 0
+
+
+def _diff_text(old, new):
+    new_lines = new.splitlines(keepends=True)
+    old_lines = old.splitlines(keepends=True)
+    ops = []
+    matcher = SequenceMatcher(None, new_lines, old_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(old_lines[j1:j2]))
+    return ops
+
+
+def _patch_text(new, ops):
+    new_lines = new.splitlines(keepends=True)
+    return "".join(
+        op if isinstance(op, str) else "".join(new_lines[op[0]:op[1]]) for op in ops
+    )
+
+
+def make_delta(old, new):
+    delta = {}
+    for name in VERSIONED_FIELDS:
+        if old[name] == new[name]:
+            continue
+        if name == "notes" and old[name] and new[name]:
+            delta[name] = _diff_text(old[name], new[name])
+        else:
+            delta[name] = old[name]
+    return delta
+
+
+def apply_delta(new, delta):
+    old = dict(new)
+    for name, value in delta.items():
+        if name == "notes" and isinstance(value, list):
+            old[name] = _patch_text(new[name] or "", value)
+        else:
+            old[name] = value
+    return old
+
+
+def rebuild_states(latest, rows):
+    state = latest
+    for is_keyframe, delta, stored in rows:
+        state = dict(stored) if is_keyframe else apply_delta(state, delta or {})
+        yield state
+
+
+def _snapshot(obj):
+    return {name: getattr(obj, name) for name in VERSIONED_FIELDS}
+
+
+def _histories(apps):
+    """Yield (entry, [revisions newest first]) for entries with revisions."""
+    Entry = apps.get_model("core", "Entry")
+    EntryRevision = apps.get_model("core", "EntryRevision")
+
+    revisions = EntryRevision.objects.order_by("entry_id", *REVISION_ORDER).iterator(chunk_size=2000)
+    for entry_id, group in groupby(revisions, key=lambda rev: rev.entry_id):
+        yield Entry.objects.get(pk=entry_id), list(group)
+
+
+def snapshots_to_deltas(apps, schema_editor):
+    """Convert full-copy revisions to deltas, keeping every Nth as a keyframe."""
+    EntryRevision = apps.get_model("core", "EntryRevision")
+
+    for entry, revisions in _histories(apps):
+        following = _snapshot(entry)
+        changed = []
+        for position, rev in zip(range(len(revisions), 0, -1), revisions):
+            state = _snapshot(rev)
+            if not is_keyframe_position(position):
+                rev.is_keyframe = False
+                rev.delta = make_delta(state, following)
+                rev.mood, rev.hue, rev.emotion_words, rev.notes = None, "", "", ""
+                changed.append(rev)
+            following = state
+        EntryRevision.objects.bulk_update(
+            changed, ["is_keyframe", "delta", *VERSIONED_FIELDS], batch_size=500
+        )
+
+
+def deltas_to_snapshots(apps, schema_editor):
+    """Rebuild every revision in full (reverse migration)."""
+    EntryRevision = apps.get_model("core", "EntryRevision")
+
+    for entry, revisions in _histories(apps):
+        states = rebuild_states(
+            _snapshot(entry),
+            ((rev.is_keyframe, rev.delta, _snapshot(rev)) for rev in revisions),
+        )
+        for rev, state in zip(revisions, states):
+            for name, value in state.items():
+                setattr(rev, name, value)
+        EntryRevision.objects.bulk_update(revisions, VERSIONED_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_entry_emotion_masks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entryrevision',
+            name='delta',
+            field=models.JSONField(blank=True, help_text='Changes from the following version (non-keyframes only).', null=True),
+        ),
+        migrations.AddField(
+            model_name='entryrevision',
+            name='is_keyframe',
+            field=models.BooleanField(default=True, help_text='Full copy; otherwise rebuilt from delta and the following version.'),
+        ),
+        migrations.RunPython(snapshots_to_deltas, deltas_to_snapshots),
+    ]
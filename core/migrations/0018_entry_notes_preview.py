@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+# Frozen copy of core.models.make_notes_preview as of this migration
+
+NOTES_PREVIEW_LENGTH = 280
+
+
+def make_notes_preview(notes):
+    notes = (notes or "").strip()
+    if len(notes) <= NOTES_PREVIEW_LENGTH:
+        return notes
+    cut = notes[: NOTES_PREVIEW_LENGTH - 1]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "…"
+
+
+def backfill_notes_previews(apps, schema_editor):
+    """Fill notes_preview for existing entries, in batches."""
+    Entry = apps.get_model("core", "Entry")
+
+    batch = []
+    for entry in Entry.objects.exclude(notes="").only("id", "notes").iterator(chunk_size=2000):
+        entry.notes_preview = make_notes_preview(entry.notes)
+        batch.append(entry)
+        if len(batch) >= 500:
+            Entry.objects.bulk_update(batch, ["notes_preview"])
+            batch = []
+    Entry.objects.bulk_update(batch, ["notes_preview"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_revision_deltas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='notes_preview',
+            field=models.CharField(blank=True, editable=False, max_length=280),
+        ),
+        migrations.RunPython(backfill_notes_previews, migrations.RunPython.noop),
+    ]
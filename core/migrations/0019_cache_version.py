@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# Seeded so a bump is always a single UPDATE
+VERSION_NAMES = ["emotion-catalog", "announcements"]
+
+
+def seed_versions(apps, schema_editor):
+    CacheVersion = apps.get_model("core", "CacheVersion")
+    CacheVersion.objects.bulk_create(
+        [CacheVersion(name=name) for name in VERSION_NAMES], ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_entry_notes_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Cache version',
+                'verbose_name_plural': 'Cache versions',
+            },
+        ),
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from django.db.models import Q
+
+from .emotion_masks import is_maskable, mask_filter
 
 
 class EmotionWord(models.Model):
@@ -19,6 +22,43 @@ class EmotionWord(models.Model):
         return self.word
 
 
+# Characters of notes kept in Entry.notes_preview for list views
+NOTES_PREVIEW_LENGTH = 280
+
+
+def make_notes_preview(notes):
+    """First NOTES_PREVIEW_LENGTH characters of notes, cut at a word with "…"."""
+    notes = (notes or "").strip()
+    if len(notes) <= NOTES_PREVIEW_LENGTH:
+        return notes
+    cut = notes[: NOTES_PREVIEW_LENGTH - 1]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "…"
+
+
+class EntryQuerySet(models.QuerySet):
+    def with_emotions(self, word_ids, require_all=False):
+        """
+        Entries tagged with any (or, with require_all, every one) of the
+        given EmotionWord ids, using the tag bitmasks instead of a join.
+        """
+        word_ids = set(word_ids)
+        if not word_ids:
+            return self if require_all else self.none()
+
+        q = mask_filter(word_ids, require_all=require_all)
+
+        # Words beyond the mask range: one through-table subquery each
+        Tag = self.model.emotion_word_tags.through
+        for word_id in word_ids:
+            if not is_maskable(word_id):
+                tagged = Q(pk__in=Tag.objects.filter(emotionword_id=word_id).values("entry_id"))
+                q = (q & tagged) if require_all else (q | tagged)
+
+        return self.filter(q)
+
+
 class Entry(models.Model):
     """Single emotional entry created by a user."""
 
@@ -58,13 +98,47 @@ class Entry(models.Model):
         help_text="Relational emotion word tags linked to this entry.",
     )
 
+    # --------------------------------------------------
+    # The same tags as bits keyed by EmotionWord id (see core/emotion_masks.py)
+    # --------------------------------------------------
+    emotion_mask_0 = models.BigIntegerField(default=0, editable=False)
+    emotion_mask_1 = models.BigIntegerField(default=0, editable=False)
+    emotion_mask_2 = models.BigIntegerField(default=0, editable=False)
+
     notes = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+
+    # Bounded copy of the start of notes, so list views can skip notes entirely
+    notes_preview = models.CharField(max_length=NOTES_PREVIEW_LENGTH, blank=True, editable=False)
+
+    # default (not auto_now_add) so imports can keep original timestamps
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    # Denormalised count of EntryRevision rows (kept in step by edit_entry)
+    revision_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of saved revisions for this entry.",
+    )
+
+    objects = EntryQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Entry"
         verbose_name_plural = "Entries"
+        indexes = [
+            # My Entries / dashboard: a user's entries newest first (keyset on created_at, id)
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="core_entry_user_created_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.notes_preview = make_notes_preview(self.notes)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "notes" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "notes_preview"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return (
@@ -74,7 +148,12 @@ class Entry(models.Model):
 
 
 class EntryRevision(models.Model):
-    """Snapshot of an entry before it was edited."""
+    """
+    An entry as it was before one edit.
+
+    Keyframes hold full values; other revisions keep the value fields blank
+    and store a delta against the following version (see core/revisions.py).
+    """
 
     entry = models.ForeignKey(
         Entry,
@@ -97,17 +176,130 @@ class EntryRevision(models.Model):
     )
 
     notes = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    is_keyframe = models.BooleanField(
+        default=True,
+        help_text="Full copy; otherwise rebuilt from delta and the following version.",
+    )
+    delta = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Changes from the following version (non-keyframes only).",
+    )
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Entry revision"
         verbose_name_plural = "Entry revisions"
+        indexes = [
+            # view_entry: an entry's revisions newest first
+            models.Index(
+                fields=["entry", "-created_at"],
+                name="core_rev_entry_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Revision of Entry {self.entry.id} at {self.created_at:%Y-%m-%d %H:%M}"
 
 
+class UserContentState(models.Model):
+    """
+    Per-user change marker for caching.
+
+    Bumped whenever the user's entries, revisions or subscription change, so
+    anything cached against it (template fragments etc.) is never stale.
+    Also holds the user's entry counter, kept in step by the same bumps.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="content_state",
+    )
+
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    # Denormalised Entry count for free-limit checks (see core/limits.py)
+    entry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "User content state"
+        verbose_name_plural = "User content states"
+
+    def __str__(self):
+        return f"Content v{self.version} for user {self.user_id}"
+
+
+class CacheVersion(models.Model):
+    """
+    Change marker for a named site-wide cache (e.g. the emotion catalog).
+
+    Lives in the database, like UserContentState, so a bump made by any
+    worker on any dyno is seen by all of them (see core/versioning.py).
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Cache version"
+        verbose_name_plural = "Cache versions"
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class DailyMood(models.Model):
+    """
+    Per-user, per-day summary of entries (local date of created_at).
+
+    Kept in step incrementally by core/rollups.py on the entry write paths,
+    so trend views read one row per day instead of every entry. Totals are
+    stored rather than means so increments stay exact.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_moods",
+    )
+    day = models.DateField()
+
+    entry_count = models.PositiveIntegerField(default=0)
+    mood_total = models.PositiveIntegerField(default=0)
+    mood_min = models.PositiveSmallIntegerField()
+    mood_max = models.PositiveSmallIntegerField()
+
+    # Hue is optional on entries, so it has its own count
+    hue_total = models.PositiveIntegerField(default=0)
+    hue_count = models.PositiveIntegerField(default=0)
+
+    last_entry_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-day"]
+        verbose_name = "Daily mood"
+        verbose_name_plural = "Daily moods"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="core_dailymood_user_day_uniq"),
+        ]
+
+    @property
+    def mean_mood(self):
+        return self.mood_total / self.entry_count if self.entry_count else None
+
+    @property
+    def mean_hue(self):
+        return self.hue_total / self.hue_count if self.hue_count else None
+
+    def __str__(self):
+        return f"{self.user_id} – {self.day:%Y-%m-%d} ({self.entry_count} entries)"
+
+
 class SiteAnnouncement(models.Model):
     """
     Short site-wide announcements (e.g. maintenance or updates).
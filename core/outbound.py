@@ -0,0 +1,270 @@
+"""
+One client layer for outbound HTTP (Stripe, the supportive phrase API).
+
+Every upstream gets a keep-alive UpstreamSession (one connection pool per
+process, shared by its threads), and every call through it follows the
+same policy:
+
+- Deadline: the timeout is the smaller of the upstream's own timeout and
+  what is left of the current request's budget (OutboundDeadlineMiddleware
+  sets it from settings.OUTBOUND_REQUEST_BUDGET), so waiting on a slow
+  dependency can't outlive the worker timeout. With no time left the call
+  isn't made (DeadlineExceeded).
+- Circuit breaker: after settings.OUTBOUND_BREAKER_THRESHOLD failures in a
+  row (connection errors, timeouts, 5xx) the upstream is "open" and calls
+  fail fast with UpstreamUnavailable for OUTBOUND_BREAKER_COOLDOWN seconds;
+  then one trial call decides whether it closes again.
+- Concurrency cap: at most Upstream.max_concurrency calls in flight per
+  process; beyond that calls fail fast rather than queue.
+
+Failures raised here subclass requests.RequestException, so existing
+`except requests.RequestException` handlers (and stripe's own error
+mapping, which won't retry them) treat them as ordinary request errors.
+
+Latency and error counts are kept per upstream, per process; staff can
+read them at ops/outbound/.
+
+Async views await blocking clients (the stripe library) with acall(),
+which keeps the event loop free while the call waits.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """Per-dependency policy."""
+
+    name: str
+    timeout: float  # seconds, before the request budget is applied
+    max_concurrency: int  # calls in flight per process (also the pool size)
+
+
+UPSTREAMS = {
+    "stripe": Upstream("stripe", timeout=10, max_concurrency=8),
+    "affirmations": Upstream("affirmations", timeout=3, max_concurrency=2),
+}
+
+# Calls with less time than this left in the budget aren't worth starting
+MIN_CALL_TIMEOUT = 0.5
+
+# Latency samples kept per upstream for the percentiles
+LATENCY_SAMPLES = 200
+
+
+class OutboundError(requests.RequestException):
+    """A call refused by this layer; nothing was sent."""
+
+
+class UpstreamUnavailable(OutboundError):
+    """The upstream's breaker is open or its concurrency cap is reached."""
+
+
+class DeadlineExceeded(OutboundError):
+    """Too little of the request's budget is left for the call."""
+
+
+# ---------- deadlines ----------
+
+_deadline = contextvars.ContextVar("outbound_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Limit outbound calls made inside the block to `seconds` in total.
+    Nested budgets can only shrink the outer one.
+    """
+    end = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        end = min(end, outer)
+    token = _deadline.set(end)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left in the current budget (None outside one)."""
+    end = _deadline.get()
+    return None if end is None else end - time.monotonic()
+
+
+def call_timeout(upstream):
+    left = remaining()
+    if left is None:
+        return upstream.timeout
+    if left < MIN_CALL_TIMEOUT:
+        raise DeadlineExceeded(f"{upstream.name}: request budget spent")
+    return min(upstream.timeout, left)
+
+
+# ---------- breaker and metrics ----------
+
+class UpstreamState:
+    """Breaker state, in-flight slots and metrics for one upstream."""
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(upstream.max_concurrency)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < settings.OUTBOUND_BREAKER_COOLDOWN:
+            return "open"
+        return "half-open"
+
+    def acquire(self):
+        """Claim a slot for one call, or raise UpstreamUnavailable."""
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self.trial_in_flight):
+                self.rejected += 1
+                raise UpstreamUnavailable(f"{self.upstream.name}: circuit open")
+            if not self._slots.acquire(blocking=False):
+                self.rejected += 1
+                raise UpstreamUnavailable(f"{self.upstream.name}: too many calls in flight")
+            if state == "half-open":
+                self.trial_in_flight = True
+
+    def release(self, elapsed, ok):
+        """Record a finished call and update the breaker."""
+        with self._lock:
+            self._slots.release()
+            self.calls += 1
+            self.latencies.append(elapsed)
+            if ok:
+                self.consecutive_failures = 0
+                self.opened_at = None
+            else:
+                self.errors += 1
+                self.consecutive_failures += 1
+                if self.trial_in_flight or (
+                    self.consecutive_failures >= settings.OUTBOUND_BREAKER_THRESHOLD
+                ):
+                    self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def metrics(self):
+        with self._lock:
+            samples = sorted(self.latencies)
+            return {
+                "state": self.state,
+                "calls": self.calls,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "consecutive_failures": self.consecutive_failures,
+                "latency_ms": {
+                    "p50": _percentile(samples, 50),
+                    "p95": _percentile(samples, 95),
+                    "max": _percentile(samples, 100),
+                },
+            }
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return None
+    index = min(len(samples) - 1, round(pct / 100 * (len(samples) - 1)))
+    return round(samples[index] * 1000, 1)
+
+
+_states = {}
+_sessions = {}
+_registry_lock = threading.Lock()
+
+
+def get_state(name):
+    with _registry_lock:
+        if name not in _states:
+            _states[name] = UpstreamState(UPSTREAMS[name])
+        return _states[name]
+
+
+def metrics():
+    """Per-upstream metrics for this process."""
+    return {name: get_state(name).metrics() for name in UPSTREAMS}
+
+
+def reset():
+    """Forget all breaker state, metrics and sessions (tests)."""
+    with _registry_lock:
+        _states.clear()
+        _sessions.clear()
+
+
+# ---------- sessions ----------
+
+class UpstreamSession(requests.Session):
+    """
+    A keep-alive session bound to one upstream; every request goes through
+    its deadline, breaker and concurrency cap. Callers' own timeouts are
+    replaced by the upstream's policy.
+    """
+
+    def __init__(self, upstream):
+        super().__init__()
+        self.upstream = upstream
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=upstream.max_concurrency, max_retries=0
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs["timeout"] = call_timeout(self.upstream)
+        state = get_state(self.upstream.name)
+        state.acquire()
+        ok = False
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+            ok = response.status_code < 500
+            return response
+        finally:
+            state.release(time.perf_counter() - start, ok)
+
+
+def get_session(name):
+    """The process-wide session for an upstream in UPSTREAMS."""
+    with _registry_lock:
+        if name not in _sessions:
+            _sessions[name] = UpstreamSession(UPSTREAMS[name])
+        return _sessions[name]
+
+
+def acall(fn, *args, **kwargs):
+    """
+    Await a blocking outbound call from an async view. It runs on a pool
+    thread (not the request's sync thread), taking the deadline with it.
+    """
+    return sync_to_async(fn, thread_sensitive=False)(*args, **kwargs)
+
+
+def install_stripe_client():
+    """Route every stripe library call through the "stripe" session."""
+    import stripe
+
+    stripe.default_http_client = stripe.RequestsClient(session=get_session("stripe"))
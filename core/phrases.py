@@ -0,0 +1,232 @@
+"""
+Supportive phrases for the dashboard, served from a pre-fetched pool.
+
+The pool is a bounded list of (phrase, author) pairs in the "shared" cache,
+so every worker draws from the same phrases; each request takes one out.
+A daemon thread per worker tops it up from the configured source when it
+runs low. Two file locks (flock in settings.SHARED_LOCK_DIR) keep the
+dyno's processes apart: REFILL_LOCK lets only one worker refill (it is held
+across the network fetch), and POOL_LOCK guards every read-modify-write of
+the pool, so two requests never get the same phrase and a take never
+overwrites a refill. The kernel grants flock atomically and drops it when
+its holder exits, so neither lock can be shared or left stale. Requests
+never wait on the network: at most on another worker's pool read/write,
+and with the pool empty they get one of FALLBACK_PHRASES.
+
+The source is pluggable (settings.SUPPORTIVE_PHRASE_SOURCE, a dotted path
+to a PhraseSource subclass); LocalPhraseSource needs no network and suits
+tests and benchmarks. `manage.py refill_phrases` refills from cron instead
+of (or as well as) the thread.
+"""
+
+import fcntl
+import logging
+import os
+import random
+import threading
+from contextlib import contextmanager
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from .outbound import get_session
+
+
+logger = logging.getLogger(__name__)
+
+POOL_KEY = "phrases:pool"
+
+# Lock file names in settings.SHARED_LOCK_DIR
+REFILL_LOCK = "phrases-refill"
+POOL_LOCK = "phrases-pool"
+
+# Most phrases kept in the pool, and the level below which it is topped up
+POOL_SIZE = 50
+LOW_WATER = 20
+
+# Seconds between the refiller's checks
+REFILL_INTERVAL = 60
+
+FALLBACK_PHRASES = [
+    "You’re allowed to take today slowly.",
+    "Small steps count — even tiny ones.",
+    "You don’t have to earn rest.",
+    "Try naming one feeling without judging it.",
+    "It’s okay to pause. You can come back when you’re ready.",
+    "Your feelings are real — and they can change.",
+    "One kind thing for yourself is enough for now.",
+]
+
+
+# ---------- sources ----------
+
+class PhraseSource:
+    """Where refills come from. fetch() may return fewer than asked for."""
+
+    def fetch(self, count):
+        """Return up to count (phrase, author) pairs."""
+        raise NotImplementedError
+
+
+class AffirmationsDevSource(PhraseSource):
+    """
+    https://www.affirmations.dev/ (one phrase per request), via the
+    "affirmations" outbound session (timeout and breaker in core/outbound.py).
+    """
+
+    url = "https://www.affirmations.dev/"
+
+    def fetch(self, count):
+        phrases = []
+        session = get_session("affirmations")
+        for _ in range(count):
+            try:
+                response = session.get(self.url)
+                response.raise_for_status()
+                phrase = response.json().get("affirmation")
+            except (requests.RequestException, ValueError) as exc:
+                logger.warning("Supportive phrase fetch failed: %s", exc)
+                break
+            if phrase:
+                phrases.append((phrase, "Affirmations.dev"))
+        return phrases
+
+
+class LocalPhraseSource(PhraseSource):
+    """Built-in phrases, no network (tests, benchmarks, offline development)."""
+
+    def fetch(self, count):
+        return [(random.choice(FALLBACK_PHRASES), "") for _ in range(count)]
+
+
+_source = None
+
+
+def get_phrase_source():
+    """Return the (process-wide) configured phrase source."""
+    global _source
+    if _source is None:
+        _source = import_string(
+            getattr(settings, "SUPPORTIVE_PHRASE_SOURCE", "core.phrases.AffirmationsDevSource")
+        )()
+    return _source
+
+
+# ---------- pool ----------
+
+def _pool_cache():
+    return caches["shared"]
+
+
+def pool_size():
+    return len(_pool_cache().get(POOL_KEY) or ())
+
+
+@contextmanager
+def _locked(name, wait=True):
+    """
+    Hold the named dyno-wide lock for the block. Yields True once held; with
+    wait=False, yields False straight away if another holder has it.
+    """
+    os.makedirs(settings.SHARED_LOCK_DIR, exist_ok=True)
+    path = os.path.join(settings.SHARED_LOCK_DIR, f"{name}.lock")
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        # Closing the descriptor releases the lock (ours only: flock is per open file)
+        os.close(fd)
+
+
+def get_phrase():
+    """
+    Return a (phrase, author) pair without any network I/O.
+
+    Takes a phrase out of the pool, or a built-in phrase (empty author) when
+    the pool is empty; either way the refiller is nudged once the pool is low.
+    """
+    shared = _pool_cache()
+    pair = None
+
+    with _locked(POOL_LOCK):
+        pool = shared.get(POOL_KEY) or []
+        if pool:
+            pair = tuple(pool.pop(random.randrange(len(pool))))
+            shared.set(POOL_KEY, pool, timeout=None)
+
+    if len(pool) < LOW_WATER:
+        _wake_refiller()
+
+    return pair or (random.choice(FALLBACK_PHRASES), "")
+
+
+def refill(source=None):
+    """
+    Top the pool up to POOL_SIZE from the source. Returns phrases added.
+
+    Only one worker refills at a time; the others return 0 straight away.
+    The fetch runs outside the pool lock, so requests keep taking phrases.
+    """
+    shared = _pool_cache()
+    with _locked(REFILL_LOCK, wait=False) as held:
+        if not held:
+            return 0
+
+        wanted = POOL_SIZE - pool_size()
+        if wanted <= 0:
+            return 0
+
+        fresh = [tuple(pair) for pair in (source or get_phrase_source()).fetch(wanted)]
+        if not fresh:
+            return 0
+
+        with _locked(POOL_LOCK):
+            # Re-read under the pool lock: requests may have taken phrases during the fetch
+            pool = (shared.get(POOL_KEY) or []) + [list(pair) for pair in fresh]
+            shared.set(POOL_KEY, pool[-POOL_SIZE:], timeout=None)
+        return len(fresh)
+
+
+# ---------- background refiller ----------
+
+_wake = threading.Event()
+_refiller_pid = None
+_refiller_lock = threading.Lock()
+
+
+def _refill_loop():
+    while True:
+        try:
+            if pool_size() < LOW_WATER:
+                refill()
+        except Exception:
+            logger.exception("Supportive phrase refill failed")
+        _wake.wait(REFILL_INTERVAL)
+        _wake.clear()
+
+
+def start_refiller():
+    """
+    Start this process's refiller thread (once per process, so forked
+    gunicorn workers each get their own).
+    """
+    global _refiller_pid
+    if not getattr(settings, "SUPPORTIVE_PHRASE_BACKGROUND_REFILL", True):
+        return
+    with _refiller_lock:
+        if _refiller_pid == os.getpid():
+            return
+        _refiller_pid = os.getpid()
+        threading.Thread(target=_refill_loop, name="phrase-refiller", daemon=True).start()
+
+
+def _wake_refiller():
+    start_refiller()
+    _wake.set()
@@ -0,0 +1,312 @@
+"""
+Entry revisions stored as reverse deltas.
+
+An EntryRevision is the entry as it was before one edit. Rather than a
+full copy, most revisions store only how they differ from the *following*
+version (the next newer revision, or the live entry for the newest one):
+
+    entry  <-  newest revision  <-  ...  <-  oldest revision
+
+Adding a revision therefore never rewrites older rows. Every
+KEYFRAME_INTERVAL-th revision of an entry is stored in full, so rebuilding
+any version walks at most that many deltas. Imported revisions are always
+keyframes.
+
+Delta format (EntryRevision.delta, JSON): only the fields that differ from
+the following version. Short fields hold the old value; "notes" holds a
+list of ops over the following version's lines: [start, end] copies that
+slice, a string is inserted as-is.
+
+Versions are rebuilt on read (view_entry, exports) by RevisionHistory /
+rebuild_states(); nothing is materialised in the database.
+
+prune_entry_revisions() applies the retention policy (settings
+REVISION_KEEP_ALL_DAYS / REVISION_KEEP_DAILY_DAYS) to one entry,
+re-deriving the surviving deltas so the chain stays intact.
+"""
+
+from datetime import timedelta
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Entry, EntryRevision
+
+
+# A full copy every this many revisions of an entry (bounds rebuild cost)
+KEYFRAME_INTERVAL = 10
+
+VERSIONED_FIELDS = ("mood", "hue", "emotion_words", "notes")
+
+# Order revisions are chained in (newest first)
+REVISION_ORDER = ("-created_at", "-id")
+
+
+# ---------- deltas ----------
+
+def snapshot(obj):
+    """The versioned fields of an Entry (or a materialised revision) as a dict."""
+    return {name: getattr(obj, name) for name in VERSIONED_FIELDS}
+
+
+def _diff_text(old, new):
+    """Ops that turn new back into old, line by line."""
+    new_lines = new.splitlines(keepends=True)
+    old_lines = old.splitlines(keepends=True)
+    ops = []
+    matcher = SequenceMatcher(None, new_lines, old_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(old_lines[j1:j2]))
+    return ops
+
+
+def _patch_text(new, ops):
+    new_lines = new.splitlines(keepends=True)
+    return "".join(
+        op if isinstance(op, str) else "".join(new_lines[op[0]:op[1]]) for op in ops
+    )
+
+
+def make_delta(old, new):
+    """Delta that rebuilds the old snapshot from the new one."""
+    delta = {}
+    for name in VERSIONED_FIELDS:
+        if old[name] == new[name]:
+            continue
+        if name == "notes" and old[name] and new[name]:
+            delta[name] = _diff_text(old[name], new[name])
+        else:
+            # Small fields (and notes added/cleared outright) store the value
+            delta[name] = old[name]
+    return delta
+
+
+def apply_delta(new, delta):
+    """Rebuild an older snapshot from the following one and its delta."""
+    old = dict(new)
+    for name, value in delta.items():
+        if name == "notes" and isinstance(value, list):
+            old[name] = _patch_text(new[name] or "", value)
+        else:
+            old[name] = value
+    return old
+
+
+# ---------- writing ----------
+
+def is_keyframe_position(position):
+    """Whether an entry's position-th revision (1-based) is stored in full."""
+    return position % KEYFRAME_INTERVAL == 0
+
+
+def build_revision(entry, before, after, position):
+    """
+    Unsaved EntryRevision recording `before` (the entry prior to an edit),
+    as a delta against `after` unless this position is a keyframe.
+    """
+    if is_keyframe_position(position):
+        return EntryRevision(entry=entry, is_keyframe=True, **before)
+    return EntryRevision(
+        entry=entry,
+        is_keyframe=False,
+        delta=make_delta(before, after),
+        mood=None,
+        hue="",
+        emotion_words="",
+        notes="",
+    )
+
+
+# ---------- reading ----------
+
+def rebuild_states(latest, rows):
+    """
+    Yield each revision's full snapshot, newest first.
+
+    latest is the snapshot of the version following the first row (the live
+    entry for a complete history); rows are (is_keyframe, delta, stored
+    snapshot) tuples in REVISION_ORDER.
+    """
+    state = latest
+    for is_keyframe, delta, stored in rows:
+        state = dict(stored) if is_keyframe else apply_delta(state, delta or {})
+        yield state
+
+
+class RevisionHistory:
+    """
+    A page of an entry's revisions, newest first, rebuilt lazily while
+    iterated.
+
+    Fields of each EntryRevision are filled in as the template walks the
+    page, so nothing is reconstructed unless the history is displayed. A
+    page further back also loads the (at most KEYFRAME_INTERVAL) newer rows
+    needed to reach a keyframe, in the same query.
+    """
+
+    def __init__(self, entry, offset=0, limit=None):
+        self.entry = entry
+        self.offset = offset
+        self.limit = limit
+        self._page = None
+
+    def _fetch(self):
+        if self._page is None:
+            revisions = self.entry.revisions.order_by(*REVISION_ORDER)
+            end = None if self.limit is None else self.offset + self.limit
+            start = max(0, self.offset - KEYFRAME_INTERVAL)
+
+            rows = list(revisions[start:end])
+            prefix = rows[: self.offset - start]
+            keyframes = [i for i, rev in enumerate(prefix) if rev.is_keyframe]
+            if keyframes:
+                # Rebuild from the keyframe nearest the page
+                prefix = prefix[keyframes[-1]:]
+            elif start:
+                # No keyframe in reach (positions out of step): walk from the entry
+                prefix = list(revisions[:self.offset])
+
+            self._prefix = prefix
+            self._page = rows[self.offset - start:]
+        return self._page
+
+    def __bool__(self):
+        return bool(self._fetch())
+
+    def __len__(self):
+        return len(self._fetch())
+
+    def __iter__(self):
+        page = self._fetch()
+        rows = self._prefix + page
+        states = rebuild_states(
+            snapshot(self.entry),
+            ((rev.is_keyframe, rev.delta, snapshot(rev)) for rev in rows),
+        )
+        for index, (rev, state) in enumerate(zip(rows, states)):
+            if index < len(self._prefix):
+                continue
+            if not rev.is_keyframe:
+                for name, value in state.items():
+                    setattr(rev, name, value)
+            yield rev
+
+
+def rebuild_revision(entry, revision):
+    """Fill in one revision's fields (finds its place in the chain first)."""
+    if revision.is_keyframe:
+        return revision
+    newer = entry.revisions.filter(
+        Q(created_at__gt=revision.created_at)
+        | Q(created_at=revision.created_at, pk__gt=revision.pk)
+    ).count()
+    return next(iter(RevisionHistory(entry, offset=newer, limit=1)))
+
+
+# ---------- side-by-side diffs ----------
+
+def side_by_side(old, new):
+    """
+    Pair up the lines of two texts for a two-column diff.
+
+    Returns [(tag, old_line, new_line)] where tag is "equal", "changed",
+    "removed" or "added"; the missing side of an add/remove is None.
+    """
+    old_lines = (old or "").splitlines()
+    new_lines = (new or "").splitlines()
+    rows = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            rows.extend(("equal", line, line) for line in old_lines[i1:i2])
+            continue
+        left, right = old_lines[i1:i2], new_lines[j1:j2]
+        for k in range(max(len(left), len(right))):
+            a = left[k] if k < len(left) else None
+            b = right[k] if k < len(right) else None
+            if a is None:
+                kind = "added"
+            elif b is None:
+                kind = "removed"
+            else:
+                kind = "changed"
+            rows.append((kind, a, b))
+    return rows
+
+
+# ---------- retention ----------
+
+def retained_indexes(created_ats, now, keep_all_days=None, daily_days=None):
+    """
+    Indexes of the revisions to keep, given their created_at newest first.
+
+    Everything younger than keep_all_days is kept; older revisions keep the
+    newest one per local day until daily_days, then the newest per month.
+    """
+    if keep_all_days is None:
+        keep_all_days = settings.REVISION_KEEP_ALL_DAYS
+    if daily_days is None:
+        daily_days = settings.REVISION_KEEP_DAILY_DAYS
+
+    keep_all = now - timedelta(days=keep_all_days)
+    daily = now - timedelta(days=daily_days)
+
+    seen = set()
+    keep = []
+    for index, created_at in enumerate(created_ats):
+        if created_at >= keep_all:
+            keep.append(index)
+            continue
+        day = timezone.localdate(created_at)
+        bucket = day if created_at >= daily else (day.year, day.month)
+        if bucket not in seen:
+            seen.add(bucket)
+            keep.append(index)
+    return keep
+
+
+def prune_entry_revisions(entry_id, now=None, dry_run=False):
+    """
+    Drop one entry's revisions that fall outside the retention policy.
+
+    The survivors are rebuilt, then re-stored as deltas against the next
+    survivor (keyframe positions are renumbered too), all in one short
+    transaction holding the entry row. Returns the number deleted.
+    """
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        entry = Entry.objects.select_for_update().filter(pk=entry_id).first()
+        if entry is None:
+            return 0
+
+        history = RevisionHistory(entry)
+        revisions = list(history)
+        keep = retained_indexes([rev.created_at for rev in revisions], now)
+        dropped = len(revisions) - len(keep)
+        if not dropped or dry_run:
+            return dropped
+
+        kept = [revisions[i] for i in keep]
+        following = snapshot(entry)
+        for position, rev in zip(range(len(kept), 0, -1), kept):
+            state = snapshot(rev)
+            rebuilt = build_revision(entry, state, following, position)
+            rev.is_keyframe = rebuilt.is_keyframe
+            rev.delta = rebuilt.delta
+            for name in VERSIONED_FIELDS:
+                setattr(rev, name, getattr(rebuilt, name))
+            following = state
+
+        kept_ids = {rev.pk for rev in kept}
+        EntryRevision.objects.filter(pk__in=[r.pk for r in revisions if r.pk not in kept_ids]).delete()
+        EntryRevision.objects.bulk_update(kept, ["is_keyframe", "delta", *VERSIONED_FIELDS])
+        Entry.objects.filter(pk=entry_id).update(revision_count=len(kept))
+
+    return dropped
@@ -0,0 +1,173 @@
+"""
+Incremental upkeep of the DailyMood rollup table.
+
+- record_entry(): new entry -> one UPDATE (or INSERT for a new day)
+- refresh_day() / refresh_days(): re-aggregate specific days after edits,
+  deletes and imports (touches only those days' entries)
+- rebuild(): recompute everything from Entry (see rebuild_mood_rollups)
+
+Days are the local date of Entry.created_at in the current time zone.
+"""
+
+from datetime import datetime, time, timedelta
+from itertools import batched
+
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, TruncDate
+from django.utils import timezone
+
+from .models import DailyMood, Entry
+
+
+# Hue is a CharField; only cast values that are plain numbers
+_HUE_PATTERN = r"^[0-9]{1,3}$"
+
+# Runs of consecutive days re-aggregated per query in refresh_days()
+REFRESH_RUNS_PER_QUERY = 100
+
+
+def _hue_value(hue):
+    """Return an entry's hue as an int, or None if it has none."""
+    hue = str(hue or "").strip()
+    return int(hue) if hue.isdigit() and len(hue) <= 3 else None
+
+
+def entry_day(entry):
+    """The rollup day an entry belongs to."""
+    return timezone.localdate(entry.created_at)
+
+
+def day_aggregates(entries):
+    """
+    Group an Entry queryset into DailyMood field values, one dict per
+    (user, day).
+    """
+    hue = Case(
+        When(hue__regex=_HUE_PATTERN, then=Cast("hue", IntegerField())),
+        default=None,
+        output_field=IntegerField(),
+    )
+    return (
+        entries.annotate(day=TruncDate("created_at"))
+        .order_by()
+        .values("user_id", "day")
+        .annotate(
+            entry_count=Count("id"),
+            mood_total=Sum("mood"),
+            mood_min=Min("mood"),
+            mood_max=Max("mood"),
+            hue_total=Coalesce(Sum(hue), 0),
+            hue_count=Count(hue),
+            last_entry_at=Max("created_at"),
+        )
+    )
+
+
+def record_entry(entry):
+    """Fold a newly created entry into its day's rollup."""
+    hue = _hue_value(entry.hue)
+
+    updated = DailyMood.objects.filter(user_id=entry.user_id, day=entry_day(entry)).update(
+        entry_count=F("entry_count") + 1,
+        mood_total=F("mood_total") + entry.mood,
+        mood_min=Least("mood_min", Value(entry.mood)),
+        mood_max=Greatest("mood_max", Value(entry.mood)),
+        hue_total=F("hue_total") + (hue or 0),
+        hue_count=F("hue_count") + (0 if hue is None else 1),
+        last_entry_at=Greatest("last_entry_at", Value(entry.created_at)),
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            DailyMood.objects.create(
+                user_id=entry.user_id,
+                day=entry_day(entry),
+                entry_count=1,
+                mood_total=entry.mood,
+                mood_min=entry.mood,
+                mood_max=entry.mood,
+                hue_total=hue or 0,
+                hue_count=0 if hue is None else 1,
+                last_entry_at=entry.created_at,
+            )
+    except IntegrityError:
+        # Another request created the day's row first; add to it instead
+        record_entry(entry)
+
+
+def _day_runs(days):
+    """Split a set of dates into sorted (first, last) runs of consecutive days."""
+    runs = []
+    for day in sorted(days):
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def _run_filters(runs):
+    """Q objects selecting (Entry rows, DailyMood rows) on the given runs."""
+    tz = timezone.get_current_timezone()
+    entries = Q()
+    rollups = Q()
+    for first_day, last_day in runs:
+        start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+        end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+        entries |= Q(created_at__gte=start, created_at__lt=end)
+        rollups |= Q(day__gte=first_day, day__lte=last_day)
+    return entries, rollups
+
+
+def refresh_days(user_id, days):
+    """
+    Recompute a user's rollups for exactly the given days.
+
+    Days in between are left alone: an import touching two far-apart days
+    re-aggregates those two, not everything from the first to the last.
+    """
+    with transaction.atomic():
+        for runs in batched(_day_runs(days), REFRESH_RUNS_PER_QUERY):
+            entries, rollups = _run_filters(runs)
+            rows = [
+                DailyMood(**values)
+                for values in day_aggregates(Entry.objects.filter(entries, user_id=user_id))
+            ]
+            DailyMood.objects.filter(rollups, user_id=user_id).delete()
+            DailyMood.objects.bulk_create(rows)
+
+
+def refresh_day(user_id, day):
+    """Recompute one day (after an entry on it was edited or deleted)."""
+    refresh_days(user_id, [day])
+
+
+def rebuild(user_ids=None):
+    """Recompute rollups from scratch for the given users (default: all)."""
+    entries = Entry.objects.all()
+    rollups = DailyMood.objects.all()
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        rollups.delete()
+        rows = DailyMood.objects.bulk_create(
+            (DailyMood(**values) for values in day_aggregates(entries)),
+            batch_size=1000,
+        )
+    return len(rows)
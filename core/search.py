@@ -0,0 +1,241 @@
+"""
+Full-text search over entry notes and emotion words.
+
+The backend is chosen from the database vendor (or settings.ENTRY_SEARCH_BACKEND):
+- PostgreSQL: generated tsvector column + GIN index on core_entry
+- SQLite: FTS5 shadow table (core_entry_fts) keyed by entry id
+- anything else: plain icontains matching (no index, no ranking)
+
+Keyword searches on My Entries list search() results: best match first, each
+with a highlighted snippet. Indexes are created in
+core/migrations/0010_entry_search_index.py and kept in step on entry
+save/delete by core/signals.py.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+
+# Private-use characters wrapped around matches by the database.
+# Snippets are HTML-escaped first, then these become <mark> tags.
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_END = "\ue001"
+
+# Ignore runaway queries (each term is one index lookup)
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One ranked search result."""
+
+    entry_id: int
+    rank: float
+    snippet: str
+
+
+def search_terms(query):
+    """Split a user query into lower-case word terms."""
+    return _TERM_RE.findall((query or "").lower())[:MAX_TERMS]
+
+
+def highlight(text):
+    """Escape a database snippet and turn match markers into <mark> tags."""
+    escaped = escape(text or "")
+    escaped = escaped.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_END, "</mark>")
+    return mark_safe(escaped)
+
+
+def _scope(entries):
+    """SQL and params selecting the ids of an Entry queryset (a search's scope)."""
+    return entries.order_by().values("pk").query.sql_with_params()
+
+
+class SimpleSearchBackend:
+    """Substring matching with no index; used when no full-text engine exists."""
+
+    def filter(self, queryset, query):
+        """Restrict an Entry queryset to entries matching the query."""
+        return queryset.filter(Q(notes__icontains=query) | Q(emotion_words__icontains=query))
+
+    def search(self, entries, query, limit=20, offset=0):
+        """
+        Return SearchHits for matches within an Entry queryset, best first
+        (newest first on equal rank), skipping `offset` and at most `limit`.
+        """
+        matches = self.filter(entries, query).order_by("-created_at", "-id")
+        return [
+            SearchHit(entry_id=e.id, rank=0.0, snippet=highlight((e.notes or e.emotion_words)[:160]))
+            for e in matches[offset:offset + limit]
+        ]
+
+    def index_entry(self, entry):
+        """Add or refresh one entry in the index."""
+
+    def index_entries(self, entries):
+        """Add or refresh several entries (used after bulk inserts)."""
+        for entry in entries:
+            self.index_entry(entry)
+
+    def remove_entry(self, entry_id):
+        """Drop one entry from the index."""
+
+
+class SqliteFtsSearchBackend(SimpleSearchBackend):
+    """SQLite FTS5 shadow table with bm25 ranking and snippet()."""
+
+    table = "core_entry_fts"
+
+    def _match(self, query):
+        # Quote each term (no FTS syntax injection) and allow prefix matches
+        terms = search_terms(query)
+        return " ".join('"%s"*' % term.replace('"', '""') for term in terms)
+
+    def filter(self, queryset, query):
+        match = self._match(query)
+        if not match:
+            return super().filter(queryset, query)
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", (match,))
+        )
+
+    def search(self, entries, query, limit=20, offset=0):
+        match = self._match(query)
+        if not match:
+            return super().search(entries, query, limit, offset)
+
+        scope_sql, scope_params = _scope(entries)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT rowid,
+                       bm25({self.table}, 1.0, 2.0) AS rank,
+                       snippet({self.table}, -1, %s, %s, '…', 16)
+                FROM {self.table}
+                WHERE {self.table} MATCH %s AND rowid IN ({scope_sql})
+                ORDER BY rank, rowid DESC
+                LIMIT %s OFFSET %s
+                """,
+                [HIGHLIGHT_START, HIGHLIGHT_END, match, *scope_params, limit, offset],
+            )
+            # bm25() is "lower is better"; flip it so callers can sort descending
+            return [SearchHit(row[0], -row[1], highlight(row[2])) for row in cursor.fetchall()]
+
+    def index_entry(self, entry):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [entry.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, notes, emotion_words) VALUES (%s, %s, %s)",
+                [entry.pk, entry.notes or "", entry.emotion_words or ""],
+            )
+
+    def index_entries(self, entries):
+        rows = [(e.pk, e.notes or "", e.emotion_words or "") for e in entries]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(r[0],) for r in rows])
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, notes, emotion_words) VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove_entry(self, entry_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [entry_id])
+
+
+class PostgresSearchBackend(SimpleSearchBackend):
+    """
+    Generated tsvector column (core_entry.search_vector) with a GIN index.
+
+    The column is computed by PostgreSQL itself, so saves and deletes keep the
+    index current without any work here.
+    """
+
+    config = "english"
+
+    def _tsquery(self, query):
+        # Word terms only, AND-ed, each allowed to prefix-match
+        return " & ".join(f"{term}:*" for term in search_terms(query))
+
+    def filter(self, queryset, query):
+        tsquery = self._tsquery(query)
+        if not tsquery:
+            return super().filter(queryset, query)
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT id FROM core_entry WHERE search_vector @@ to_tsquery(%s, %s)",
+                (self.config, tsquery),
+            )
+        )
+
+    def _headline_options(self):
+        return f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=24, MinWords=8"
+
+    def search(self, entries, query, limit=20, offset=0):
+        tsquery = self._tsquery(query)
+        if not tsquery:
+            return super().search(entries, query, limit, offset)
+
+        scope_sql, scope_params = _scope(entries)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT e.id,
+                       ts_rank(e.search_vector, q) AS rank,
+                       ts_headline(%s, e.emotion_words || ' ' || e.notes, q, %s)
+                FROM core_entry AS e, to_tsquery(%s, %s) AS q
+                WHERE e.search_vector @@ q AND e.id IN ({scope_sql})
+                ORDER BY rank DESC, e.id DESC
+                LIMIT %s OFFSET %s
+                """,
+                [
+                    self.config, self._headline_options(), self.config, tsquery,
+                    *scope_params, limit, offset,
+                ],
+            )
+            return [SearchHit(row[0], row[1], highlight(row[2])) for row in cursor.fetchall()]
+
+
+_backend = None
+
+
+def _sqlite_fts_available():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = %s",
+            [SqliteFtsSearchBackend.table],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_search_backend():
+    """Return the (process-wide) search backend for the default database."""
+    global _backend
+
+    if _backend is None:
+        backend_path = getattr(settings, "ENTRY_SEARCH_BACKEND", "")
+        if backend_path:
+            _backend = import_string(backend_path)()
+        elif connection.vendor == "postgresql":
+            _backend = PostgresSearchBackend()
+        elif connection.vendor == "sqlite":
+            if not _sqlite_fts_available():
+                # Not migrated yet: fall back for now, but look again next time
+                return SimpleSearchBackend()
+            _backend = SqliteFtsSearchBackend()
+        else:
+            _backend = SimpleSearchBackend()
+
+    return _backend
@@ -0,0 +1,86 @@
+# core/signals.py
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from billing.models import Subscription
+from .emotions import drop_word_from_masks, refresh_emotion_masks
+from .models import EmotionWord, Entry, EntryRevision, SiteAnnouncement
+from .search import get_search_backend
+from .versioning import bump_cache_version, bump_content_version
+
+
+@receiver(post_save, sender=Entry)
+def index_entry_for_search(sender, instance, **kwargs):
+    """Keep the full-text search index in step with saved entries."""
+    get_search_backend().index_entry(instance)
+
+
+@receiver(post_delete, sender=Entry)
+def remove_entry_from_search(sender, instance, **kwargs):
+    """Drop deleted entries from the full-text search index."""
+    get_search_backend().remove_entry(instance.pk)
+
+
+@receiver(post_save, sender=Entry)
+def bump_version_for_saved_entry(sender, instance, created, **kwargs):
+    """Invalidate cached fragments; count new entries."""
+    bump_content_version(instance.user_id, entry_delta=1 if created else 0)
+
+
+@receiver(post_delete, sender=Entry)
+def bump_version_for_deleted_entry(sender, instance, **kwargs):
+    """Invalidate cached fragments; uncount the entry."""
+    bump_content_version(instance.user_id, entry_delta=-1, create=False)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def bump_owner_content_version(sender, instance, signal, **kwargs):
+    """Invalidate the owner's cached fragments when their plan changes."""
+    bump_content_version(instance.user_id, create=signal is post_save)
+
+
+@receiver(post_save, sender=EntryRevision)
+def bump_revision_owner_content_version(sender, instance, **kwargs):
+    """
+    Revisions belong to the user through their entry.
+
+    No post_delete handler on purpose: connecting one stops Django
+    fast-deleting revisions when an entry is deleted (the entry's own
+    post_delete already bumps the version).
+    """
+    bump_content_version(instance.entry.user_id)
+
+
+@receiver(post_save, sender=EmotionWord)
+@receiver(post_delete, sender=EmotionWord)
+def bump_emotion_catalog_version(sender, instance, **kwargs):
+    """Invalidate cached emotion word grids across all workers."""
+    bump_cache_version("emotion-catalog")
+
+
+@receiver(post_save, sender=SiteAnnouncement)
+@receiver(post_delete, sender=SiteAnnouncement)
+def bump_announcements_version(sender, instance, **kwargs):
+    """Invalidate every worker's live announcement list (core/announcements.py)."""
+    bump_cache_version("announcements")
+
+
+@receiver(post_delete, sender=EmotionWord)
+def drop_deleted_word_from_masks(sender, instance, **kwargs):
+    drop_word_from_masks(instance.pk)
+
+
+@receiver(m2m_changed, sender=Entry.emotion_word_tags.through)
+def sync_entry_emotion_masks(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Entry tag bitmasks in step with tag changes made through the M2M manager."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        refresh_emotion_masks([instance.pk])
+    elif action == "post_clear":
+        # word.entries.clear()
+        drop_word_from_masks(instance.pk)
+    elif pk_set:
+        # word.entries.add(...) / .remove(...)
+        refresh_emotion_masks(list(pk_set))
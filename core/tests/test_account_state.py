@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from billing.models import Subscription
+from core.limits import FREE_ENTRY_LIMIT, AccountState
+from core.models import Entry
+
+
+User = get_user_model()
+
+
+class TestAccountState(TestCase):
+    """Subscription + entry count are loaded once per request."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="stateful", password=self.password)
+        self.client.login(username="stateful", password=self.password)
+        Entry.objects.create(user=self.user, mood=3)
+
+    def _count(self, queries, table_sql):
+        return sum(table_sql in q["sql"] for q in queries)
+
+    def test_pages_query_subscription_and_count_once(self):
+        for name in ["dashboard", "my_entries", "new_entry", "regulate_plus", "profile"]:
+            with self.subTest(page=name):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(reverse(name))
+
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    self._count(ctx.captured_queries, 'FROM "billing_subscription"'), 1
+                )
+                self.assertLessEqual(self._count(ctx.captured_queries, "COUNT(*)"), 1)
+
+    def test_refresh_reloads_values(self):
+        state = AccountState(self.user)
+        self.assertEqual(state.entry_count, 1)
+        self.assertEqual(state.entries_left, FREE_ENTRY_LIMIT - 1)
+
+        Entry.objects.create(user=self.user, mood=3)
+        Subscription.objects.create(user=self.user, status="active")
+        self.assertEqual(state.entry_count, 1)
+
+        state.refresh()
+        self.assertEqual(state.entry_count, 2)
+        self.assertTrue(state.has_paid_access)
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import announcements, versioning
+from core.announcements import get_live_announcements
+from core.models import CacheVersion, SiteAnnouncement
+
+
+User = get_user_model()
+
+
+class TestLiveAnnouncements(TestCase):
+    """Window filtering in SQL and the per-worker announcement cache."""
+
+    def setUp(self):
+        announcements._live = None
+        versioning._read_versions.clear()
+        self.now = timezone.now()
+
+    def test_window_is_applied_in_the_query(self):
+        live = SiteAnnouncement.objects.create(title="Live", message="m")
+        SiteAnnouncement.objects.create(title="Inactive", message="m", is_active=False)
+        SiteAnnouncement.objects.create(
+            title="Future", message="m", starts_at=self.now + timedelta(hours=1)
+        )
+        SiteAnnouncement.objects.create(
+            title="Ended", message="m", ends_at=self.now - timedelta(hours=1)
+        )
+
+        self.assertEqual([a.pk for a in get_live_announcements()], [live.pk])
+
+    def test_cached_until_save_or_delete(self):
+        first = SiteAnnouncement.objects.create(title="First", message="m")
+        get_live_announcements()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(get_live_announcements()), 1)
+
+        second = SiteAnnouncement.objects.create(title="Second", message="m")
+        self.assertEqual({a.pk for a in get_live_announcements()}, {first.pk, second.pk})
+
+        first.delete()
+        self.assertEqual([a.pk for a in get_live_announcements()], [second.pk])
+
+    def test_sees_another_dynos_bump_after_the_ttl(self):
+        SiteAnnouncement.objects.create(title="First", message="m")
+        get_live_announcements()
+
+        # Written by another dyno: only the database row moves
+        with mock.patch("core.signals.bump_cache_version"):
+            second = SiteAnnouncement.objects.create(title="Second", message="m")
+        CacheVersion.objects.filter(name="announcements").update(
+            version=F("version") + 1, changed_at=timezone.now()
+        )
+        self.assertEqual(len(get_live_announcements()), 1)
+
+        with override_settings(CACHE_VERSION_TTL=0):
+            self.assertEqual(get_live_announcements()[0].pk, second.pk)
+
+    def test_rebuilt_at_the_next_schedule_boundary(self):
+        starts_at = self.now + timedelta(minutes=5)
+        scheduled = SiteAnnouncement.objects.create(title="Soon", message="m", starts_at=starts_at)
+        self.assertEqual(get_live_announcements(), ())
+
+        with mock.patch("django.utils.timezone.now", return_value=starts_at):
+            self.assertEqual([a.pk for a in get_live_announcements()], [scheduled.pk])
+
+    def test_dashboard_makes_no_announcement_queries_when_warm(self):
+        User.objects.create_user(username="reader", password="pass12345!")
+        self.client.login(username="reader", password="pass12345!")
+        SiteAnnouncement.objects.create(title="Hello", message="m")
+
+        self.client.get(reverse("dashboard"))
+        with mock.patch.object(
+            announcements, "live_announcements_query", side_effect=AssertionError
+        ):
+            response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(len(response.context["announcements"]), 1)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from billing.models import Subscription
+from core.models import Entry, SiteAnnouncement
+
+
+User = get_user_model()
+
+
+class TestConditionalGets(TestCase):
+    """ETag / Last-Modified 304s on My Entries, entry detail and the dashboard."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="revisit", password=self.password)
+        self.client.login(username="revisit", password=self.password)
+        self.entry = Entry.objects.create(user=self.user, mood=3, hue="50", notes="hello")
+
+    def _revisit(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("private", first["Cache-Control"])
+        return first
+
+    def test_unchanged_pages_answer_304_with_a_few_small_queries(self):
+        for url in (
+            reverse("my_entries"),
+            reverse("view_entry", args=[self.entry.pk]),
+            reverse("dashboard"),
+        ):
+            first = self._revisit(url)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(response.status_code, 304, url)
+            # Session, user and the watermark + plan; no list/history/insights queries
+            self.assertLessEqual(len(queries), 3, url)
+
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_entry_write_changes_the_etag(self):
+        first = self._revisit(reverse("my_entries"))
+
+        Entry.objects.create(user=self.user, mood=4, hue="60", notes="another")
+
+        response = self.client.get(reverse("my_entries"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_lapsed_paid_access_changes_the_validators_without_a_write(self):
+        now = timezone.now()
+        Subscription.objects.create(
+            user=self.user, status="canceled", current_period_end=now + timedelta(minutes=1)
+        )
+        first = self._revisit(reverse("my_entries"))
+
+        # Paid period over; expire_entitlements hasn't run, nothing was saved
+        with mock.patch("django.utils.timezone.now", return_value=now + timedelta(minutes=2)):
+            by_etag = self.client.get(reverse("my_entries"), HTTP_IF_NONE_MATCH=first["ETag"])
+            by_date = self.client.get(
+                reverse("my_entries"), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+            )
+
+        self.assertEqual(by_etag.status_code, 200)
+        self.assertNotEqual(by_etag["ETag"], first["ETag"])
+        self.assertEqual(by_date.status_code, 200)
+
+    def test_new_announcement_changes_the_dashboard_etag(self):
+        first = self._revisit(reverse("dashboard"))
+
+        SiteAnnouncement.objects.create(title="Maintenance", message="Tonight")
+
+        response = self.client.get(reverse("dashboard"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Maintenance")
+
+    def test_pending_messages_skip_the_etag(self):
+        Subscription.objects.create(user=self.user, status="trialing")
+        first = self._revisit(reverse("my_entries"))
+
+        # Queues "You already have an active plan." without any write
+        self.client.get(reverse("start_trial"))
+
+        response = self.client.get(reverse("my_entries"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertContains(response, "You already have an active plan.")
+
+        response = self.client.get(reverse("my_entries"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
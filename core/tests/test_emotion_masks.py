@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.emotion_masks import MASK_CAPACITY, word_masks
+from core.insights import load_history
+from core.models import EmotionWord, Entry
+
+
+User = get_user_model()
+
+
+class TestEmotionMasks(TestCase):
+    """Entry tag bitmasks and the any/all emotion filters."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="masked", password=self.password)
+        self.client.login(username="masked", password=self.password)
+        self.calm = EmotionWord.objects.create(word="Calm")
+        self.tired = EmotionWord.objects.create(word="Tired")
+        # Bit 63 of the first column (stored as the BIGINT sign bit)
+        self.edge = EmotionWord.objects.create(pk=64, word="Edge")
+        # Beyond the mask range: handled through the join table
+        self.far = EmotionWord.objects.create(pk=MASK_CAPACITY + 5, word="Far")
+
+    def _post(self, words):
+        self.client.post(reverse("new_entry"), {"hue": "50", "notes": "n", "emotion_words": words})
+        return Entry.objects.filter(user=self.user).latest("id")
+
+    def test_masks_written_on_save_and_edit(self):
+        entry = self._post(["Calm", "Edge"])
+        self.assertEqual(
+            (entry.emotion_mask_0, entry.emotion_mask_1, entry.emotion_mask_2),
+            word_masks([self.calm.pk, self.edge.pk]),
+        )
+        self.assertLess(entry.emotion_mask_0, 0)
+
+        self.client.post(
+            reverse("edit_entry", args=[entry.id]),
+            {"hue": "50", "notes": "n", "emotion_words": ["Tired"]},
+        )
+        entry.refresh_from_db()
+        self.assertEqual(entry.emotion_mask_0, word_masks([self.tired.pk])[0])
+
+    def test_any_and_all_filters(self):
+        both = self._post(["Calm", "Tired"])
+        calm = self._post(["Calm", "Far"])
+        self._post(["Edge"])
+
+        entries = Entry.objects.filter(user=self.user)
+        ids = lambda qs: set(qs.values_list("id", flat=True))  # noqa: E731
+
+        self.assertEqual(ids(entries.with_emotions([self.tired.pk])), {both.id})
+        self.assertEqual(
+            ids(entries.with_emotions([self.calm.pk, self.tired.pk], require_all=True)),
+            {both.id},
+        )
+        self.assertEqual(ids(entries.with_emotions([self.tired.pk, self.far.pk])), {both.id, calm.id})
+        self.assertEqual(
+            ids(entries.with_emotions([self.calm.pk, self.far.pk], require_all=True)), {calm.id}
+        )
+        self.assertEqual(len(entries.with_emotions([self.edge.pk])), 1)
+
+    def test_m2m_changes_and_word_deletes_keep_masks_in_step(self):
+        entry = Entry.objects.create(user=self.user, mood=3, hue="50")
+        entry.emotion_word_tags.add(self.calm, self.edge, self.far)
+        self.assertEqual(Entry.objects.with_emotions([self.edge.pk]).count(), 1)
+
+        history = load_history(self.user)
+        self.assertEqual(sorted(history.tag_word), sorted([self.calm.pk, self.edge.pk, self.far.pk]))
+
+        self.edge.delete()
+        entry.refresh_from_db()
+        self.assertEqual(entry.emotion_mask_0, word_masks([self.calm.pk])[0])
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.emotions import (
+    get_emotion_catalog,
+    resolve_emotion_words,
+    set_entry_tags,
+    warm_emotion_catalog,
+)
+from core.models import EmotionWord, Entry
+
+
+User = get_user_model()
+
+
+class TestEmotionTagging(TestCase):
+    """Bulk word resolution and tag writes on the entry save path."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="tagger", password=self.password)
+        self.client.login(username="tagger", password=self.password)
+        self.words = [f"word{i}" for i in range(10)]
+        EmotionWord.objects.bulk_create([EmotionWord(word=w) for w in self.words])
+
+    def _tag(self, entry, words, created=False):
+        set_entry_tags(entry, resolve_emotion_words(words).values(), created=created)
+
+    def test_query_count_does_not_grow_with_words(self):
+        entry = Entry.objects.create(user=self.user, mood=3, hue="50")
+
+        # Known words: one lookup; new entry: one insert
+        with self.assertNumQueries(2):
+            self._tag(entry, self.words, created=True)
+
+        # Missing words: lookup, bulk insert, read back, catalog version bump;
+        # then read, delete, insert
+        with self.assertNumQueries(7):
+            self._tag(entry, self.words[:5] + ["fresh1", "fresh2"])
+
+        self.assertEqual(
+            set(entry.emotion_word_tags.values_list("word", flat=True)),
+            set(self.words[:5]) | {"fresh1", "fresh2"},
+        )
+
+    def test_resolve_creates_missing_words_once(self):
+        ids = resolve_emotion_words(["word1", "brand-new", "brand-new", ""])
+        self.assertEqual(set(ids), {"word1", "brand-new"})
+        self.assertEqual(EmotionWord.objects.filter(word="brand-new").count(), 1)
+
+    def test_resolve_matches_case_insensitively(self):
+        # Same rule as the importer (core/imports.py): one word, any case
+        ids = resolve_emotion_words(["WORD1", "Brand-New", "brand-new"])
+
+        self.assertEqual(ids["WORD1"], EmotionWord.objects.get(word="word1").pk)
+        self.assertEqual(ids["Brand-New"], ids["brand-new"])
+        self.assertEqual(EmotionWord.objects.filter(word__iexact="brand-new").count(), 1)
+
+    def test_edit_view_replaces_tags(self):
+        self.client.post(
+            reverse("new_entry"),
+            {"hue": "50", "notes": "n", "emotion_words": ["word1", "word2"]},
+        )
+        entry = Entry.objects.get(user=self.user)
+
+        self.client.post(
+            reverse("edit_entry", args=[entry.id]),
+            {"hue": "50", "notes": "n", "emotion_words": ["word2", "word3"]},
+        )
+        self.assertEqual(
+            sorted(entry.emotion_word_tags.values_list("word", flat=True)),
+            ["word2", "word3"],
+        )
+        self.assertEqual(entry.revisions.count(), 1)
+
+
+class TestEmotionCatalog(TestCase):
+    """Per-worker emotion word catalog for the entry forms."""
+
+    def test_catalog_follows_word_changes(self):
+        EmotionWord.objects.create(word="Calm")
+        self.assertIn("Calm", get_emotion_catalog().words)
+
+        # A current catalog costs no queries
+        with self.assertNumQueries(0):
+            catalog = get_emotion_catalog()
+        self.assertIsInstance(catalog.words, tuple)
+
+        # Saves and deletes (admin included) bump the catalog version
+        EmotionWord.objects.filter(word="Calm").delete()
+        EmotionWord.objects.create(word="Hopeful")
+        catalog = get_emotion_catalog()
+        self.assertNotIn("Calm", catalog.words)
+        self.assertEqual(catalog.ids["Hopeful"], EmotionWord.objects.get(word="Hopeful").pk)
+
+    def test_warm_seeds_empty_table_from_fixture(self):
+        EmotionWord.objects.all().delete()
+        catalog = warm_emotion_catalog()
+        self.assertEqual(len(catalog), EmotionWord.objects.count())
+        self.assertIn("Accepted", catalog.words)
@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cards import EntryCard
+from core.models import NOTES_PREVIEW_LENGTH, Entry
+
+
+User = get_user_model()
+
+
+class TestEntryCards(TestCase):
+    """My Entries reads a compact projection with a stored notes preview."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="carder", password=self.password)
+        self.client.login(username="carder", password=self.password)
+
+    def test_preview_is_bounded_and_kept_in_step(self):
+        entry = Entry.objects.create(user=self.user, mood=3, hue="50", notes="word " * 200)
+        self.assertLessEqual(len(entry.notes_preview), NOTES_PREVIEW_LENGTH)
+        self.assertTrue(entry.notes_preview.endswith("word…"))
+
+        entry.notes = "short now"
+        entry.save(update_fields=["notes"])
+        entry.refresh_from_db()
+        self.assertEqual(entry.notes_preview, "short now")
+
+    def test_list_skips_full_notes(self):
+        Entry.objects.create(user=self.user, mood=4, hue="70", notes="opening line " + "x" * 5000)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("my_entries"))
+
+        self.assertContains(response, "opening line")
+        self.assertNotContains(response, "x" * 500)
+        entry_queries = [q["sql"] for q in ctx.captured_queries if 'FROM "core_entry"' in q["sql"]]
+        self.assertTrue(entry_queries)
+        self.assertFalse(any('"core_entry"."notes",' in sql for sql in entry_queries))
+
+        card = response.context["grouped_entries"].popitem()[1][0]
+        self.assertIsInstance(card, EntryCard)
+        self.assertFalse(hasattr(card, "__dict__"))
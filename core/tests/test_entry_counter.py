@@ -0,0 +1,88 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.limits import FREE_ENTRY_LIMIT, entry_allowance, is_free_locked
+from core.models import Entry, UserContentState
+from core.versioning import ensure_content_state
+
+
+User = get_user_model()
+
+
+class TestEntryCounter(TestCase):
+    """Stored per-user entry counter behind the free-plan limit."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="counted", password=self.password)
+        self.client.login(username="counted", password=self.password)
+
+    def _stored(self):
+        return UserContentState.objects.get(user=self.user).entry_count
+
+    def test_counter_follows_create_and_delete(self):
+        self.client.post(reverse("new_entry"), {"hue": "50", "notes": "one"})
+        self.client.post(reverse("new_entry"), {"hue": "50", "notes": "two"})
+        self.assertEqual(self._stored(), 2)
+
+        entry = Entry.objects.filter(user=self.user).first()
+        self.client.post(reverse("delete_entry", args=[entry.id]))
+        self.assertEqual(self._stored(), 1)
+
+        # Limit checks read the counter row instead of counting entries
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("my_entries"))
+        self.assertFalse(any("COUNT(*)" in q["sql"] for q in ctx.captured_queries))
+
+    def test_new_entry_refused_when_counter_is_full(self):
+        Entry.objects.bulk_create([Entry(user=self.user, mood=3) for _ in range(FREE_ENTRY_LIMIT)])
+
+        self.assertEqual(entry_allowance(self.user), 0)
+        self.assertTrue(is_free_locked(self.user))
+
+        self.client.post(reverse("new_entry"), {"hue": "50", "notes": "over"})
+        self.assertEqual(Entry.objects.filter(user=self.user).count(), FREE_ENTRY_LIMIT)
+
+    def test_last_free_slot_is_taken_once(self):
+        Entry.objects.bulk_create([Entry(user=self.user, mood=3) for _ in range(FREE_ENTRY_LIMIT - 1)])
+        ensure_content_state(self.user.pk)
+
+        self.assertEqual(entry_allowance(self.user), 1)
+        self.client.post(reverse("new_entry"), {"hue": "50", "notes": "last"})
+        self.client.post(reverse("new_entry"), {"hue": "50", "notes": "over"})
+
+        self.assertEqual(Entry.objects.filter(user=self.user).count(), FREE_ENTRY_LIMIT)
+        self.assertEqual(self._stored(), FREE_ENTRY_LIMIT)
+
+    def test_allowance_takes_the_write_lock_before_reading(self):
+        ensure_content_state(self.user.pk)
+
+        with transaction.atomic(), CaptureQueriesContext(connection) as ctx:
+            entry_allowance(self.user)
+
+        # A read first would leave SQLite's deferred transaction unable to wait for the lock
+        statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertTrue(statements[0].startswith('UPDATE "core_usercontentstate"'), statements[0])
+
+    def test_reconcile_fixes_drift(self):
+        Entry.objects.create(user=self.user, mood=3)
+        UserContentState.objects.filter(user=self.user).update(entry_count=7)
+
+        out = StringIO()
+        call_command("reconcile_entry_counts", stdout=out)
+
+        self.assertIn("fixed 1", out.getvalue())
+        self.assertEqual(self._stored(), 1)
+
+    def test_deleting_user_with_entries(self):
+        Entry.objects.create(user=self.user, mood=3)
+
+        self.user.delete()
+
+        self.assertFalse(UserContentState.objects.exists())
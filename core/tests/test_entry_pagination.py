@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Entry
+from core.views import ENTRIES_PAGE_SIZE
+
+
+User = get_user_model()
+
+
+class TestMyEntriesPagination(TestCase):
+    """Keyset pagination of My Entries date groups."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="pager", password=self.password)
+        self.client.login(username="pager", password=self.password)
+
+    def _make_entry(self, created_at, notes):
+        entry = Entry.objects.create(user=self.user, mood=3, hue="50", notes=notes)
+        Entry.objects.filter(pk=entry.pk).update(created_at=created_at)
+        return entry
+
+    def _make_days(self, days, per_day):
+        """Create `per_day` entries on each of the last `days` days."""
+        now = timezone.now()
+        for day in range(days):
+            for n in range(per_day):
+                self._make_entry(
+                    now - timedelta(days=day, minutes=n),
+                    f"day{day}-note{n}",
+                )
+
+    def test_first_page_is_bounded_and_ends_on_whole_day(self):
+        # 3 entries/day over enough days to overflow one window
+        self._make_days(days=(ENTRIES_PAGE_SIZE // 3) + 5, per_day=3)
+
+        response = self.client.get(reverse("my_entries"))
+
+        self.assertEqual(response.status_code, 200)
+        shown = sum(len(v) for v in response.context["grouped_entries"].values())
+        self.assertLessEqual(shown, ENTRIES_PAGE_SIZE)
+        self.assertEqual(shown % 3, 0)
+        self.assertTrue(response.context["next_page_url"])
+
+    def test_pages_cover_every_entry_once(self):
+        self._make_days(days=(ENTRIES_PAGE_SIZE // 3) + 5, per_day=3)
+
+        seen = []
+        url = reverse("my_entries")
+        while url:
+            response = self.client.get(url, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen.extend(
+                e.id for group in response.context["grouped_entries"].values() for e in group
+            )
+            url = data["next_page_url"]
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), set(Entry.objects.filter(user=self.user).values_list("id", flat=True)))
+
+    def test_day_spanning_windows_gets_one_header(self):
+        # More entries on one day than fit in a window
+        noon = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        for n in range(ENTRIES_PAGE_SIZE + 5):
+            self._make_entry(noon - timedelta(seconds=n), f"note{n}")
+        day = noon.date()
+        heading = f'id="heading-{day:%Y%m%d}"'
+
+        first = self.client.get(reverse("my_entries"))
+        self.assertContains(first, heading, count=1)
+
+        data = self.client.get(
+            first.context["next_page_url"], HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        ).json()
+        self.assertNotIn(heading, data["html"])
+        self.assertNotIn(f'id="collapse-{day:%Y%m%d}"', data["html"])
+        self.assertIn("(continued)", data["html"])
+        self.assertIn(f'data-date="{day:%Y-%m-%d}"', data["html"])
+
+    def test_search_filter_is_kept_across_pages(self):
+        self._make_days(days=ENTRIES_PAGE_SIZE + 5, per_day=2)
+
+        response = self.client.get(reverse("my_entries") + "?q=note1")
+        next_url = response.context["next_page_url"]
+
+        self.assertIn("q=note1", next_url)
+        self.assertIn(f"start={ENTRIES_PAGE_SIZE}", next_url)
+
+        response = self.client.get(next_url)
+        self.assertTrue(response.context["ranked_entries"])
+        for entry in response.context["ranked_entries"]:
+            self.assertIn("note1", entry.notes_preview)
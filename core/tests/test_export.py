@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import EmotionWord, Entry, EntryRevision
+
+
+User = get_user_model()
+
+
+class TestEntryExport(TestCase):
+    """Streaming CSV / NDJSON export of entries, tags and revisions."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="exporter", password=self.password)
+        self.client.login(username="exporter", password=self.password)
+
+        calm = EmotionWord.objects.create(word="Calm")
+        self.entry = Entry.objects.create(
+            user=self.user, mood=4, hue="70", emotion_words="Calm", notes="Now, with a comma"
+        )
+        self.entry.emotion_word_tags.set([calm])
+        self.revision = EntryRevision.objects.create(
+            entry=self.entry, mood=2, hue="30", emotion_words="", notes="Before"
+        )
+
+        other = User.objects.create_user(username="someone", password=self.password)
+        Entry.objects.create(user=other, mood=1, hue="5", notes="Not yours")
+
+    def _body(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv_export_streams_entries_and_revisions(self):
+        response = self.client.get(reverse("export_entries") + "?format=csv")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment;", response["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(self._body(response))))
+
+        self.assertEqual([r["record_type"] for r in rows], ["entry", "revision"])
+        self.assertEqual(rows[0]["notes"], "Now, with a comma")
+        self.assertEqual(rows[0]["emotion_tags"], "Calm")
+        self.assertEqual(rows[1]["revision_id"], str(self.revision.id))
+        self.assertEqual(rows[1]["notes"], "Before")
+
+    def test_ndjson_export_nests_revisions(self):
+        response = self.client.get(reverse("export_entries") + "?format=ndjson")
+
+        records = [json.loads(line) for line in self._body(response).splitlines()]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["emotion_tags"], ["Calm"])
+        self.assertEqual(records[0]["revisions"][0]["notes"], "Before")
+
+    def test_export_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("export_entries"))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_asgi_export_streams_chunk_by_chunk(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("export_entries") + "?format=csv")
+
+        # An async iterator: Django won't buffer it into a list under ASGI
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(chunks[0].startswith(b"record_type,"))
+
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        self.assertEqual([r["record_type"] for r in rows], ["entry", "revision"])
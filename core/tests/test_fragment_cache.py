@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from billing.models import Subscription
+from core.models import EmotionWord, Entry, EntryRevision
+from core.versioning import content_version
+
+
+User = get_user_model()
+
+
+class TestVersionedFragmentCache(TestCase):
+    """Fragments are reused until the owner's content version changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="cacher", password=self.password)
+        self.client.login(username="cacher", password=self.password)
+
+    def test_content_version_changes_on_entry_revision_and_subscription_writes(self):
+        versions = [content_version(self.user)]
+
+        entry = Entry.objects.create(user=self.user, mood=3, hue="50")
+        versions.append(content_version(self.user))
+
+        EntryRevision.objects.create(entry=entry, mood=3, hue="50")
+        versions.append(content_version(self.user))
+
+        Subscription.objects.create(user=self.user, status="active")
+        versions.append(content_version(self.user))
+
+        entry.delete()
+        versions.append(content_version(self.user))
+
+        self.assertEqual(len(set(versions)), len(versions))
+
+    def test_entry_card_is_served_from_cache_until_a_tracked_write(self):
+        entry = Entry.objects.create(user=self.user, mood=3, hue="50", notes="Original note")
+        self.client.get(reverse("my_entries"))
+
+        # Untracked write (no signal): the cached card is still used
+        Entry.objects.filter(pk=entry.pk).update(notes="Sneaky change")
+        response = self.client.get(reverse("my_entries"))
+        self.assertContains(response, "Original note")
+
+        # A real save bumps the version, so the card re-renders
+        entry.notes = "Saved change"
+        entry.save()
+        response = self.client.get(reverse("my_entries"))
+        self.assertContains(response, "Saved change")
+        self.assertNotContains(response, "Original note")
+
+    def test_plan_badge_updates_after_subscription_change(self):
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "plan-banner plan-free")
+
+        Subscription.objects.create(user=self.user, status="active")
+
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "plan-banner plan-plus")
+
+    def test_emotion_grid_updates_when_a_word_is_added(self):
+        EmotionWord.objects.create(word="Calm")
+        self.assertContains(self.client.get(reverse("new_entry")), 'value="Calm"')
+
+        EmotionWord.objects.create(word="Hopeful")
+        self.assertContains(self.client.get(reverse("new_entry")), 'value="Hopeful"')
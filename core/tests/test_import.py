@@ -0,0 +1,128 @@
+import io
+import json
+from datetime import UTC, date, datetime
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from core.imports import import_entries
+from core.limits import FREE_ENTRY_LIMIT
+from core.models import DailyMood, EmotionWord, Entry, EntryRevision
+from core.search import get_search_backend
+from billing.models import Subscription
+
+
+User = get_user_model()
+
+
+class TestEntryImport(TestCase):
+    """Bulk import of entry history from CSV / NDJSON."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="importer", password=self.password)
+        self.client.login(username="importer", password=self.password)
+        EmotionWord.objects.create(word="Calm")
+
+    def _csv(self, *rows):
+        header = "record_type,created_at,mood,hue,emotion_words,notes\n"
+        return io.BytesIO((header + "".join(rows)).encode("utf-8"))
+
+    def test_csv_import_keeps_timestamps_tags_and_revisions(self):
+        Subscription.objects.create(user=self.user, status="active")
+        data = self._csv(
+            'entry,2021-03-04T09:30:00+00:00,,85,"calm, Rainy",Walked by the sea\n',
+            "revision,2021-03-04T09:00:00+00:00,2,30,,First draft\n",
+            "entry,2021-03-05,2,,,\n",
+        )
+
+        result = import_entries(self.user, data, "csv")
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual((result.created, result.revisions), (2, 1))
+
+        first = Entry.objects.get(user=self.user, notes="Walked by the sea")
+        self.assertEqual(first.created_at.year, 2021)
+        self.assertEqual(first.mood, 5)  # derived from hue 85
+        self.assertEqual(first.revision_count, 1)
+        self.assertEqual(first.emotion_words, "Calm, Rainy")
+        self.assertEqual(
+            sorted(first.emotion_word_tags.values_list("word", flat=True)), ["Calm", "Rainy"]
+        )
+        # Existing word matched case-insensitively; the new one added once
+        self.assertEqual(EmotionWord.objects.filter(word__iexact="calm").count(), 1)
+        self.assertEqual(EntryRevision.objects.get(entry=first).notes, "First draft")
+
+        self.assertEqual(DailyMood.objects.filter(user=self.user).count(), 2)
+
+        matches = get_search_backend().filter(Entry.objects.filter(user=self.user), "sea")
+        self.assertEqual(list(matches), [first])
+
+    def test_rollups_refresh_only_imported_days(self):
+        Subscription.objects.create(user=self.user, status="active")
+        # A day between the imported ones; a range refresh would drop this row
+        DailyMood.objects.create(
+            user=self.user,
+            day=date(2021, 3, 10),
+            entry_count=1,
+            mood_total=3,
+            mood_min=3,
+            mood_max=3,
+            last_entry_at=datetime(2021, 3, 10, 12, tzinfo=UTC),
+        )
+        data = self._csv("entry,2021-03-04,2,,,\n", "entry,2021-03-20,4,,,\n")
+
+        result = import_entries(self.user, data, "csv")
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(
+            sorted(DailyMood.objects.filter(user=self.user).values_list("day", "mood_total")),
+            [(date(2021, 3, 4), 2), (date(2021, 3, 10), 3), (date(2021, 3, 20), 4)],
+        )
+
+    def test_invalid_row_rolls_back_whole_import(self):
+        data = self._csv(
+            "entry,2021-03-04,3,,,Fine\n",
+            "entry,not a date,3,,,Broken\n",
+            "entry,2021-03-06,9,,,Also broken\n",
+        )
+
+        result = import_entries(self.user, data, "csv")
+
+        self.assertFalse(result.ok)
+        self.assertEqual([line for line, _ in result.errors], [3, 4])
+        self.assertFalse(Entry.objects.filter(user=self.user).exists())
+
+    def test_free_plan_import_stops_at_limit(self):
+        Entry.objects.create(user=self.user, mood=3, notes="Existing")
+        lines = "".join(
+            json.dumps({"created_at": f"2020-01-{n + 1:02d}", "mood": 3, "notes": f"n{n}"}) + "\n"
+            for n in range(FREE_ENTRY_LIMIT + 2)
+        )
+
+        result = import_entries(self.user, io.BytesIO(lines.encode("utf-8")), "ndjson")
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(result.created, FREE_ENTRY_LIMIT - 1)
+        self.assertEqual(result.skipped_over_limit, 3)
+        self.assertEqual(Entry.objects.filter(user=self.user).count(), FREE_ENTRY_LIMIT)
+
+    def test_export_round_trips_through_upload(self):
+        entry = Entry.objects.create(user=self.user, mood=4, hue="70", notes="Round trip")
+        EntryRevision.objects.create(entry=entry, mood=2, hue="30", notes="Before")
+        exported = b"".join(
+            self.client.get(reverse("export_entries") + "?format=csv").streaming_content
+        )
+        Entry.objects.filter(user=self.user).delete()
+
+        response = self.client.post(
+            reverse("import_entries"),
+            {"format": "csv", "file": SimpleUploadedFile("export.csv", exported)},
+        )
+
+        self.assertRedirects(response, reverse("my_entries"))
+        imported = Entry.objects.get(user=self.user)
+        self.assertEqual(imported.created_at, entry.created_at)
+        self.assertEqual(imported.revisions.get().notes, "Before")
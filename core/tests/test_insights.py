@@ -0,0 +1,93 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import insights as insights_module
+from core.insights import compute_insights, get_history, load_history, user_insights
+from core.models import EmotionWord, Entry
+
+
+User = get_user_model()
+
+
+class TestMoodInsights(TestCase):
+    """Vectorised insights over a user's entry arrays."""
+
+    def setUp(self):
+        cache.clear()
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="insightful", password=self.password)
+        self.client.login(username="insightful", password=self.password)
+
+        self.today = timezone.localdate()
+        now = timezone.now()
+        tired = EmotionWord.objects.create(word="Tired")
+        anxious = EmotionWord.objects.create(word="Anxious")
+        calm = EmotionWord.objects.create(word="Calm")
+
+        # Three consecutive days, then a gap, then one older day
+        for days_ago, mood, tags in [
+            (0, 2, [tired, anxious]),
+            (1, 4, [calm]),
+            (2, 2, [tired, anxious]),
+            (10, 5, [calm]),
+        ]:
+            entry = Entry.objects.create(
+                user=self.user, mood=mood, hue=str(mood * 20), created_at=now - timedelta(days=days_ago)
+            )
+            entry.emotion_word_tags.set(tags)
+
+    def test_compute_insights(self):
+        history = load_history(self.user)
+        self.assertEqual(history.mood.dtype, np.int8)
+
+        insights = compute_insights(history, today=self.today)
+
+        self.assertEqual(insights["days_logged"], 4)
+        self.assertAlmostEqual(insights["average_7"], 2.67)
+        self.assertAlmostEqual(insights["average_30"], 3.25)
+        self.assertEqual((insights["current_streak"], insights["longest_streak"]), (3, 3))
+
+        word_a, word_b, count = compute_insights(history, today=self.today)["emotion_pairs"][0]
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            {word_a, word_b},
+            set(EmotionWord.objects.filter(word__in=["Tired", "Anxious"]).values_list("pk", flat=True)),
+        )
+
+    def test_history_snapshot_is_memory_mapped_and_versioned(self):
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            with override_settings(INSIGHTS_SNAPSHOT_DIR=snapshot_dir):
+                first = get_history(self.user)
+
+                mapped = get_history(self.user)
+                self.assertIsInstance(mapped.mood, np.memmap)
+                np.testing.assert_array_equal(mapped.day, first.day)
+
+                Entry.objects.create(user=self.user, mood=3)
+                self.assertEqual(len(get_history(self.user)), 5)
+
+    def test_repeat_loads_reuse_the_computed_insights(self):
+        first = user_insights(self.user)
+
+        # Content version check only: no history load, no word lookup
+        with self.assertNumQueries(1), mock.patch.object(
+            insights_module, "compute_insights", side_effect=AssertionError
+        ):
+            self.assertEqual(user_insights(self.user), first)
+
+        Entry.objects.create(user=self.user, mood=3)
+        self.assertEqual(user_insights(self.user)["entries"], 5)
+
+    def test_dashboard_shows_insights_panel(self):
+        response = self.client.get(reverse("dashboard"))
+
+        self.assertContains(response, 'id="dashboard-insights"')
+        self.assertContains(response, "Anxious + Tired")
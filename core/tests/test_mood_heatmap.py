@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core import rollups
+from core.models import Entry
+
+
+User = get_user_model()
+
+
+class TestMoodHeatmap(TestCase):
+    """Year heatmap JSON: read from the daily rollups, ETag revalidation."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="heatmapper", password=self.password)
+        self.client.login(username="heatmapper", password=self.password)
+
+        now = timezone.now()
+        Entry.objects.create(user=self.user, mood=2, created_at=now)
+        Entry.objects.create(user=self.user, mood=4, created_at=now)
+        Entry.objects.create(user=self.user, mood=5, created_at=now - timedelta(days=3))
+        # Outside the window
+        Entry.objects.create(user=self.user, mood=1, created_at=now - timedelta(days=400))
+
+        other = User.objects.create_user(username="other", password=self.password)
+        Entry.objects.create(user=other, mood=1, created_at=now)
+
+        # Direct creates skip the view write paths that keep rollups current
+        rollups.rebuild()
+
+    def test_days_come_from_rollups_not_entries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("mood_heatmap"))
+
+        days = response.json()["days"]
+        self.assertEqual(
+            days,
+            [
+                {"date": (timezone.localdate() - timedelta(days=3)).isoformat(), "count": 1, "mood": 5},
+                {"date": timezone.localdate().isoformat(), "count": 2, "mood": 3},
+            ],
+        )
+        sql = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertIn("core_dailymood", sql)
+        self.assertNotIn("core_entry", sql)
+
+    def test_etag_revalidates_until_entries_change(self):
+        etag = self.client.get(reverse("mood_heatmap"))["ETag"]
+
+        response = self.client.get(reverse("mood_heatmap"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post(reverse("new_entry"), {"hue": "50", "mood": "3", "notes": "n"})
+        response = self.client.get(reverse("mood_heatmap"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["days"][-1]["count"], 3)
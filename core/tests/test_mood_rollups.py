@@ -0,0 +1,62 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import DailyMood, Entry
+from billing.models import Subscription
+
+
+User = get_user_model()
+
+
+class TestDailyMoodRollups(TestCase):
+    """DailyMood stays in step with the entry write paths."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="roller", password=self.password)
+        self.client.login(username="roller", password=self.password)
+        Subscription.objects.create(user=self.user, status="active")
+
+    def _today(self):
+        return DailyMood.objects.get(user=self.user, day=timezone.localdate())
+
+    def test_create_edit_delete_update_rollup(self):
+        self.client.post(reverse("new_entry"), {"hue": "90", "notes": "Great"})
+        self.client.post(reverse("new_entry"), {"hue": "10", "notes": "Rough"})
+
+        day = self._today()
+        self.assertEqual(day.entry_count, 2)
+        self.assertEqual((day.mood_min, day.mood_max), (1, 5))
+        self.assertEqual(day.mean_mood, 3)
+        self.assertEqual(day.mean_hue, 50)
+
+        rough = Entry.objects.get(user=self.user, notes="Rough")
+        self.client.post(reverse("edit_entry", args=[rough.id]), {"hue": "50", "notes": "Rough"})
+
+        day = self._today()
+        self.assertEqual((day.mood_min, day.mood_max, day.mood_total), (3, 5, 8))
+
+        for entry in Entry.objects.filter(user=self.user):
+            self.client.post(reverse("delete_entry", args=[entry.id]))
+
+        self.assertFalse(DailyMood.objects.filter(user=self.user).exists())
+
+    def test_rebuild_command_matches_incremental_rollups(self):
+        now = timezone.now()
+        for days_ago, mood, hue in [(0, 4, "70"), (0, 2, ""), (3, 5, "95")]:
+            Entry.objects.create(
+                user=self.user, mood=mood, hue=hue, created_at=now - timedelta(days=days_ago)
+            )
+
+        call_command("rebuild_mood_rollups", stdout=StringIO())
+
+        rows = list(DailyMood.objects.filter(user=self.user))
+        self.assertEqual([r.entry_count for r in rows], [2, 1])
+        self.assertEqual((rows[0].mood_total, rows[0].hue_count, rows[0].hue_total), (6, 1, 70))
+        self.assertEqual(rows[1].day, timezone.localdate(now - timedelta(days=3)))
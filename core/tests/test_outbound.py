@@ -0,0 +1,90 @@
+from unittest import mock
+
+import requests
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from requests.adapters import HTTPAdapter
+
+from core import outbound
+
+
+User = get_user_model()
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    return response
+
+
+@override_settings(OUTBOUND_BREAKER_THRESHOLD=3, OUTBOUND_BREAKER_COOLDOWN=60)
+class TestOutboundSession(TestCase):
+    """Deadlines, the circuit breaker and metrics in core/outbound.py."""
+
+    def setUp(self):
+        outbound.reset()
+        self.session = outbound.get_session("affirmations")
+
+    def tearDown(self):
+        outbound.reset()
+
+    def test_breaker_opens_after_consecutive_failures_and_fails_fast(self):
+        with mock.patch.object(HTTPAdapter, "send", side_effect=requests.ConnectionError) as send:
+            for _ in range(3):
+                with self.assertRaises(requests.ConnectionError):
+                    self.session.get("https://example.invalid/")
+            with self.assertRaises(outbound.UpstreamUnavailable):
+                self.session.get("https://example.invalid/")
+
+        # The fourth call never reached the network
+        self.assertEqual(send.call_count, 3)
+        stats = outbound.metrics()["affirmations"]
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual((stats["calls"], stats["errors"], stats["rejected"]), (3, 3, 1))
+
+    def test_half_open_trial_success_closes_breaker(self):
+        with mock.patch.object(HTTPAdapter, "send", return_value=_response(503)):
+            for _ in range(3):
+                self.session.get("https://example.invalid/")
+
+        with override_settings(OUTBOUND_BREAKER_COOLDOWN=0):
+            with mock.patch.object(HTTPAdapter, "send", return_value=_response(200)):
+                self.session.get("https://example.invalid/")
+
+        self.assertEqual(outbound.metrics()["affirmations"]["state"], "closed")
+
+    def test_timeout_is_capped_by_remaining_budget(self):
+        with mock.patch.object(HTTPAdapter, "send", return_value=_response(200)) as send:
+            with outbound.deadline(1):
+                self.session.get("https://example.invalid/", timeout=30)
+
+        self.assertLessEqual(send.call_args.kwargs["timeout"], 1)
+
+    def test_spent_budget_skips_the_call(self):
+        with mock.patch.object(HTTPAdapter, "send") as send:
+            with outbound.deadline(0):
+                with self.assertRaises(outbound.DeadlineExceeded):
+                    self.session.get("https://example.invalid/")
+
+        send.assert_not_called()
+
+
+class TestOutboundMetricsView(TestCase):
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="member", password=self.password)
+        self.staff = User.objects.create_user(
+            username="staffer", password=self.password, is_staff=True
+        )
+
+    def test_staff_only(self):
+        self.client.login(username="member", password=self.password)
+        response = self.client.get(reverse("outbound_metrics"))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.login(username="staffer", password=self.password)
+        response = self.client.get(reverse("outbound_metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("stripe", response.json()["upstreams"])
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import phrases
+
+
+User = get_user_model()
+
+
+class StubSource(phrases.PhraseSource):
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, count):
+        self.calls += 1
+        return [(f"phrase {i}", "Stub") for i in range(count)]
+
+
+class TestPhrasePool(TestCase):
+    """Supportive phrases come from a shared, pre-fetched pool."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        User.objects.create_user(username="phrasey", password=self.password)
+        self.client.login(username="phrasey", password=self.password)
+        caches["shared"].delete(phrases.POOL_KEY)
+
+    def test_view_uses_fallback_when_pool_empty(self):
+        response = self.client.get(reverse("supportive_phrase"))
+        data = response.json()
+        self.assertIn(data["phrase"], phrases.FALLBACK_PHRASES)
+        self.assertEqual(data["author"], "")
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_refill_is_bounded_and_view_takes_from_pool(self):
+        source = StubSource()
+        self.assertEqual(phrases.refill(source), phrases.POOL_SIZE)
+        # Already full: no fetch
+        self.assertEqual(phrases.refill(source), 0)
+        self.assertEqual(source.calls, 1)
+
+        data = self.client.get(reverse("supportive_phrase")).json()
+        self.assertTrue(data["phrase"].startswith("phrase "))
+        self.assertEqual(data["author"], "Stub")
+        self.assertEqual(phrases.pool_size(), phrases.POOL_SIZE - 1)
+
+    def test_refill_skips_while_another_worker_holds_the_lock(self):
+        with phrases._locked(phrases.REFILL_LOCK, wait=False) as held:
+            self.assertTrue(held)
+            self.assertEqual(phrases.refill(StubSource()), 0)
+
+    def test_take_waits_for_the_pool_lock_instead_of_racing(self):
+        phrases.refill(StubSource())
+        taken = []
+
+        with phrases._locked(phrases.POOL_LOCK):
+            taker = threading.Thread(target=lambda: taken.append(phrases.get_phrase()))
+            taker.start()
+            taker.join(0.2)
+            # Still waiting: the pool is left alone while another holder has it
+            self.assertEqual(taken, [])
+            self.assertEqual(phrases.pool_size(), phrases.POOL_SIZE)
+        taker.join()
+
+        self.assertEqual(taken[0][1], "Stub")
+        self.assertEqual(phrases.pool_size(), phrases.POOL_SIZE - 1)
+
+    def test_command_uses_configured_source(self):
+        out = StringIO()
+        call_command("refill_phrases", stdout=out)
+        self.assertIn(f"Added {phrases.POOL_SIZE} phrases", out.getvalue())
+
+
+# ---------- across processes ----------
+
+class OverlapCheckingSource(phrases.PhraseSource):
+    """Fails loudly if two refills ever fetch at the same time."""
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def fetch(self, count):
+        fd = os.open(self.marker, os.O_CREAT | os.O_EXCL)
+        time.sleep(0.005)
+        os.close(fd)
+        os.remove(self.marker)
+        return []
+
+
+def _worker(args):
+    job, marker = args
+    if job == "take":
+        return [phrases.get_phrase() for _ in range(40)]
+    source = OverlapCheckingSource(marker)
+    for _ in range(40):
+        phrases.refill(source)
+    return []
+
+
+class TestPhrasePoolAcrossProcesses(SimpleTestCase):
+    """The locks hold between worker processes sharing the file-based pool."""
+
+    def test_no_phrase_is_taken_twice_and_refills_never_overlap(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        shared = FileBasedCache(os.path.join(tmp, "cache"), {})
+        pool = [[f"phrase {i}", "Stub"] for i in range(phrases.POOL_SIZE)]
+        shared.set(phrases.POOL_KEY, pool, timeout=None)
+
+        marker = os.path.join(tmp, "fetching")
+        jobs = [("take", marker)] * 4 + [("refill", marker)] * 2
+        with (
+            mock.patch.object(phrases, "_pool_cache", return_value=shared),
+            override_settings(SHARED_LOCK_DIR=os.path.join(tmp, "locks")),
+            multiprocessing.get_context("fork").Pool(len(jobs)) as workers,
+        ):
+            # Refills find the pool low and fetch; a second concurrent fetch
+            # would hit the marker file and fail the worker
+            results = workers.map(_worker, jobs, chunksize=1)
+
+        taken = [phrase for batch in results for phrase, author in batch if author]
+        self.assertEqual(sorted(taken), sorted(phrase for phrase, _ in pool))
+        self.assertEqual(shared.get(phrases.POOL_KEY), [])
@@ -0,0 +1,66 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Entry, EntryRevision
+
+
+User = get_user_model()
+
+
+class TestRevisionCounts(TestCase):
+    """Denormalised Entry.revision_count and its reconcile command."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="counter", password=self.password)
+        self.client.login(username="counter", password=self.password)
+
+    def _make_entry(self, notes="first"):
+        return Entry.objects.create(user=self.user, mood=3, hue="50", notes=notes)
+
+    def _list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("my_entries"))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_edit_increments_revision_count(self):
+        entry = self._make_entry()
+
+        self.client.post(reverse("edit_entry", args=[entry.id]), {"hue": "50", "notes": "second"})
+        self.client.post(reverse("edit_entry", args=[entry.id]), {"hue": "50", "notes": "third"})
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.revision_count, 2)
+        self.assertEqual(entry.revisions.count(), 2)
+
+        response = self.client.get(reverse("my_entries"))
+        self.assertContains(response, "2 revisions in history")
+
+    def test_entry_list_query_count_does_not_grow_with_entries(self):
+        self._make_entry()
+        baseline = self._list_query_count()
+
+        for n in range(5):
+            entry = self._make_entry(notes=f"note {n}")
+            EntryRevision.objects.create(entry=entry, mood=3, hue="50", notes="old")
+
+        self.assertEqual(self._list_query_count(), baseline)
+
+    def test_reconcile_command_repairs_drift(self):
+        entry = self._make_entry()
+        EntryRevision.objects.create(entry=entry, mood=3, hue="50", notes="old")
+        Entry.objects.filter(pk=entry.pk).update(revision_count=7)
+
+        out = StringIO()
+        call_command("reconcile_revision_counts", stdout=out)
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.revision_count, 1)
+        self.assertIn("fixed 1", out.getvalue())
@@ -0,0 +1,190 @@
+import importlib
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.exports import iter_ndjson
+from core.models import Entry, EntryRevision
+from core.revisions import KEYFRAME_INTERVAL, RevisionHistory, build_revision, snapshot
+
+
+User = get_user_model()
+
+revision_deltas = importlib.import_module("core.migrations.0017_revision_deltas")
+
+
+class TestRevisionDeltas(TestCase):
+    """Revisions stored as reverse deltas with periodic keyframes."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="reviser", password=self.password)
+        self.client.login(username="reviser", password=self.password)
+        self.entry = Entry.objects.create(
+            user=self.user, mood=3, hue="50", notes="line 0\n" + "shared line\n" * 50
+        )
+
+    def _edit_many(self, count):
+        """Edit the entry count times; return the expected history, newest first."""
+        expected = []
+        for i in range(1, count + 1):
+            self.entry.refresh_from_db()
+            expected.insert(0, snapshot(self.entry))
+            self.client.post(
+                reverse("edit_entry", args=[self.entry.id]),
+                {
+                    "hue": str(40 + i),
+                    "notes": f"line {i}\n" + "shared line\n" * 50,
+                    "emotion_words": ["Calm"] if i % 2 else [],
+                },
+            )
+        self.entry.refresh_from_db()
+        return expected
+
+    def test_history_rebuilds_exactly(self):
+        expected = self._edit_many(KEYFRAME_INTERVAL + 2)
+
+        stored = EntryRevision.objects.filter(entry=self.entry)
+        self.assertEqual(stored.filter(is_keyframe=True).count(), 1)
+        # Deltas don't copy the unchanged lines
+        delta = stored.filter(is_keyframe=False).first()
+        self.assertEqual(delta.notes, "")
+        self.assertLess(len(json.dumps(delta.delta)), 100)
+
+        self.assertEqual([snapshot(rev) for rev in RevisionHistory(self.entry)], expected)
+
+        response = self.client.get(reverse("view_entry", args=[self.entry.id]))
+        self.assertContains(response, "line 1")
+
+        exported = json.loads(next(iter_ndjson(self.user)).splitlines()[0])
+        self.assertEqual([rev["notes"] for rev in exported["revisions"]], [s["notes"] for s in expected])
+
+    def test_migration_converts_snapshots(self):
+        expected = []
+        for i in range(KEYFRAME_INTERVAL + 3):
+            notes = f"version {i}\n" + "same\n" * 10
+            expected.insert(0, {"mood": 3, "hue": str(i), "emotion_words": "", "notes": notes})
+            EntryRevision.objects.create(entry=self.entry, **expected[0])
+
+        revision_deltas.snapshots_to_deltas(apps, None)
+        self.assertEqual(EntryRevision.objects.filter(is_keyframe=True).count(), 1)
+        self.assertEqual([snapshot(rev) for rev in RevisionHistory(self.entry)], expected)
+
+        revision_deltas.deltas_to_snapshots(apps, None)
+        self.assertEqual(
+            [snapshot(rev) for rev in EntryRevision.objects.order_by("-created_at", "-id")],
+            expected,
+        )
+
+
+class TestRevisionRetention(TestCase):
+    """prune_revisions: keep all recent, then one per day, then one per month."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="pruner", password=self.password)
+        self.entry = Entry.objects.create(user=self.user, mood=3, hue="50", notes="now\nshared\n")
+
+    @override_settings(REVISION_KEEP_ALL_DAYS=30, REVISION_KEEP_DAILY_DAYS=365)
+    def test_prune_thins_old_revisions_and_keeps_chain(self):
+        now = timezone.now()
+        day_40 = timezone.localtime(now - timedelta(days=40)).replace(hour=12)
+        month_13 = timezone.localtime(now - timedelta(days=400)).replace(day=15, hour=12)
+        created = [
+            now - timedelta(days=1), now - timedelta(days=2),  # recent: all kept
+            day_40 - timedelta(hours=1), day_40 - timedelta(hours=2),  # same day: newest kept
+            month_13, month_13 - timedelta(days=2),  # same month: newest kept
+        ]
+        # Build a delta chain the way edit_entry does, newest first
+        following = snapshot(self.entry)
+        states = []
+        for i, created_at in enumerate(created):
+            state = {"mood": 3, "hue": str(i), "emotion_words": "", "notes": f"v{i}\nshared\n"}
+            rev = build_revision(self.entry, state, following, position=len(created) - i)
+            rev.created_at = created_at
+            rev.save()
+            states.append(state)
+            following = state
+        Entry.objects.filter(pk=self.entry.pk).update(revision_count=len(created))
+
+        expected = [states[i] for i in (0, 1, 2, 4)]
+
+        out = StringIO()
+        call_command("prune_revisions", stdout=out)
+        self.assertIn("Pruned 2 revisions from 1 entries.", out.getvalue())
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.revision_count, len(expected))
+        self.assertEqual([snapshot(rev) for rev in RevisionHistory(self.entry)], expected)
+
+        # Nothing left to do on a second run
+        out = StringIO()
+        call_command("prune_revisions", stdout=out)
+        self.assertIn("Pruned 0 revisions", out.getvalue())
+
+
+class TestRevisionPages(TestCase):
+    """Paginated history on view_entry and the on-demand diff fragment."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="pager", password=self.password)
+        self.client.login(username="pager", password=self.password)
+        self.entry = Entry.objects.create(user=self.user, mood=3, hue="50", notes="start")
+        for i in range(1, 26):
+            self.client.post(
+                reverse("edit_entry", args=[self.entry.id]),
+                {"hue": "50", "notes": f"first line\nedit {i}"},
+            )
+        self.entry.refresh_from_db()
+
+    def test_pages_rebuild_only_their_rows(self):
+        full = [snapshot(rev) for rev in RevisionHistory(self.entry)]
+        for offset in (0, 10, 20):
+            page = RevisionHistory(self.entry, offset=offset, limit=10)
+            self.assertEqual([snapshot(rev) for rev in page], full[offset:offset + 10])
+
+        response = self.client.get(reverse("view_entry", args=[self.entry.id]), {"revisions_page": 3})
+        self.assertContains(response, "edit 4")
+        self.assertNotContains(response, "edit 6<")
+        self.assertContains(response, "Newer revisions")
+        self.assertNotContains(response, "Older revisions")
+
+    def test_diff_fragment_is_cached_per_pair(self):
+        oldest, newer = EntryRevision.objects.order_by("created_at", "id")[:2]
+        url = reverse("revision_diff", args=[self.entry.id])
+
+        response = self.client.get(url, {"from": oldest.id, "to": newer.id})
+        self.assertContains(response, "start")
+        self.assertContains(response, "edit 1")
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, {"from": oldest.id, "to": newer.id})
+        # Served from the cache: no chain walk
+        self.assertFalse(
+            any("COUNT" in q["sql"] for q in ctx.captured_queries if "core_entryrevision" in q["sql"])
+        )
+
+        response = self.client.get(url, {"from": oldest.id})
+        self.assertContains(response, "Current version")
+        self.assertContains(response, "edit 25")
+
+        User.objects.create_user(username="other", password=self.password)
+        self.client.login(username="other", password=self.password)
+        self.assertEqual(self.client.get(url, {"from": oldest.id}).status_code, 404)
+
+    def test_diff_refuses_reversed_or_equal_pairs(self):
+        oldest, newer = EntryRevision.objects.order_by("created_at", "id")[:2]
+        url = reverse("revision_diff", args=[self.entry.id])
+
+        self.assertEqual(self.client.get(url, {"from": newer.id, "to": oldest.id}).status_code, 404)
+        self.assertEqual(self.client.get(url, {"from": oldest.id, "to": oldest.id}).status_code, 404)
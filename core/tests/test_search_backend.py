@@ -0,0 +1,104 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import search
+from core.models import Entry
+from core.search import SimpleSearchBackend, SqliteFtsSearchBackend, get_search_backend
+
+
+User = get_user_model()
+
+
+class TestSearchBackend(TestCase):
+    """Full-text search backend: index upkeep, ranking and highlighting."""
+
+    def setUp(self):
+        self.password = "pass12345!"
+        self.user = User.objects.create_user(username="fts", password=self.password)
+        self.client.login(username="fts", password=self.password)
+        self.backend = get_search_backend()
+
+    def _mine(self):
+        return Entry.objects.filter(user=self.user)
+
+    def _make_entry(self, **fields):
+        return Entry.objects.create(user=self.user, mood=3, hue="50", **fields)
+
+    def test_sqlite_uses_fts_backend(self):
+        self.assertIsInstance(self.backend, SqliteFtsSearchBackend)
+
+    def test_index_follows_save_and_delete(self):
+        entry = self._make_entry(notes="Rainy walk by the river")
+        self.assertEqual([h.entry_id for h in self.backend.search(self._mine(), "river")], [entry.id])
+
+        entry.notes = "Quiet evening indoors"
+        entry.save()
+        self.assertEqual(self.backend.search(self._mine(), "river"), [])
+
+        entry.delete()
+        self.assertEqual(self.backend.search(self._mine(), "quiet"), [])
+
+    def test_results_are_ranked_and_scoped_to_user(self):
+        other = User.objects.create_user(username="other", password=self.password)
+        Entry.objects.create(user=other, mood=3, hue="50", notes="tired tired tired")
+        once = self._make_entry(notes="a little tired after work, then dinner and a long film")
+        often = self._make_entry(emotion_words="Tired", notes="tired and more tired")
+
+        hits = self.backend.search(self._mine(), "tired")
+
+        self.assertEqual([h.entry_id for h in hits], [often.id, once.id])
+
+    def test_search_pages_through_the_ranking(self):
+        entries = [self._make_entry(notes="tired " * n) for n in range(1, 6)]
+        best_first = [e.id for e in reversed(entries)]
+
+        first = self.backend.search(self._mine(), "tired", limit=3)
+        rest = self.backend.search(self._mine(), "tired", limit=3, offset=3)
+
+        self.assertEqual([h.entry_id for h in first + rest], best_first)
+
+    def test_my_entries_lists_matches_best_first(self):
+        often = self._make_entry(emotion_words="Tired", notes="tired and more tired")
+        once = self._make_entry(notes="a little tired after work, then dinner and a long film")
+        self._make_entry(notes="Rested")
+
+        response = self.client.get(reverse("my_entries") + "?q=tired")
+
+        self.assertEqual([e.id for e in response.context["ranked_entries"]], [often.id, once.id])
+        self.assertContains(response, "Best matches for")
+
+    def test_date_filter_scopes_the_ranked_search(self):
+        today = self._make_entry(notes="tired today")
+        older = self._make_entry(notes="tired before")
+        Entry.objects.filter(pk=older.pk).update(created_at=older.created_at - timedelta(days=3))
+
+        url = reverse("my_entries") + f"?q=tired&date={timezone.localdate():%Y-%m-%d}"
+        response = self.client.get(url)
+
+        self.assertEqual([e.id for e in response.context["ranked_entries"]], [today.id])
+
+    def test_fallback_is_not_kept_before_the_index_exists(self):
+        self.addCleanup(setattr, search, "_backend", search._backend)
+        search._backend = None
+
+        with mock.patch.object(search, "_sqlite_fts_available", return_value=False):
+            self.assertIsInstance(get_search_backend(), SimpleSearchBackend)
+        # Migrated since: the FTS backend is picked up without a restart
+        self.assertIsInstance(get_search_backend(), SqliteFtsSearchBackend)
+
+    def test_prefix_terms_match(self):
+        entry = self._make_entry(notes="Walked the dog")
+        self.assertEqual([h.entry_id for h in self.backend.search(self._mine(), "walk")], [entry.id])
+
+    def test_snippet_is_highlighted_and_escaped(self):
+        self._make_entry(notes="<b>calm</b> morning with coffee")
+
+        response = self.client.get(reverse("my_entries") + "?q=coffee")
+
+        self.assertContains(response, "<mark>coffee</mark>")
+        self.assertNotContains(response, "<b>calm</b>")
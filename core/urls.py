@@ -18,9 +18,18 @@ urlpatterns = [
     # My Entries – dedicated route for list/search view
     path("entries/", views.my_entries, name="my_entries"),
 
+    # Download all entries (streamed CSV / NDJSON)
+    path("entries/export/", views.export_entries, name="export_entries"),
+
+    # Upload entry history (CSV / NDJSON)
+    path("entries/import/", views.import_entries, name="import_entries"),
+
     # View single entry
     path("entry/<int:entry_id>/", views.view_entry, name="view_entry"),
 
+    # Side-by-side diff of a revision (HTML fragment, loaded on demand)
+    path("entry/<int:entry_id>/revisions/diff/", views.revision_diff, name="revision_diff"),
+
     # Edit entry
     path("entry/<int:entry_id>/edit/", views.edit_entry, name="edit_entry"),
 
@@ -29,5 +38,9 @@ urlpatterns = [
 
     # API
     path("api/supportive-phrase/", views.supportive_phrase, name="supportive_phrase"),
+    path("api/mood-heatmap/", views.mood_heatmap, name="mood_heatmap"),
+
+    # Staff: outbound HTTP health (core/outbound.py)
+    path("ops/outbound/", views.outbound_metrics, name="outbound_metrics"),
 ]
 
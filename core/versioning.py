@@ -0,0 +1,139 @@
+"""
+Version markers used to build cache keys.
+
+- Per-user content version: stored in UserContentState (the database is the
+  one place every worker agrees on), bumped by core/signals.py. The same
+  bump keeps UserContentState.entry_count in step.
+- Named global versions (e.g. the emotion word catalog): stored in
+  CacheVersion, so a bump on one dyno is seen by every worker on every
+  dyno. Each process remembers what it read for settings.CACHE_VERSION_TTL
+  seconds, so hot paths skip the query; changes made elsewhere can take
+  that long to show. A bump is seen at once by the process that made it.
+"""
+
+import time
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import CacheVersion, Entry, UserContentState
+
+
+def content_state(user):
+    """
+    Return (version, changed_at) of the user's content: the per-user
+    watermark behind both cache keys and conditional GETs (see
+    core/conditional.py). (0, None) before any recorded change.
+    """
+    if not user or not user.is_authenticated:
+        return 0, None
+
+    row = (
+        UserContentState.objects.filter(user=user)
+        .values_list("version", "changed_at")
+        .first()
+    )
+    return row or (0, None)
+
+
+def content_version(user):
+    """
+    Return a token that changes whenever the user's content changes.
+
+    Combines the counter with its timestamp so a recycled user id (tests,
+    restored backups) can never match an old key. Users with no recorded
+    changes get "0".
+    """
+    version, changed_at = content_state(user)
+    if changed_at is None:
+        return "0"
+    return f"{version}.{changed_at:%Y%m%d%H%M%S%f}"
+
+
+def ensure_content_state(user_id):
+    """
+    Return the user's UserContentState, creating it if needed.
+
+    A new row starts from a real COUNT(*) of the user's entries; after
+    that the counter is maintained by bump_content_version().
+    """
+    state, _ = UserContentState.objects.get_or_create(
+        user_id=user_id,
+        # Callable, so the COUNT only runs when the row is actually created
+        defaults={"entry_count": lambda: Entry.objects.filter(user_id=user_id).count()},
+    )
+    return state
+
+
+def bump_content_version(user_id, entry_delta=0, create=True):
+    """
+    Record a change to a user's entries, revisions or plan.
+
+    entry_delta adjusts the stored entry counter in the same UPDATE
+    (+n after creating entries, -n after deleting them). Delete handlers
+    pass create=False: during a user cascade the row may already be gone,
+    and recreating it would point at a user about to be deleted.
+    """
+    now = timezone.now()
+
+    updated = UserContentState.objects.filter(user_id=user_id).update(
+        version=F("version") + 1,
+        changed_at=now,
+        entry_count=Greatest(F("entry_count") + entry_delta, Value(0)),
+    )
+    if not updated and create:
+        # Called after the write, so a fresh count already includes it
+        UserContentState.objects.get_or_create(
+            user_id=user_id,
+            defaults={
+                "version": 1,
+                "changed_at": now,
+                "entry_count": lambda: Entry.objects.filter(user_id=user_id).count(),
+            },
+        )
+
+
+def bump_content_versions(user_ids):
+    """Bump several users' versions in one UPDATE (bulk jobs; counters untouched)."""
+    UserContentState.objects.filter(user_id__in=user_ids).update(
+        version=F("version") + 1,
+        changed_at=timezone.now(),
+    )
+
+
+# name -> (token, monotonic time read); replaced per key, never mutated
+_read_versions = {}
+
+
+def cache_version(name):
+    """
+    Return a token that changes whenever the named global cache namespace
+    is bumped ("0" before the first bump). At most CACHE_VERSION_TTL
+    seconds old; one small query when this process's copy has expired.
+    """
+    now = time.monotonic()
+    seen = _read_versions.get(name)
+    if seen is not None and now - seen[1] < settings.CACHE_VERSION_TTL:
+        return seen[0]
+
+    row = CacheVersion.objects.filter(name=name).values_list("version", "changed_at").first()
+    # The timestamp keeps a recreated row (restored backup, test rollback) from
+    # ever repeating an old token
+    token = f"{row[0]}.{row[1]:%Y%m%d%H%M%S%f}" if row else "0"
+    _read_versions[name] = (token, now)
+    return token
+
+
+def bump_cache_version(name):
+    """Invalidate everything cached under a named global namespace."""
+    now = timezone.now()
+    updated = CacheVersion.objects.filter(name=name).update(
+        version=F("version") + 1,
+        changed_at=now,
+    )
+    if not updated:
+        CacheVersion.objects.get_or_create(name=name, defaults={"version": 1, "changed_at": now})
+    # Read it back on next use, so this process never waits out the TTL
+    _read_versions.pop(name, None)
@@ -1,24 +1,130 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils import timezone
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponseNotFound
-from django.views.decorators.http import require_POST
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, HttpResponseNotFound, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.db import transaction
 from django.db.models import Q
 
-import random
-import requests
+import os
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
 
 from .models import (
+    DailyMood,
     Entry,
-    EmotionWord,
-    EntryRevision,
     SupportTicket,
-    SiteAnnouncement,
 )
-from .forms import EntryForm  # Entry create/edit ModelForm
-from billing.models import Subscription
-from .limits import is_free_locked, user_entry_count, FREE_ENTRY_LIMIT
+from .forms import EntryForm, EntryImportForm  # Entry create/edit ModelForm + import upload
+from .announcements import get_live_announcements
+from .cards import entry_cards
+from .conditional import (
+    dashboard_etag,
+    dashboard_last_modified,
+    entry_etag,
+    entry_last_modified,
+    my_entries_etag,
+    my_entries_last_modified,
+)
+from .emotion_masks import apply_masks
+from .emotions import get_emotion_catalog, resolve_emotion_words, set_entry_tags
+from .exports import aiter_chunks, iter_csv, iter_ndjson
+from .imports import import_entries as run_import
+from .limits import (
+    FREE_ENTRY_LIMIT,
+    entry_allowance,
+    get_account_state,
+    get_subscription,
+    is_free_locked,
+    user_entry_count,
+)
+from .revisions import (
+    REVISION_ORDER,
+    RevisionHistory,
+    build_revision,
+    rebuild_revision,
+    side_by_side,
+)
+from .search import get_search_backend
+from . import rollups
+from .insights import user_insights
+from .phrases import get_phrase
+from . import outbound
+from .versioning import content_version
+
+
+# My Entries page size (entries per window, before trimming to whole days)
+ENTRIES_PAGE_SIZE = 50
+
+# Days covered by the dashboard mood heatmap (ending today)
+HEATMAP_DAYS = 365
+
+# Revisions per page on the entry detail page
+REVISIONS_PAGE_SIZE = 10
+
+# Seconds a rendered revision diff stays in the per-worker cache
+REVISION_DIFF_CACHE_TIMEOUT = 60 * 60
+
+_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _encode_cursor(entry):
+    """Encode an entry's (created_at, id) position as an opaque cursor."""
+    micros = (entry.created_at - _CURSOR_EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{entry.id}"
+
+
+def _day_bounds(value):
+    """Return aware [start, end) datetimes for a YYYY-MM-DD string, or None."""
+    try:
+        day = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _decode_cursor(value):
+    """Return (created_at, id) from a cursor, or None if missing/invalid."""
+    try:
+        micros, entry_id = value.split(".", 1)
+        return _CURSOR_EPOCH + timedelta(microseconds=int(micros)), int(entry_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def _decode_start(value):
+    """Return a search result offset from the query string (0 if missing/invalid)."""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _ranked_page(entries, query, start):
+    """
+    Return (cards, has_more) for one page of keyword matches among
+    `entries`, best first, each card carrying its highlighted snippet.
+    """
+    hits = get_search_backend().search(entries, query, limit=ENTRIES_PAGE_SIZE + 1, offset=start)
+    has_more = len(hits) > ENTRIES_PAGE_SIZE
+    hits = hits[:ENTRIES_PAGE_SIZE]
+
+    cards = entry_cards(Entry.objects.filter(pk__in=[hit.entry_id for hit in hits]))
+    cards = {card.id: card for card in cards}
+    page = []
+    for hit in hits:
+        card = cards.get(hit.entry_id)
+        if card is not None:
+            card.search_snippet = hit.snippet
+            page.append(card)
+    return page, has_more
 
 
 def home(request):
@@ -84,7 +190,7 @@ def new_entry(request):
         return redirect("my_entries")
 
     timestamp = timezone.localtime().strftime("%A %d %B %Y • %H:%M")
-    emotions = EmotionWord.objects.all()
+    emotions = get_emotion_catalog()
 
     if request.method == "POST":
         form = EntryForm(request.POST)
@@ -125,17 +231,24 @@ def new_entry(request):
             # Keep comma-separated field in sync for display/backwards compatibility
             entry.emotion_words = ", ".join(selected_words) if selected_words else ""
 
-            entry.save()
+            with transaction.atomic():
+                # Re-check under the counter row lock so two concurrent posts
+                # can't both take the last free slot
+                if entry_allowance(request.user) == 0:
+                    messages.info(
+                        request,
+                        f"You’ve reached the free limit of {FREE_ENTRY_LIMIT} entries.",
+                    )
+                    return redirect("my_entries")
+
+                word_ids = list(resolve_emotion_words(selected_words).values())
+                apply_masks(entry, word_ids)
+
+                entry.save()
+                rollups.record_entry(entry)
 
-            # Sync relational tags (ManyToMany)
-            if selected_words:
-                objs = []
-                for w in selected_words:
-                    obj, _ = EmotionWord.objects.get_or_create(word=w)
-                    objs.append(obj)
-                entry.emotion_word_tags.set(objs)
-            else:
-                entry.emotion_word_tags.clear()
+                # Sync relational tags (ManyToMany) in bulk
+                set_entry_tags(entry, word_ids, created=True)
 
             messages.success(request, "Entry saved.")
             return redirect("my_entries")
@@ -170,56 +283,120 @@ def new_entry(request):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=my_entries_etag, last_modified_func=my_entries_last_modified)
 def my_entries(request):
-    """List entries grouped by date, with optional filters."""
-    user_entries = Entry.objects.filter(user=request.user).order_by("-created_at")
+    """
+    List entries grouped by date, with optional filters.
 
-    search_date = request.GET.get("date")
-    if search_date:
-        user_entries = user_entries.filter(created_at__date=search_date)
+    Entries are keyset-paginated on (created_at, id): each response holds a
+    bounded window of whole date groups, and "Load older entries" fetches the
+    next window through this same view (as JSON for in-page loading).
+    A keyword search lists its matches best first instead (core/search.py),
+    paged by position in that ranking.
+    """
+    user_entries = Entry.objects.filter(user=request.user).order_by("-created_at", "-id")
 
-    search_query = request.GET.get("q", "").strip()
-    if search_query:
+    search_date = request.GET.get("date")
+    day_bounds = _day_bounds(search_date)
+    if day_bounds:
+        # Range (not __date) so the (user, created_at) index is used
         user_entries = user_entries.filter(
-            Q(notes__icontains=search_query) | Q(emotion_words__icontains=search_query)
+            created_at__gte=day_bounds[0], created_at__lt=day_bounds[1]
         )
 
+    search_query = request.GET.get("q", "").strip()
+    params = request.GET.copy()
     grouped_entries = {}
-    for entry in user_entries:
-        entry.has_revisions = entry.revisions.exists()
-        date_key = entry.created_at.date()
-        grouped_entries.setdefault(date_key, []).append(entry)
+    ranked_entries = []
+    start = 0
+    continued_day = None
+
+    if search_query:
+        start = _decode_start(request.GET.get("start"))
+        ranked_entries, has_more = _ranked_page(user_entries, search_query, start)
+        params["start"] = start + ENTRIES_PAGE_SIZE
+    else:
+        cursor = _decode_cursor(request.GET.get("after", ""))
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            # The previous window ended on this day; if it goes on here, its
+            # header (and ids) are already on the page
+            continued_day = cursor_created_at.date()
+            user_entries = user_entries.filter(
+                Q(created_at__lt=cursor_created_at)
+                | Q(created_at=cursor_created_at, id__lt=cursor_id)
+            )
+
+        # Slotted rows of the card columns only (no notes), see core/cards.py
+        page = entry_cards(user_entries[: ENTRIES_PAGE_SIZE + 1])
+        has_more = len(page) > ENTRIES_PAGE_SIZE
+        page = page[:ENTRIES_PAGE_SIZE]
+
+        # Keep date groups whole: hold back a trailing day that continues on the next page
+        if has_more:
+            last_day = page[-1].created_at.date()
+            whole_days = [e for e in page if e.created_at.date() != last_day]
+            if whole_days:
+                page = whole_days
+
+        for entry in page:
+            grouped_entries.setdefault(entry.created_at.date(), []).append(entry)
+
+        if has_more:
+            params["after"] = _encode_cursor(page[-1])
+
+    next_page_url = f"{request.path}?{params.urlencode()}" if has_more else ""
 
     entry_count = user_entry_count(request.user)
     locked = is_free_locked(request.user)
 
     free_entries_remaining = max(0, FREE_ENTRY_LIMIT - entry_count)
 
-    return render(
-        request,
-        "core/my_entries.html",
-        {
-            "grouped_entries": grouped_entries,
-            "search_date": search_date,
-            "search_query": search_query,
-            "is_free_locked": locked,
-            "entry_count": entry_count,
-            "free_entry_limit": FREE_ENTRY_LIMIT,
-            "free_entries_remaining": free_entries_remaining,
-        },
-    )
+    context = {
+        "grouped_entries": grouped_entries,
+        "ranked_entries": ranked_entries,
+        "results_continue": start > 0,
+        "continued_day": continued_day,
+        "next_page_url": next_page_url,
+        "search_date": search_date,
+        "search_query": search_query,
+        "is_free_locked": locked,
+        "entry_count": entry_count,
+        "free_entry_limit": FREE_ENTRY_LIMIT,
+        "free_entries_remaining": free_entries_remaining,
+    }
+
+    # In-page "Load older entries" requests only need the next groups/results
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        partial = "partials/search_results.html" if search_query else "partials/entry_groups.html"
+        return JsonResponse(
+            {
+                "html": render_to_string(partial, context, request=request),
+                "next_page_url": next_page_url,
+            }
+        )
+
+    return render(request, "core/my_entries.html", context)
 
 
 @login_required
-def dashboard(request):
-    """Dashboard hub page."""
-    subscription = Subscription.objects.filter(user=request.user).first()
-    sub_status = getattr(subscription, "status", None)
+@cache_control(private=True, no_cache=True)
+async def dashboard(request):
+    """
+    Dashboard hub page.
+
+    Async so it runs natively under ASGI; its queries and rendering are
+    one sync_to_async hop (the phrase card loads separately, from the pool).
+    The conditional GET check runs in that hop too, before any of them.
+    """
+    return await sync_to_async(_dashboard_page)(request)
 
-    active_announcements = SiteAnnouncement.objects.filter(is_active=True).order_by(
-        "-updated_at"
-    )
-    live_announcements = [a for a in active_announcements if a.is_live]
+
+@condition(etag_func=dashboard_etag, last_modified_func=dashboard_last_modified)
+def _dashboard_page(request):
+    subscription = get_subscription(request.user)
+    sub_status = getattr(subscription, "status", None)
 
     entry_count = user_entry_count(request.user)
     locked = is_free_locked(request.user)
@@ -235,30 +412,86 @@ def dashboard(request):
         "core/dashboard.html",
         {
             "subscription_status": sub_status,
-            "announcements": live_announcements,
+            "announcements": get_live_announcements(),
             "is_free_locked": locked,
             "entry_count": entry_count,
             "free_entry_limit": FREE_ENTRY_LIMIT,
             "entries_left": entries_left,
             "login_key": login_key,
+            "insights": user_insights(request.user),
         },
     )
 
 
+def _heatmap_etag(request):
+    """Changes with any entry change, and at midnight (the window moves)."""
+    return f"heatmap-{content_version(request.user)}-{timezone.localdate():%Y%m%d}"
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_heatmap_etag)
+def mood_heatmap(request):
+    """
+    Daily entry count + average mood for the last HEATMAP_DAYS days (JSON).
+
+    Read from the DailyMood rollups (core/rollups.py): at most one row per
+    day in the window, never the entries themselves. Days without entries
+    are left out.
+    """
+    today = timezone.localdate()
+    first_day = today - timedelta(days=HEATMAP_DAYS - 1)
+
+    days = (
+        DailyMood.objects.filter(user=request.user, day__gte=first_day, day__lte=today)
+        .order_by("day")
+        .values_list("day", "entry_count", "mood_total")
+    )
+
+    return JsonResponse(
+        {
+            "start": first_day.isoformat(),
+            "end": today.isoformat(),
+            "days": [
+                {"date": day.isoformat(), "count": count, "mood": round(total / count, 2)}
+                for day, count, total in days
+            ],
+        }
+    )
+
+
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=entry_etag, last_modified_func=entry_last_modified)
 def view_entry(request, entry_id):
-    """Entry detail view with revision history."""
+    """Entry detail view with a page of revision history."""
     entry = get_object_or_404(Entry, pk=entry_id, user=request.user)
-    revisions = EntryRevision.objects.filter(entry=entry).order_by("-created_at")
-    last_updated = revisions[0].created_at if revisions else None
     locked = is_free_locked(request.user)
 
+    # revision_count is kept in step by edit_entry / prune_revisions, so no COUNT(*)
+    last_page = max(1, -(-entry.revision_count // REVISIONS_PAGE_SIZE))
+    try:
+        page = min(max(1, int(request.GET.get("revisions_page", 1))), last_page)
+    except ValueError:
+        page = 1
+
+    # Rebuilt from deltas only as the template walks the page
+    revisions = RevisionHistory(
+        entry, offset=(page - 1) * REVISIONS_PAGE_SIZE, limit=REVISIONS_PAGE_SIZE
+    )
+    last_updated = (
+        entry.revisions.order_by(*REVISION_ORDER).values_list("created_at", flat=True).first()
+    )
+
     return render(
         request,
         "core/entry_detail.html",
         {
             "entry": entry,
             "revisions": revisions,
+            "revisions_page": page,
+            "newer_revisions_page": page - 1 if page > 1 else None,
+            "older_revisions_page": page + 1 if page < last_page else None,
             "last_updated": last_updated,
             "is_free_locked": locked,
             "entry_count": user_entry_count(request.user),
@@ -267,17 +500,64 @@ def view_entry(request, entry_id):
     )
 
 
+@login_required
+def revision_diff(request, entry_id):
+    """
+    HTML fragment: side-by-side diff of a revision against a later revision
+    (?to=) or, by default, the current entry.
+
+    Cached per revision pair; comparisons with the current entry are keyed on
+    the user's content version as well.
+    """
+    entry = get_object_or_404(Entry, pk=entry_id, user=request.user)
+    try:
+        old_id = int(request.GET.get("from", ""))
+        new_id = int(request.GET["to"]) if request.GET.get("to") else None
+    except ValueError:
+        return HttpResponseNotFound("Unknown revision.")
+
+    wanted = {old_id} if new_id is None else {old_id, new_id}
+    found = {rev.pk: rev for rev in entry.revisions.filter(pk__in=wanted)}
+    if len(found) != len(wanted):
+        return HttpResponseNotFound("Unknown revision.")
+    # "to" must come after "from" in history order (REVISION_ORDER), else the
+    # diff would run backwards
+    if new_id is not None and (
+        (found[new_id].created_at, new_id) <= (found[old_id].created_at, old_id)
+    ):
+        return HttpResponseNotFound("Unknown revision.")
+
+    target = new_id if new_id is not None else f"current.{content_version(request.user)}"
+    key = f"revision-diff:{entry.pk}:{old_id}:{target}"
+    html = cache.get(key)
+
+    if html is None:
+        old = rebuild_revision(entry, found[old_id])
+        new = entry if new_id is None else rebuild_revision(entry, found[new_id])
+        html = render_to_string(
+            "partials/revision_diff.html",
+            {
+                "old": old,
+                "new": new,
+                "new_is_current": new_id is None,
+                "fields": [
+                    ("Mood", old.get_mood_display(), new.get_mood_display()),
+                    ("Hue", old.hue, new.hue),
+                    ("Emotions", old.emotion_words, new.emotion_words),
+                ],
+                "note_rows": side_by_side(old.notes, new.notes),
+            },
+        )
+        cache.set(key, html, REVISION_DIFF_CACHE_TIMEOUT)
+
+    return HttpResponse(html)
+
+
 @login_required
 def edit_entry(request, entry_id):
     """Edit an entry and store a revision snapshot."""
     entry = get_object_or_404(Entry, pk=entry_id, user=request.user)
 
-    # Snapshot original values to avoid creating revisions for no-op edits
-    original_hue = entry.hue or ""
-    original_mood = entry.mood
-    original_emotion_words = entry.emotion_words or ""
-    original_notes = entry.notes or ""
-
     if is_free_locked(request.user):
         messages.info(
             request,
@@ -286,7 +566,7 @@ def edit_entry(request, entry_id):
         )
         return redirect("view_entry", entry_id=entry.id)
 
-    emotions = EmotionWord.objects.all()
+    emotions = get_emotion_catalog()
 
     if request.method == "POST":
         form = EntryForm(request.POST, instance=entry)
@@ -296,8 +576,9 @@ def edit_entry(request, entry_id):
             notes = request.POST.get("notes")
             selected_words = request.POST.getlist("emotion_words")
 
-            mood = entry.mood
-            hue_value = entry.hue
+            # None: keep the entry's current mood / hue
+            mood = None
+            hue_value = None
 
             hue = form.cleaned_data.get("hue")
             if hue not in (None, ""):
@@ -315,42 +596,63 @@ def edit_entry(request, entry_id):
             if notes:
                 combined_notes += notes.strip()
 
-            new_hue_str = str(hue_value) if hue_value is not None else ""
             new_emotion_words = ", ".join(selected_words) if selected_words else ""
             new_notes = combined_notes
 
-            has_changes = (
-                new_hue_str != original_hue
-                or mood != original_mood
-                or new_emotion_words != original_emotion_words
-                or new_notes != original_notes
-            )
-
-            if has_changes:
-                EntryRevision.objects.create(
-                    entry=entry,
-                    hue=original_hue,
-                    mood=original_mood,
-                    emotion_words=original_emotion_words,
-                    notes=original_notes,
-                )
-
-            updated_entry = form.save(commit=False)
-            updated_entry.hue = new_hue_str
-            updated_entry.mood = mood
-            updated_entry.notes = new_notes
-            updated_entry.emotion_words = new_emotion_words
-
-            updated_entry.save()
-
-            if selected_words:
-                objs = []
-                for w in selected_words:
-                    obj, _ = EmotionWord.objects.get_or_create(word=w)
-                    objs.append(obj)
-                updated_entry.emotion_word_tags.set(objs)
-            else:
-                updated_entry.emotion_word_tags.clear()
+            with transaction.atomic():
+                # Lock the row and take the pre-edit values from it: two
+                # concurrent edits (e.g. two tabs) must not store deltas
+                # against different "after" states or share a keyframe position
+                current = Entry.objects.select_for_update().get(pk=entry.pk, user=request.user)
+                before = {
+                    "mood": current.mood,
+                    "hue": current.hue or "",
+                    "emotion_words": current.emotion_words or "",
+                    "notes": current.notes or "",
+                }
+
+                if mood is None:
+                    mood = current.mood
+                    hue_value = current.hue
+                new_hue_str = str(hue_value) if hue_value is not None else ""
+
+                after = {
+                    "mood": mood,
+                    "hue": new_hue_str,
+                    "emotion_words": new_emotion_words,
+                    "notes": new_notes,
+                }
+                # Snapshot comparison avoids creating revisions for no-op edits
+                has_changes = after != before
+
+                updated_entry = form.save(commit=False)
+                updated_entry.hue = new_hue_str
+                updated_entry.mood = mood
+                updated_entry.notes = new_notes
+                updated_entry.emotion_words = new_emotion_words
+                updated_entry.revision_count = current.revision_count
+
+                word_ids = list(resolve_emotion_words(selected_words).values())
+                apply_masks(updated_entry, word_ids)
+
+                if has_changes:
+                    # Stored as a delta against the edited entry (see core/revisions.py)
+                    build_revision(
+                        entry,
+                        before=before,
+                        after=after,
+                        position=current.revision_count + 1,
+                    ).save()
+                    # Keep the denormalised revision counter in step
+                    updated_entry.revision_count = current.revision_count + 1
+
+                updated_entry.save()
+
+                # Mood / hue feed the daily rollup; created_at (the day) never changes
+                if mood != before["mood"] or new_hue_str != before["hue"]:
+                    rollups.refresh_day(entry.user_id, rollups.entry_day(entry))
+
+                set_entry_tags(updated_entry, word_ids)
 
             messages.success(request, "Entry updated.")
             return redirect("view_entry", entry_id=entry.id)
@@ -417,7 +719,12 @@ def delete_entry(request, entry_id):
     entry = get_object_or_404(Entry, pk=entry_id, user=request.user)
 
     # Allow deletes even when locked so users can drop back under the free limit
-    entry.delete()
+    with transaction.atomic():
+        entry.delete()
+        rollups.refresh_day(request.user.pk, rollups.entry_day(entry))
+
+    # The request's cached entry count is now one too high
+    get_account_state(request.user).refresh()
 
     # If they were locked, deleting may restore create/edit access
     if not is_free_locked(request.user):
@@ -432,35 +739,78 @@ def delete_entry(request, entry_id):
 
 
 @login_required
-def supportive_phrase(request):
-    """Return a supportive phrase for the dashboard (AJAX)."""
-    fallback_phrases = [
-        "You’re allowed to take today slowly.",
-        "Small steps count — even tiny ones.",
-        "You don’t have to earn rest.",
-        "Try naming one feeling without judging it.",
-        "It’s okay to pause. You can come back when you’re ready.",
-        "Your feelings are real — and they can change.",
-        "One kind thing for yourself is enough for now.",
-    ]
-
-    phrase = None
-    author = ""
+def export_entries(request):
+    """Stream all of the user's entries + revision history as CSV or NDJSON."""
+    export_format = request.GET.get("format", "csv")
+    stamp = timezone.localdate().strftime("%Y%m%d")
+
+    if export_format == "ndjson":
+        rows = iter_ndjson(request.user)
+        content_type = "application/x-ndjson; charset=utf-8"
+        filename = f"regulate-entries-{stamp}.ndjson"
+    else:
+        rows = iter_csv(request.user)
+        content_type = "text/csv; charset=utf-8"
+        filename = f"regulate-entries-{stamp}.csv"
 
-    try:
-        r = requests.get("https://www.affirmations.dev/", timeout=5)
-        if r.status_code == 200:
-            data = r.json()
-            phrase = data.get("affirmation")
-            if phrase:
-                author = "Affirmations.dev"
-    except Exception:
-        phrase = None
-        author = ""
+    if isinstance(request, ASGIRequest):
+        # Under ASGI a sync iterator would be drained into a list before the
+        # first byte is sent; hand over chunks one at a time instead
+        rows = aiter_chunks(rows)
+
+    response = StreamingHttpResponse(rows, content_type=content_type)
+
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@login_required
+def import_entries(request):
+    """Upload entry history from another tracker (or a Regulate export)."""
+    if request.method == "POST":
+        form = EntryImportForm(request.POST, request.FILES)
+
+        if form.is_valid():
+            result = run_import(
+                request.user,
+                form.cleaned_data["file"],
+                form.cleaned_data["format"],
+            )
+
+            if not result.ok:
+                messages.error(request, "Nothing was imported. Please fix the rows below and try again.")
+                return render(
+                    request,
+                    "core/import_entries.html",
+                    {"form": form, "import_errors": result.errors},
+                )
 
-    if not phrase:
-        phrase = random.choice(fallback_phrases)
-        author = ""
+            messages.success(
+                request,
+                f"Imported {result.created} "
+                f"{'entry' if result.created == 1 else 'entries'}.",
+            )
+            if result.skipped_over_limit:
+                messages.info(
+                    request,
+                    f"{result.skipped_over_limit} more "
+                    f"{'entry was' if result.skipped_over_limit == 1 else 'entries were'} "
+                    f"skipped because the free plan is limited to {FREE_ENTRY_LIMIT} entries.",
+                )
+            return redirect("my_entries")
+
+        messages.error(request, "Please check the form and try again.")
+    else:
+        form = EntryImportForm()
+
+    return render(request, "core/import_entries.html", {"form": form})
+
+
+@login_required
+async def supportive_phrase(request):
+    """Return a supportive phrase for the dashboard (AJAX), from the pre-fetched pool."""
+    phrase, author = await sync_to_async(get_phrase)()
 
     response = JsonResponse(
         {
@@ -471,3 +821,11 @@ def supportive_phrase(request):
     )
     response["Cache-Control"] = "no-store"
     return response
+
+
+@staff_member_required
+def outbound_metrics(request):
+    """Per-upstream latency/error counts and breaker state (this worker only)."""
+    response = JsonResponse({"pid": os.getpid(), "upstreams": outbound.metrics()})
+    response["Cache-Control"] = "no-store"
+    return response
@@ -14,3 +14,27 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'regulate_project.settings')
 
 application = get_asgi_application()
+
+# Build the emotion word catalog (seeding an empty table) before the first
+# request; skipped quietly if the database isn't migrated yet. Servers like
+# uvicorn import this module inside their event loop, where Django refuses
+# synchronous queries, so the warm-up runs on a plain thread.
+import threading  # noqa: E402
+
+from django.db import DatabaseError, connections  # noqa: E402
+
+from core.emotions import warm_emotion_catalog  # noqa: E402
+
+
+def _warm():
+    try:
+        warm_emotion_catalog()
+    except DatabaseError:
+        pass
+    finally:
+        connections.close_all()
+
+
+_warmer = threading.Thread(target=_warm, name="emotion-catalog-warmup")
+_warmer.start()
+_warmer.join()
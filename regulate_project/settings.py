@@ -86,10 +86,12 @@ AUTHENTICATION_BACKENDS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.OutboundDeadlineMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.AccountStateMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -111,6 +113,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "core.context_processors.plan_status",
+                "core.context_processors.cache_versions",
             ],
         },
     },
@@ -141,6 +144,69 @@ if DATABASE_URL:
     )
 
 
+# -----------------------------
+# CACHES
+# -----------------------------
+
+CACHES = {
+    # Per-worker memory cache (template fragments, computed data)
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "regulate-default",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+    # Shared by all workers on the dyno (supportive phrase pool)
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config("SHARED_CACHE_DIR", default="/tmp/regulate-shared-cache"),
+    },
+}
+
+# Lock files shared by all workers on the dyno (phrase pool locks, core/phrases.py)
+SHARED_LOCK_DIR = config("SHARED_LOCK_DIR", default="/tmp/regulate-shared-locks")
+
+# Seconds a worker trusts its last read of a global cache version
+# (core/versioning.py): the most a change can take to reach other dynos
+CACHE_VERSION_TTL = config("CACHE_VERSION_TTL", default=5, cast=float)
+
+# Optional directory for memory-mapped insights arrays (core/insights.py); "" disables
+INSIGHTS_SNAPSHOT_DIR = config("INSIGHTS_SNAPSHOT_DIR", default="")
+
+
+# -----------------------------
+# Supportive phrases (core/phrases.py)
+# -----------------------------
+
+# PhraseSource that refills the shared phrase pool
+SUPPORTIVE_PHRASE_SOURCE = config(
+    "SUPPORTIVE_PHRASE_SOURCE", default="core.phrases.AffirmationsDevSource"
+)
+# Per-worker refiller thread (turn off when `manage.py refill_phrases` runs from cron)
+SUPPORTIVE_PHRASE_BACKGROUND_REFILL = config(
+    "SUPPORTIVE_PHRASE_BACKGROUND_REFILL", default=True, cast=bool
+)
+
+
+# -----------------------------
+# Outbound HTTP (core/outbound.py)
+# -----------------------------
+
+# Seconds a request may spend waiting on upstreams in total (below gunicorn's 30s timeout)
+OUTBOUND_REQUEST_BUDGET = config("OUTBOUND_REQUEST_BUDGET", default=20, cast=float)
+# Failures in a row that open an upstream's circuit, and how long it stays open
+OUTBOUND_BREAKER_THRESHOLD = config("OUTBOUND_BREAKER_THRESHOLD", default=5, cast=int)
+OUTBOUND_BREAKER_COOLDOWN = config("OUTBOUND_BREAKER_COOLDOWN", default=30, cast=float)
+
+# -----------------------------
+# Revision retention (applied by `manage.py prune_revisions`)
+# -----------------------------
+
+# Every revision is kept this many days, then the last one per day...
+REVISION_KEEP_ALL_DAYS = config("REVISION_KEEP_ALL_DAYS", default=30, cast=int)
+# ...until this age, after which only the last one per month is kept
+REVISION_KEEP_DAILY_DAYS = config("REVISION_KEEP_DAILY_DAYS", default=365, cast=int)
+
+
 # -----------------------------
 # Password validation
 # -----------------------------
@@ -189,6 +255,16 @@ if "test" in sys.argv:
     STORAGES["staticfiles"]["BACKEND"] = "django.contrib.staticfiles.storage.StaticFilesStorage"
     WHITENOISE_MANIFEST_STRICT = False
 
+    # Keep test runs isolated from any on-disk shared cache
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "regulate-shared-test",
+    }
+
+    # No network or background threads from the phrase pool
+    SUPPORTIVE_PHRASE_SOURCE = "core.phrases.LocalPhraseSource"
+    SUPPORTIVE_PHRASE_BACKGROUND_REFILL = False
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SITE_ID = 1
@@ -234,5 +310,7 @@ STRIPE_PUBLIC_KEY = config("STRIPE_PUBLIC_KEY", default="")
 STRIPE_SECRET_KEY = config("STRIPE_SECRET_KEY", default="")
 STRIPE_PRICE_ID = config("STRIPE_PRICE_ID", default="")
 STRIPE_WEBHOOK_SECRET = config("STRIPE_WEBHOOK_SECRET", default="")
+# Only changed to point at a local stub (`manage.py benchmark_servers`)
+STRIPE_API_BASE = config("STRIPE_API_BASE", default="https://api.stripe.com")
 
 STRIPE_CURRENCY = "gbp"
@@ -14,3 +14,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'regulate_project.settings')
 
 application = get_wsgi_application()
+
+# Build the emotion word catalog (seeding an empty table) before the first
+# request; skipped quietly if the database isn't migrated yet
+from django.db import DatabaseError  # noqa: E402
+
+from core.emotions import warm_emotion_catalog  # noqa: E402
+
+try:
+    warm_emotion_catalog()
+except DatabaseError:
+    pass
@@ -67,6 +67,58 @@ document.addEventListener("DOMContentLoaded", function () {
         });
     });
 
+    // ----------------------------------------
+    // My Entries: load older date groups in place
+    // ----------------------------------------
+    // The link works without JS (full page for the next window).
+    // With JS, fetch the next window as JSON and append its date groups.
+    const loadMoreLink = document.getElementById("load-more-entries");
+    const entriesAccordion = document.getElementById("entriesAccordion");
+
+    if (loadMoreLink && entriesAccordion) {
+        loadMoreLink.addEventListener("click", async function (event) {
+            event.preventDefault();
+
+            const url = loadMoreLink.getAttribute("href");
+            loadMoreLink.classList.add("is-disabled");
+
+            try {
+                const response = await fetch(url, {
+                    headers: {
+                        "Accept": "application/json",
+                        "X-Requested-With": "XMLHttpRequest",
+                    },
+                });
+                const data = await response.json();
+
+                const holder = document.createElement("div");
+                holder.innerHTML = data.html;
+
+                holder.querySelectorAll(".accordion-item").forEach((item) => {
+                    // A very busy day can span two windows: merge into the existing group
+                    const existing = entriesAccordion.querySelector(
+                        `.accordion-item[data-date="${item.dataset.date}"] .accordion-body`
+                    );
+                    if (existing) {
+                        item.querySelectorAll(".entry-card").forEach((card) => existing.appendChild(card));
+                    } else {
+                        entriesAccordion.appendChild(item);
+                    }
+                });
+
+                if (data.next_page_url) {
+                    loadMoreLink.setAttribute("href", data.next_page_url);
+                    loadMoreLink.classList.remove("is-disabled");
+                } else {
+                    loadMoreLink.remove();
+                }
+            } catch (error) {
+                // Fall back to a normal page load
+                window.location.href = url;
+            }
+        });
+    }
+
     // ----------------------------------------
     // Dismissible dashboard announcements
     // ----------------------------------------
@@ -126,6 +178,89 @@ document.addEventListener("DOMContentLoaded", function () {
         });
     }
 
+    // ----------------------------------------
+    // Dashboard: year mood heatmap
+    // ----------------------------------------
+    // One square per day from the JSON endpoint, Monday-first columns.
+    // Browser revalidates with the ETag, so unchanged data is a 304.
+    const heatmap = document.getElementById("mood-heatmap");
+
+    if (heatmap) {
+        (async function () {
+            try {
+                const response = await fetch(heatmap.dataset.url, {
+                    headers: { "Accept": "application/json" },
+                });
+                const data = await response.json();
+
+                const byDate = {};
+                data.days.forEach((day) => { byDate[day.date] = day; });
+
+                const day = new Date(data.start + "T00:00:00");
+                const end = new Date(data.end + "T00:00:00");
+
+                // Pad the first column so rows line up with weekdays
+                const offset = (day.getDay() + 6) % 7;
+                for (let i = 0; i < offset; i++) {
+                    heatmap.appendChild(document.createElement("span"));
+                }
+
+                while (day <= end) {
+                    const key = [
+                        day.getFullYear(),
+                        String(day.getMonth() + 1).padStart(2, "0"),
+                        String(day.getDate()).padStart(2, "0"),
+                    ].join("-");
+                    const cell = document.createElement("span");
+                    cell.className = "heatmap-cell";
+
+                    const info = byDate[key];
+                    if (info) {
+                        cell.classList.add("mood-" + Math.round(info.mood));
+                        cell.title = `${key}: ${info.count} ${info.count === 1 ? "entry" : "entries"}, mood ${info.mood}`;
+                    } else {
+                        cell.title = key;
+                    }
+                    heatmap.appendChild(cell);
+                    day.setDate(day.getDate() + 1);
+                }
+            } catch (error) {
+                heatmap.closest(".entry-card").remove();
+            }
+        })();
+    }
+
+    // ----------------------------------------
+    // Entry detail: revision diffs
+    // ----------------------------------------
+    // Fetched on first click, then toggled.
+    document.querySelectorAll(".revision-diff-btn").forEach(function (button) {
+        const target = button.nextElementSibling;
+
+        button.addEventListener("click", async function () {
+            if (target.dataset.loaded) {
+                target.hidden = !target.hidden;
+                return;
+            }
+
+            button.disabled = true;
+            try {
+                const response = await fetch(button.dataset.url);
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                target.innerHTML = await response.text();
+                target.dataset.loaded = "1";
+                target.hidden = false;
+            } catch (error) {
+                target.innerText = "Sorry, the comparison couldn’t be loaded.";
+                target.hidden = false;
+            } finally {
+                button.disabled = false;
+            }
+        });
+    });
+
     // ----------------------------------------
     // Supportive phrases (external API)
     // ----------------------------------------